@@ -0,0 +1,71 @@
+import tempfile
+import time
+from django.core.files.storage import FileSystemStorage
+from django.core.files.uploadedfile import SimpleUploadedFile
+from django.core.management.base import BaseCommand
+from django.db import connection, transaction
+from django.test.utils import CaptureQueriesContext, override_settings
+from agency_app.models import Project, Document, Comment
+from agency_app.uploads import bulk_create_documents
+
+class SlowStorage(FileSystemStorage):
+    """File system storage with a fixed delay per write, to mimic networked storage."""
+    def __init__(self, latency, **kwargs):
+        super().__init__(**kwargs)
+        self.latency = latency
+
+    def _save(self, name, content):
+        time.sleep(self.latency)
+        return super()._save(name, content)
+
+class Command(BaseCommand):
+    help = 'Compare one-by-one and bulk uploads of project documents attached to a comment'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--files', type=int, default=50, help='Number of files per upload')
+        parser.add_argument('--size-kb', type=int, default=256, help='Size of each file in KB')
+        parser.add_argument('--latency-ms', type=int, default=0, help='Simulated storage latency per write')
+
+    def make_files(self, count, size_kb):
+        return [SimpleUploadedFile(f'doc{i}.pdf', b'%PDF' + b'x' * (size_kb * 1024)) for i in range(count)]
+
+    def sequential(self, project, comment, files):
+        for file in files:
+            document = Document(project=project, name=file.name, file=file)
+            document.save()
+            comment.attachments.add(document)
+
+    def bulk(self, project, comment, files):
+        bulk_create_documents(project, files, comment=comment)
+
+    def run(self, label, upload, options):
+        with transaction.atomic():
+            project = Project.objects.create(
+                title='Upload benchmark', one_line_description='Benchmark', description='Benchmark',
+                program='Benchmark', start_date='2025-01-01', deadline_date='2025-12-31',
+                identification_no='BENCH', selected_contractor='Benchmark'
+            )
+            comment = Comment.objects.create(project=project, author='benchmark', content='Benchmark')
+            files = self.make_files(options['files'], options['size_kb'])
+            with CaptureQueriesContext(connection) as ctx:
+                start = time.perf_counter()
+                upload(project, comment, files)
+                elapsed = time.perf_counter() - start
+            attached = comment.attachments.count()
+            transaction.set_rollback(True)
+        self.stdout.write(f'{label:<12} {elapsed * 1000:>9.1f} ms  {len(ctx.captured_queries):>4} queries  {attached} attached')
+        return elapsed
+
+    def handle(self, *args, **options):
+        field = Document._meta.get_field('file')
+        original_storage = field.storage
+        try:
+            with tempfile.TemporaryDirectory() as media_root, override_settings(MEDIA_ROOT=media_root):
+                field.storage = SlowStorage(options['latency_ms'] / 1000, location=media_root)
+                sequential = self.run('sequential', self.sequential, options)
+                bulk = self.run('bulk', self.bulk, options)
+            self.stdout.write(self.style.SUCCESS(f'Bulk upload is {sequential / bulk:.1f}x faster for {options["files"]} files'))
+        except Exception as e:
+            self.stdout.write(self.style.ERROR(f'Error running upload benchmark: {str(e)}'))
+        finally:
+            field.storage = original_storage
@@ -0,0 +1,24 @@
+# Generated by Django 5.1.7 on 2026-10-18 01:38
+
+import django.contrib.postgres.indexes
+import django.db.models.functions.text
+from django.contrib.postgres.operations import TrigramExtension
+from django.db import migrations
+from core.operations import AddIndexConcurrentlyOnPostgres
+
+
+class Migration(migrations.Migration):
+    # CREATE INDEX CONCURRENTLY cannot run inside a transaction.
+    atomic = False
+
+    dependencies = [
+        ('agency_app', '0005_comment_project_indexes'),
+    ]
+
+    operations = [
+        TrigramExtension(),
+        AddIndexConcurrentlyOnPostgres(
+            model_name='project',
+            index=django.contrib.postgres.indexes.GinIndex(django.contrib.postgres.indexes.OpClass(django.db.models.functions.text.Upper('title'), name='gin_trgm_ops'), name='project_title_trgm_idx'),
+        ),
+    ]
@@ -0,0 +1,38 @@
+# Generated by Django 5.1.7 on 2026-10-18 02:05
+
+import django.contrib.postgres.indexes
+import django.contrib.postgres.search
+from django.db import migrations
+from core.operations import AddIndexConcurrentlyOnPostgres, CreateSearchVectorTrigger
+
+
+class Migration(migrations.Migration):
+    # The GIN index is built concurrently, after the backfill.
+    atomic = False
+
+    dependencies = [
+        ('agency_app', '0006_project_title_trgm_idx'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='project',
+            name='search_vector',
+            field=django.contrib.postgres.search.SearchVectorField(editable=False, null=True),
+        ),
+        CreateSearchVectorTrigger('project', {'title': 'A', 'one_line_description': 'B', 'description': 'C'}),
+        AddIndexConcurrentlyOnPostgres(
+            model_name='project',
+            index=django.contrib.postgres.indexes.GinIndex(fields=['search_vector'], name='project_search_vector_idx'),
+        ),
+        migrations.AddField(
+            model_name='comment',
+            name='search_vector',
+            field=django.contrib.postgres.search.SearchVectorField(editable=False, null=True),
+        ),
+        CreateSearchVectorTrigger('comment', {'content': 'A'}),
+        AddIndexConcurrentlyOnPostgres(
+            model_name='comment',
+            index=django.contrib.postgres.indexes.GinIndex(fields=['search_vector'], name='comment_search_vector_idx'),
+        ),
+    ]
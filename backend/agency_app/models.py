@@ -1,5 +1,8 @@
 # backend/external-agency/models.py
+from django.contrib.postgres.indexes import GinIndex, OpClass
+from django.contrib.postgres.search import SearchVectorField
 from django.db import models
+from django.db.models.functions import Upper
 from django.utils import timezone
 from users.models import CustomUser
 import os
@@ -37,6 +40,17 @@ class Project(models.Model):
         null=True,
         blank=True
     )
+    # Maintained by a database trigger from title, one_line_description and description
+    search_vector = SearchVectorField(null=True, editable=False)
+
+    class Meta:
+        indexes = [
+            models.Index(fields=['status', 'created_at'], name='project_status_created_idx'),
+            # title__icontains compiles to UPPER(title) LIKE UPPER(%s) on PostgreSQL,
+            # so the trigram index is built over the same expression.
+            GinIndex(OpClass(Upper('title'), name='gin_trgm_ops'), name='project_title_trgm_idx'),
+            GinIndex(fields=['search_vector'], name='project_search_vector_idx'),
+        ]
     
     def __str__(self):
         return self.title
@@ -51,13 +65,21 @@ class Document(models.Model):
         return f"{self.name} - {self.project.title}"
 
 class Comment(models.Model):
-    project = models.ForeignKey(Project, related_name='comments', on_delete=models.CASCADE)
+    project = models.ForeignKey(Project, related_name='comments', on_delete=models.CASCADE, db_index=False)  # Indexed by comment_project_created_idx
     author = models.CharField(max_length=100)
     content = models.TextField()
     role = models.CharField(max_length=50, blank=True)
     created_at = models.DateTimeField(auto_now_add=True)
     attachments = models.ManyToManyField(Document, related_name='comments', blank=True)
     user = models.ForeignKey(CustomUser, related_name='agency_app_comments', on_delete=models.CASCADE, null=True)
+    # Maintained by a database trigger from content
+    search_vector = SearchVectorField(null=True, editable=False)
+
+    class Meta:
+        indexes = [
+            models.Index(fields=['project', 'created_at'], name='comment_project_created_idx'),
+            GinIndex(fields=['search_vector'], name='comment_search_vector_idx'),
+        ]
     
     def __str__(self):
         return f"Comment by {self.author} on {self.project.title}"
@@ -1,11 +1,14 @@
 # backend/agency/serializers.py
 from rest_framework import serializers
+from django.db.models import Prefetch
 from .models import Project, Document, Comment
 from users.models import CustomUser
 from procurement.models import ProcurementPlan
-from procurement.serializers import ProcurementPlanSerializer
+from procurement.serializers import ProcurementPlanSerializer, ProcurementPlanDropdownSerializer
+from committee.models import Committee
+from core.serializers import DynamicFieldsMixin, TimedSerializerMixin
 
-class DocumentSerializer(serializers.ModelSerializer):
+class DocumentSerializer(TimedSerializerMixin, serializers.ModelSerializer):
     url = serializers.SerializerMethodField()
     
     class Meta:
@@ -19,7 +22,7 @@ class DocumentSerializer(serializers.ModelSerializer):
                 return request.build_absolute_uri(obj.file.url)
         return None
 
-class CommentSerializer(serializers.ModelSerializer):
+class CommentSerializer(TimedSerializerMixin, serializers.ModelSerializer):
     date = serializers.SerializerMethodField()
     attachments = DocumentSerializer(many=True, read_only=True)
     user_email = serializers.SerializerMethodField()
@@ -39,27 +42,54 @@ class CommentSerializer(serializers.ModelSerializer):
     def get_user_role(self, obj):
         return obj.user.role.role_name if obj.user and obj.user.role else None
 
-class ProjectListSerializer(serializers.ModelSerializer):
+class ProjectListSerializer(DynamicFieldsMixin, serializers.ModelSerializer):
+    """
+    Compact row for the discussions list. Nested relations are opt-in through
+    ``?expand=documents,procurement_plan``; the retrieve action keeps the fully
+    nested payload.
+    """
     document_count = serializers.SerializerMethodField()
     date = serializers.SerializerMethodField()
-    documents = DocumentSerializer(many=True, read_only=True)
     created_by_email = serializers.SerializerMethodField()
-    procurement_plan = ProcurementPlanSerializer(read_only=True)
-    
+    procurement_plan = ProcurementPlanDropdownSerializer(read_only=True)
+
+    expandable_fields = {
+        'documents': {
+            'serializer': DocumentSerializer,
+            'options': {'many': True, 'read_only': True},
+            'prefetch_related': ['documents'],
+        },
+        'procurement_plan': {
+            'serializer': ProcurementPlanSerializer,
+            'options': {'read_only': True},
+            'select_related': ['procurement_plan'],
+            'prefetch_related': [
+                'procurement_plan__quarterly_targets',
+                Prefetch('procurement_plan__committee', Committee.objects.with_members()),
+            ],
+        },
+    }
+    select_related_fields = {
+        'created_by_email': ['created_by'],
+        'procurement_plan': ['procurement_plan'],
+    }
+
     class Meta:
         model = Project
-        fields = ['id', 'title', 'status', 'date', 'one_line_description', 'document_count', 'documents', 'created_by_email', 'procurement_plan']
-    
+        fields = ['id', 'title', 'status', 'date', 'one_line_description', 'document_count', 'created_by_email', 'procurement_plan']
+
     def get_document_count(self, obj):
+        if hasattr(obj, 'document_count'):
+            return obj.document_count
         return obj.documents.count()
-    
+
     def get_date(self, obj):
         return obj.created_at.strftime("%Y/%m/%d")
-        
+
     def get_created_by_email(self, obj):
         return obj.created_by.email if obj.created_by else None
 
-class ProjectDetailSerializer(serializers.ModelSerializer):
+class ProjectDetailSerializer(TimedSerializerMixin, serializers.ModelSerializer):
     documents = DocumentSerializer(many=True, read_only=True)
     comments = CommentSerializer(many=True, read_only=True)
     date = serializers.SerializerMethodField()
@@ -97,7 +127,7 @@ class ProjectDetailSerializer(serializers.ModelSerializer):
     def get_created_by_role(self, obj):
         return obj.created_by.role.role_name if obj.created_by and obj.created_by.role else None
 
-class ProjectCreateSerializer(serializers.ModelSerializer):
+class ProjectCreateSerializer(TimedSerializerMixin, serializers.ModelSerializer):
     procurement_plan = serializers.PrimaryKeyRelatedField(
         queryset=ProcurementPlan.objects.all(),
         required=True,  # Changed to required=True
@@ -0,0 +1,74 @@
+import os
+import shutil
+import tempfile
+from unittest import mock
+from django.core.files.uploadedfile import SimpleUploadedFile
+from django.test import override_settings
+from rest_framework import status
+from rest_framework.test import APITestCase
+from users.models import CustomUser, RoleHierarchy
+from agency_app.models import Project, Document, Comment
+
+class BulkDocumentUploadTests(APITestCase):
+    """Tests for the batched document upload path."""
+
+    def setUp(self):
+        self.media_root = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, self.media_root, ignore_errors=True)
+        media_settings = override_settings(MEDIA_ROOT=self.media_root)
+        media_settings.enable()
+        self.addCleanup(media_settings.disable)
+        self.user = CustomUser.objects.create_user(
+            employee_id='7778', email='md@ntc.net.np', password='Nepal@123',
+            role=RoleHierarchy.objects.create(role_name='MD')
+        )
+        self.client.force_authenticate(user=self.user)
+        self.project = Project.objects.create(
+            title='Fibre', one_line_description='Fibre', description='Fibre rollout', program='Wireline',
+            start_date='2025-04-01', deadline_date='2025-06-01', identification_no='ID-1',
+            selected_contractor='ACME', created_by=self.user
+        )
+        self.url = f'/agency_app/discussions/{self.project.id}/'
+
+    def files(self, count):
+        return [SimpleUploadedFile(f'doc{i}.pdf', b'%PDF-' + bytes([i])) for i in range(count)]
+
+    def stored_files(self):
+        folder = os.path.join(self.media_root, 'project_documents')
+        return os.listdir(folder) if os.path.isdir(folder) else []
+
+    def test_upload_documents_stores_every_file(self):
+        """Test that every uploaded file is stored under its own name with its own row"""
+        response = self.client.post(f'{self.url}upload-documents/', {'files': self.files(12)}, format='multipart')
+        self.assertEqual(response.status_code, status.HTTP_201_CREATED)
+        self.assertEqual([doc['name'] for doc in response.data], [f'doc{i}.pdf' for i in range(12)])
+        documents = Document.objects.filter(project=self.project)
+        self.assertEqual(len({doc.file.name for doc in documents}), 12)
+        self.assertEqual(sorted(doc.file.read() for doc in documents), sorted(f.read() for f in self.files(12)))
+
+    def test_upload_query_count_is_constant(self):
+        """Test that rows are inserted in bulk however many files are uploaded"""
+        with self.assertNumQueries(4):
+            self.client.post(f'{self.url}upload-documents/', {'files': self.files(2)}, format='multipart')
+        with self.assertNumQueries(4):
+            self.client.post(f'{self.url}upload-documents/', {'files': self.files(20)}, format='multipart')
+
+    def test_comment_attachments_are_linked(self):
+        """Test that a comment with attachments links every document"""
+        response = self.client.post(
+            f'{self.url}comments/with-attachments/', {'content': 'See attached', 'files': self.files(5)}, format='multipart'
+        )
+        self.assertEqual(response.status_code, status.HTTP_201_CREATED)
+        self.assertEqual(len(response.data['attachments']), 5)
+        self.assertEqual(Comment.objects.get().attachments.count(), 5)
+
+    def test_failed_insert_removes_stored_files(self):
+        """Test that stored files and the comment are rolled back when the insert fails"""
+        with mock.patch.object(Document.objects, 'bulk_create', side_effect=RuntimeError('insert failed')):
+            response = self.client.post(
+                f'{self.url}comments/with-attachments/', {'content': 'See attached', 'files': self.files(5)}, format='multipart'
+            )
+        self.assertEqual(response.status_code, status.HTTP_500_INTERNAL_SERVER_ERROR)
+        self.assertFalse(Comment.objects.exists())
+        self.assertFalse(Document.objects.exists())
+        self.assertEqual(self.stored_files(), [])
@@ -0,0 +1,90 @@
+from django.core.files.uploadedfile import SimpleUploadedFile
+from django.db import connection
+from django.test import override_settings
+from django.test.utils import CaptureQueriesContext
+from rest_framework import status
+from rest_framework.test import APITestCase
+from users.models import CustomUser, RoleHierarchy
+from procurement.models import ProcurementPlan
+from agency_app.models import Project, Document
+import tempfile
+
+@override_settings(MEDIA_ROOT=tempfile.mkdtemp())
+class ProjectListSerializerTests(APITestCase):
+    """Tests for the compact discussions list payload."""
+
+    url = '/agency_app/discussions/'
+
+    def setUp(self):
+        self.user = CustomUser.objects.create_user(
+            employee_id='7778', email='md@ntc.net.np', password='Nepal@123',
+            role=RoleHierarchy.objects.create(role_name='MD')
+        )
+        self.client.force_authenticate(user=self.user)
+
+    def add_projects(self, count, documents):
+        for i in range(count):
+            plan = ProcurementPlan.objects.create(
+                policy_number=f'PP-2081-WL-N-{Project.objects.count():03}', department='Wireline',
+                project_name='Fibre', project_description='Fibre rollout', estimated_cost=1000, budget=900,
+                owner=self.user
+            )
+            project = Project.objects.create(
+                title=f'Project {i}', one_line_description='Fibre', description='Fibre rollout', program='Wireline',
+                start_date='2025-04-01', deadline_date='2025-06-01', identification_no=f'ID-{i}',
+                selected_contractor='ACME', created_by=self.user, procurement_plan=plan
+            )
+            for j in range(documents):
+                Document.objects.create(project=project, name=f'doc{j}.pdf', file=SimpleUploadedFile(f'doc{j}.pdf', b'%PDF'))
+
+    def get(self, params=None):
+        with CaptureQueriesContext(connection) as ctx:
+            response = self.client.get(self.url, params or {})
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        return response, len(ctx.captured_queries)
+
+    def test_default_row_is_compact(self):
+        """Test that list rows carry counts and a plan summary instead of nested payloads"""
+        self.add_projects(1, 3)
+        response, _ = self.get()
+        row = response.data[0]
+        self.assertNotIn('documents', row)
+        self.assertEqual(row['document_count'], 3)
+        self.assertEqual(set(row['procurement_plan']), {'id', 'project_name', 'policy_number'})
+        self.assertEqual(row['created_by_email'], 'md@ntc.net.np')
+
+    def test_query_count_is_constant(self):
+        """Test that the list costs the same queries for one project or many"""
+        self.add_projects(1, 1)
+        _, small = self.get()
+        self.add_projects(6, 4)
+        response, large = self.get()
+        self.assertEqual(len(response.data), 7)
+        self.assertEqual(small, large)
+
+    def test_expand_restores_nested_relations(self):
+        """Test that expand opts back into documents and the full plan"""
+        self.add_projects(2, 2)
+        _, small = self.get({'expand': 'documents,procurement_plan'})
+        self.add_projects(4, 3)
+        response, large = self.get({'expand': 'documents,procurement_plan'})
+        self.assertEqual(small, large)
+        row = response.data[0]
+        self.assertEqual(len(row['documents']), 3)
+        self.assertIn('quarterly_targets', row['procurement_plan'])
+
+    def test_fields_narrows_columns(self):
+        """Test that fields keeps only the requested columns plus expansions"""
+        self.add_projects(1, 1)
+        response, _ = self.get({'fields': 'id,title'})
+        self.assertEqual(set(response.data[0]), {'id', 'title'})
+        response, _ = self.get({'fields': 'id', 'expand': 'documents'})
+        self.assertEqual(set(response.data[0]), {'id', 'documents'})
+
+    def test_detail_keeps_full_nesting(self):
+        """Test that retrieve still returns documents and the full plan"""
+        self.add_projects(1, 2)
+        project = Project.objects.get()
+        response = self.client.get(f'{self.url}{project.id}/')
+        self.assertEqual(len(response.data['documents']), 2)
+        self.assertIn('committee', response.data['procurement_plan'])
@@ -0,0 +1,53 @@
+# backend/agency_app/uploads.py
+from concurrent.futures import ThreadPoolExecutor
+from django.conf import settings
+from django.db import transaction
+from .models import Document, Comment
+
+def store_files(storage, names, files, max_length=None):
+    """
+    Write ``files`` to ``storage`` concurrently. Returns the stored names in
+    order; if any write fails the ones that succeeded are deleted and the
+    first error is raised.
+    """
+    with ThreadPoolExecutor(max_workers=settings.DOCUMENT_UPLOAD_WORKERS) as pool:
+        futures = [pool.submit(storage.save, name, file, max_length=max_length) for name, file in zip(names, files)]
+    stored, error = [], None
+    for future in futures:
+        try:
+            stored.append(future.result())
+        except Exception as e:
+            error = error or e
+    if error:
+        delete_files(storage, stored)
+        raise error
+    return stored
+
+def delete_files(storage, names):
+    for name in names:
+        storage.delete(name)
+
+def bulk_create_documents(project, files, comment=None):
+    """
+    Store uploaded ``files`` for ``project`` and insert their Document rows in
+    one statement, optionally attaching them to ``comment`` with a single M2M
+    insert. Stored files are removed again if the database work fails.
+    """
+    field = Document._meta.get_field('file')
+    documents = [Document(project=project, name=file.name) for file in files]
+    names = [field.generate_filename(document, file.name) for document, file in zip(documents, files)]
+    stored = store_files(field.storage, names, files, max_length=field.max_length)
+    for document, name in zip(documents, stored):
+        document.file.name = name
+    try:
+        with transaction.atomic():
+            Document.objects.bulk_create(documents)
+            if comment is not None:
+                Attachment = Comment.attachments.through
+                Attachment.objects.bulk_create([
+                    Attachment(comment_id=comment.pk, document_id=document.pk) for document in documents
+                ])
+    except Exception:
+        delete_files(field.storage, stored)
+        raise
+    return documents
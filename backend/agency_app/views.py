@@ -10,7 +10,11 @@ from .serializers import (
 from .permissions import IsAdminUser, IsManagerUser, IsContractorOrHigher
 import os
 from django.conf import settings
+from django.db import transaction
+from django.db.models import Count
 from procurement.models import ProcurementPlan
+from core.files import serve_file
+from .uploads import bulk_create_documents
 
 class ProjectViewSet(viewsets.ModelViewSet):
     queryset = Project.objects.all().order_by('-created_at')
@@ -24,6 +28,15 @@ class ProjectViewSet(viewsets.ModelViewSet):
         detail_serializer = ProjectDetailSerializer(project, context=self.get_serializer_context())
         return Response(detail_serializer.data, status=status.HTTP_201_CREATED)
     
+    def get_queryset(self):
+        queryset = super().get_queryset()
+        if self.action != 'list':
+            return queryset
+        queryset = ProjectListSerializer.optimize_queryset(queryset, self.request)
+        if 'document_count' in ProjectListSerializer.emitted_fields(self.request):
+            queryset = queryset.annotate(document_count=Count('documents'))
+        return queryset
+
     def get_serializer_class(self):
         if self.action == 'create':
             return ProjectCreateSerializer
@@ -66,11 +79,10 @@ class ProjectViewSet(viewsets.ModelViewSet):
         if not files:
             return Response({'error': 'No files were provided'}, status=status.HTTP_400_BAD_REQUEST)
         
-        documents = []
-        for file in files:
-            document = Document(project=project, name=file.name, file=file)
-            document.save()
-            documents.append(document)
+        try:
+            documents = bulk_create_documents(project, files)
+        except Exception as e:
+            return Response({'error': f'Failed to upload documents: {str(e)}'}, status=status.HTTP_500_INTERNAL_SERVER_ERROR)
         serializer = DocumentSerializer(documents, many=True, context={'request': request})
         return Response(serializer.data, status=status.HTTP_201_CREATED)
         
@@ -110,14 +122,15 @@ class ProjectViewSet(viewsets.ModelViewSet):
         role = request.user.role.role_name if request.user.role else ''
         if not content:
             return Response({'error': 'Comment content is required'}, status=status.HTTP_400_BAD_REQUEST)
-        comment = Comment(project=project, author=author, content=content, role=role, user=request.user)
-        comment.save()
         files = request.FILES.getlist('files')
-        if files:
-            for file in files:
-                document = Document(project=project, name=file.name, file=file)
-                document.save()
-                comment.attachments.add(document)
+        try:
+            with transaction.atomic():
+                comment = Comment(project=project, author=author, content=content, role=role, user=request.user)
+                comment.save()
+                if files:
+                    bulk_create_documents(project, files, comment=comment)
+        except Exception as e:
+            return Response({'error': f'Failed to save comment: {str(e)}'}, status=status.HTTP_500_INTERNAL_SERVER_ERROR)
         serializer = CommentSerializer(comment, context={'request': request})
         return Response(serializer.data, status=status.HTTP_201_CREATED)
 
@@ -146,6 +159,14 @@ class DocumentViewSet(viewsets.ModelViewSet):
         context = super().get_serializer_context()
         context.update({"request": self.request})
         return context
+
+    @action(detail=True, methods=['get'], url_path='download')
+    def download(self, request, pk=None):
+        document = self.get_object()
+        try:
+            return serve_file(request, document.file.storage, document.file.name, as_attachment=True, filename=document.name)
+        except FileNotFoundError:
+            return Response({'error': 'Document file not found'}, status=status.HTTP_404_NOT_FOUND)
         
     def destroy(self, request, *args, **kwargs):
         document = self.get_object()
@@ -0,0 +1,26 @@
+# Generated by Django 5.1.7 on 2026-10-18 01:39
+
+import django.db.models.deletion
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('bidding', '0001_initial'),
+        ('tender', '0002_alter_tender_specification'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='bid',
+            index=models.Index(fields=['tender', 'submission_date'], name='bid_tender_submitted_idx'),
+        ),
+        migrations.AlterField(
+            model_name='bid',
+            name='tender',
+            field=models.ForeignKey(db_index=False, on_delete=django.db.models.deletion.CASCADE, related_name='bids', to='tender.tender'),
+        ),
+    ]
@@ -3,7 +3,7 @@ from tender.models import Tender
 from users.models import CustomUser
 
 class Bid(models.Model):
-    tender = models.ForeignKey(Tender, on_delete=models.CASCADE, related_name='bids')
+    tender = models.ForeignKey(Tender, on_delete=models.CASCADE, related_name='bids', db_index=False)  # Indexed by bid_tender_submitted_idx
     bidder = models.ForeignKey(CustomUser, on_delete=models.CASCADE)
     bid_amount = models.DecimalField(max_digits=15, decimal_places=2)
     submission_date = models.DateTimeField(auto_now_add=True)
@@ -12,6 +12,9 @@ class Bid(models.Model):
 
     class Meta:
         unique_together = ('tender', 'bidder')
+        indexes = [
+            models.Index(fields=['tender', 'submission_date'], name='bid_tender_submitted_idx'),
+        ]
 
     def __str__(self):
         return f"Bid by {self.bidder.username} for {self.tender.title}"
\ No newline at end of file
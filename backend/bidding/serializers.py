@@ -1,8 +1,22 @@
 from rest_framework import serializers
 from .models import Bid
+from django.db import transaction
+from django.utils import timezone
 from procurement.models import ProcurementPlan
+from procurement.serializers import advance_plan_stage
+from procurement.stages import can_enter
+from tender.serializers import TenderSerializer
+from core.serializers import DynamicFieldsMixin
+
+class BidSerializer(DynamicFieldsMixin, serializers.ModelSerializer):
+    expandable_fields = {
+        'tender': {
+            'serializer': TenderSerializer,
+            'options': {'read_only': True},
+            'select_related': ['tender'],
+        },
+    }
 
-class BidSerializer(serializers.ModelSerializer):
     class Meta:
         model = Bid
         fields = ['id', 'tender', 'bidder', 'bid_amount', 'submission_date', 'documents', 'status']
@@ -11,7 +25,7 @@ class BidSerializer(serializers.ModelSerializer):
     def validate(self, data):
         tender = data.get('tender')
         procurement_plan = tender.procurement_plan
-        if procurement_plan.stage != 'committee':
+        if not can_enter(procurement_plan.stage, 'bidding'):
             raise serializers.ValidationError("Committee must be formed before submitting a bid.")
         if not tender.is_published:
             raise serializers.ValidationError("Tender must be published to accept bids.")
@@ -21,11 +35,9 @@ class BidSerializer(serializers.ModelSerializer):
 
     def create(self, validated_data):
         validated_data['bidder'] = self.context['request'].user
-        bid = Bid.objects.create(**validated_data)
-        # Update the ProcurementPlan stage
-        procurement_plan = validated_data['tender'].procurement_plan
-        procurement_plan.stage = 'bidding'
-        procurement_plan.save()
+        with transaction.atomic():
+            advance_plan_stage(validated_data['tender'].procurement_plan, 'bidding')
+            bid = Bid.objects.create(**validated_data)
         return bid
 
     def update(self, instance, validated_data):
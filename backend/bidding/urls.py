@@ -1,9 +1,10 @@
 from django.urls import path
-from .views import BidListCreateView, BidDetailView
+from .views import BidListCreateView, BidDetailView, BidDocumentDownloadView
 
 app_name = 'bidding'
 
 urlpatterns = [
     path('bids/', BidListCreateView.as_view(), name='bid-list-create'),
     path('bids/<int:pk>/', BidDetailView.as_view(), name='bid-detail'),
+    path('bids/<int:pk>/document/', BidDocumentDownloadView.as_view(), name='bid-document'),
 ]
\ No newline at end of file
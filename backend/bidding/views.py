@@ -3,32 +3,35 @@ from rest_framework.permissions import IsAuthenticated
 from rest_framework.response import Response
 from .models import Bid
 from .serializers import BidSerializer
+from core.serializers import DynamicFieldsQuerysetMixin
+from users.mixins import HierarchyScopedQuerysetMixin
+from core.files import serve_file
 
-class BidListCreateView(generics.ListCreateAPIView):
-    queryset = Bid.objects.all()
+class BidListCreateView(DynamicFieldsQuerysetMixin, HierarchyScopedQuerysetMixin, generics.ListCreateAPIView):
+    queryset = Bid.objects.order_by('-submission_date')
     serializer_class = BidSerializer
     permission_classes = [IsAuthenticated]
-
-    def get_queryset(self):
-        user = self.request.user
-        if not user.is_authenticated or not user.role:
-            return Bid.objects.none()
-        allowed_roles = user.get_allowed_roles()
-        allowed_role_ids = [role.id for role in allowed_roles]
-        return Bid.objects.filter(tender__procurement_plan__owner__role__id__in=allowed_role_ids).order_by('-submission_date')
+    hierarchy_owner_field = 'tender__procurement_plan__owner'
 
     def perform_create(self, serializer):
         serializer.save(bidder=self.request.user)
 
-class BidDetailView(generics.RetrieveUpdateDestroyAPIView):
+class BidDetailView(DynamicFieldsQuerysetMixin, HierarchyScopedQuerysetMixin, generics.RetrieveUpdateDestroyAPIView):
     queryset = Bid.objects.all()
     serializer_class = BidSerializer
     permission_classes = [IsAuthenticated]
+    hierarchy_owner_field = 'tender__procurement_plan__owner'
+
+class BidDocumentDownloadView(HierarchyScopedQuerysetMixin, generics.GenericAPIView):
+    queryset = Bid.objects.all()
+    permission_classes = [IsAuthenticated]
+    hierarchy_owner_field = 'tender__procurement_plan__owner'
 
-    def get_queryset(self):
-        user = self.request.user
-        if not user.is_authenticated or not user.role:
-            return Bid.objects.none()
-        allowed_roles = user.get_allowed_roles()
-        allowed_role_ids = [role.id for role in allowed_roles]
-        return Bid.objects.filter(tender__procurement_plan__owner__role__id__in=allowed_role_ids)
\ No newline at end of file
+    def get(self, request, *args, **kwargs):
+        bid = self.get_object()
+        if not bid.documents:
+            return Response({'error': 'No documents uploaded for this bid.'}, status=status.HTTP_404_NOT_FOUND)
+        try:
+            return serve_file(request, bid.documents.storage, bid.documents.name, as_attachment=True)
+        except FileNotFoundError:
+            return Response({'error': 'Bid document file not found.'}, status=status.HTTP_404_NOT_FOUND)
@@ -0,0 +1,84 @@
+# committee/memberships.py
+from django.db import transaction
+from django.db.models import Case, Value, When
+from .models import CommitteeMembership
+from users.models import CustomUser
+
+def resolve_employee_ids(employee_ids):
+    """``{employee_id: user pk}`` for the given employee ids, in one IN query."""
+    return dict(CustomUser.objects.filter(employee_id__in=set(employee_ids)).values_list('employee_id', 'pk'))
+
+def apply_membership_changes(committee, add=None, remove=(), change=None):
+    """
+    Apply a membership diff in at most three statements: ``remove`` (user
+    pks) is one DELETE, ``add`` (``{user pk: role}``) one bulk INSERT and
+    ``change`` (``{user pk: role}``) one UPDATE ... CASE of existing rows.
+    """
+    add, change = add or {}, change or {}
+    with transaction.atomic():
+        if remove:
+            CommitteeMembership.objects.filter(committee=committee, user_id__in=remove).delete()
+        if add:
+            CommitteeMembership.objects.bulk_create([
+                CommitteeMembership(committee=committee, user_id=user_id, committee_role=role)
+                for user_id, role in add.items()
+            ])
+        if change:
+            CommitteeMembership.objects.filter(committee=committee, user_id__in=change).update(
+                committee_role=Case(*(When(user_id=user_id, then=Value(role)) for user_id, role in change.items()))
+            )
+
+def sync_memberships(committee, members):
+    """
+    Make ``committee``'s memberships match ``members`` (validated dicts with
+    ``user_id`` and ``role``), touching only rows that differ. Returns the
+    applied diff as ``(add, remove, change)``.
+    """
+    current = dict(CommitteeMembership.objects.filter(committee=committee).values_list('user_id', 'committee_role'))
+    wanted = {member['user_id']: member['role'] for member in members}
+    add = {user_id: role for user_id, role in wanted.items() if user_id not in current}
+    remove = [user_id for user_id in current if user_id not in wanted]
+    change = {user_id: role for user_id, role in wanted.items() if user_id in current and current[user_id] != role}
+    apply_membership_changes(committee, add, remove, change)
+    return add, remove, change
+
+class MembershipError(ValueError):
+    def __init__(self, errors):
+        super().__init__('; '.join(errors))
+        self.errors = errors
+
+def apply_membership_operations(committee, operations):
+    """
+    Apply a batch of ``{'op': 'add' | 'remove' | 'role', 'employeeId', 'role'}``
+    operations with a fixed number of queries, whatever the batch size. Every
+    operation is checked against the current memberships first; if any fails
+    nothing is written and MembershipError lists all the problems.
+
+    Returns the applied diff keyed by employee id.
+    """
+    user_ids = resolve_employee_ids(operation['employeeId'] for operation in operations)
+    current = dict(CommitteeMembership.objects.filter(committee=committee).values_list('user_id', 'committee_role'))
+    add, remove, change, errors = {}, [], {}, []
+    diff = {'added': [], 'removed': [], 'changed': []}
+    for operation in operations:
+        employee_id, op = operation['employeeId'], operation['op']
+        user_id = user_ids.get(employee_id)
+        if user_id is None:
+            errors.append(f"User with employee_id {employee_id} not found.")
+        elif op == 'add':
+            if user_id in current:
+                errors.append(f"User {employee_id} is already a member of this committee.")
+            add[user_id] = operation['role']
+            diff['added'].append({'employeeId': employee_id, 'role': operation['role']})
+        elif user_id not in current:
+            errors.append(f"User {employee_id} is not a member of this committee.")
+        elif op == 'remove':
+            remove.append(user_id)
+            diff['removed'].append({'employeeId': employee_id, 'role': current[user_id]})
+        elif current[user_id] != operation['role']:
+            change[user_id] = operation['role']
+            diff['changed'].append({'employeeId': employee_id, 'role': operation['role'], 'previousRole': current[user_id]})
+    if errors:
+        raise MembershipError(errors)
+    apply_membership_changes(committee, add, remove, change)
+    return diff
@@ -0,0 +1,17 @@
+# Generated by Django 5.1.7 on 2026-10-18 01:23
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('committee', '0007_committee_deadline'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='committee',
+            index=models.Index(fields=['-created_at', '-id'], name='committee_created_id_idx'),
+        ),
+    ]
@@ -0,0 +1,30 @@
+# Generated by Django 5.1.7 on 2026-10-18 01:39
+
+import django.db.models.deletion
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('committee', '0008_committee_created_id_idx'),
+        ('procurement', '0003_procurementplan_stage'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='committee',
+            index=models.Index(fields=['formation_date', 'created_by'], name='committee_formed_creator_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='committeemembership',
+            index=models.Index(fields=['user', 'committee'], name='membership_user_committee_idx'),
+        ),
+        migrations.AlterField(
+            model_name='committeemembership',
+            name='user',
+            field=models.ForeignKey(db_index=False, on_delete=django.db.models.deletion.CASCADE, to=settings.AUTH_USER_MODEL),
+        ),
+    ]
@@ -1,9 +1,31 @@
 # committee/models.py
+from django.contrib.postgres.indexes import GinIndex
+from django.contrib.postgres.search import SearchVectorField
 from django.db import models
 from users.models import CustomUser
 from procurement.models import ProcurementPlan
 from django.utils import timezone
 
+class CommitteeQuerySet(models.QuerySet):
+    def with_members(self):
+        """Load creator, creator role and memberships with their users up front for serialization."""
+        return self.select_related('created_by__role').prefetch_related(
+            models.Prefetch(
+                'memberships',
+                queryset=CommitteeMembership.objects.select_related('user').order_by('id')
+            )
+        )
+
+    def visible_to(self, user):
+        """Committees the user created, sits on, or that were created within their role subtree."""
+        if user.role and user.role.role_name == 'SUPERADMIN':
+            return self
+        return self.filter(
+            models.Q(created_by=user) |
+            models.Q(memberships__user=user) |
+            models.Q(created_by__role__in=user.role.subtree_ids(include_self=False))
+        ).distinct()
+
 class Committee(models.Model):
     COMMITTEE_TYPES = [
         ('specification', 'Specification'),
@@ -32,6 +54,19 @@ class Committee(models.Model):
     created_at = models.DateTimeField(auto_now_add=True)
     updated_at = models.DateTimeField(auto_now=True)
     deadline = models.DateField(null=True, blank=True)  # New field for deadline
+    # Maintained by a database trigger from name and purpose
+    search_vector = SearchVectorField(null=True, editable=False)
+
+    objects = CommitteeQuerySet.as_manager()
+
+    class Meta:
+        indexes = [
+            # Serves the keyset pagination order used by the committee listings.
+            models.Index(fields=['-created_at', '-id'], name='committee_created_id_idx'),
+            # Date-range listings, narrowed by creator for role-scoped views.
+            models.Index(fields=['formation_date', 'created_by'], name='committee_formed_creator_idx'),
+            GinIndex(fields=['search_vector'], name='committee_search_vector_idx'),
+        ]
 
     def __str__(self):
         return self.name
@@ -44,12 +79,17 @@ class CommitteeMembership(models.Model):
     ]
 
     committee = models.ForeignKey(Committee, related_name='memberships', on_delete=models.CASCADE)
-    user = models.ForeignKey(CustomUser, on_delete=models.CASCADE)
+    # Indexed by membership_user_committee_idx
+    user = models.ForeignKey(CustomUser, on_delete=models.CASCADE, db_index=False)
     committee_role = models.CharField(max_length=50, choices=COMMITTEE_ROLES, default='member')
     created_at = models.DateTimeField(default=timezone.now)
 
     class Meta:
         unique_together = ('committee', 'user')
+        indexes = [
+            # "Committees this user sits on" without touching the table.
+            models.Index(fields=['user', 'committee'], name='membership_user_committee_idx'),
+        ]
 
     def __str__(self):
         return f"{self.user.username} - {self.committee.name} ({self.committee_role})"
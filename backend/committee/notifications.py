@@ -0,0 +1,47 @@
+# committee/notifications.py
+import logging
+from core.notifications import broadcast
+from .models import CommitteeMembership
+
+logger = logging.getLogger(__name__)
+
+def notify_committee_formed(committee, user_ids):
+    """
+    Tell the members of a new ``committee`` (``user_ids``) in-app and by email.
+    Only the broadcast is written here; the fanout_notifications worker does
+    the per-member inserts.
+    """
+    item = broadcast(
+        user_ids,
+        title=f'Committee appointment: {committee.name}',
+        body=(
+            f'You have been appointed to the {committee.get_committee_type_display()} '
+            f'committee "{committee.name}".\n\nPurpose: {committee.purpose}'
+        ),
+        category='committee', link=f'/committees/{committee.id}', send_email=True,
+    )
+    if item:
+        logger.debug(f"Queued appointment notice for {len(item.recipients)} members of committee {committee.id}")
+    return item
+
+def notify_membership_changed(committee, added=(), removed=(), changed=()):
+    """
+    Tell current members of ``committee`` and those just ``removed`` that its
+    membership changed, when the committee asks for notifications. The
+    arguments are user pks; costs one query plus one INSERT.
+    """
+    if not committee.should_notify or not (added or removed or changed):
+        return None
+    members = CommitteeMembership.objects.filter(committee=committee).values_list('user_id', flat=True)
+    item = broadcast(
+        [*members, *removed],
+        title=f'Committee membership changed: {committee.name}',
+        body=(
+            f'The membership of the committee "{committee.name}" changed: {len(added)} added, '
+            f'{len(removed)} removed, {len(changed)} role changes.'
+        ),
+        category='committee', link=f'/committees/{committee.id}', send_email=True,
+    )
+    if item:
+        logger.debug(f"Queued membership notice for {len(item.recipients)} users of committee {committee.id}")
+    return item
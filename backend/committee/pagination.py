@@ -0,0 +1,6 @@
+# committee/pagination.py
+from core.pagination import KeysetPaginator
+
+class CommitteePaginator(KeysetPaginator):
+    page_size_setting = 'COMMITTEE_PAGE_SIZE'
+    max_page_size_setting = 'COMMITTEE_MAX_PAGE_SIZE'
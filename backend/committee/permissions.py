@@ -1,10 +1,120 @@
+from django.conf import settings
+from django.core.cache import cache
 from rest_framework.permissions import BasePermission
 from .models import Committee, CommitteeMembership
-from users.models import RoleHierarchy
+from users.role_tree import get_role_tree
 import logging
 
 logger = logging.getLogger(__name__)
 
+ACTIONS = ('retrieve', 'update', 'destroy')
+
+class CommitteeAccess:
+    """
+    Committee permission decisions for one user, keyed by (committee id,
+    action). One instance is shared by everything serving a request, and
+    ``prime()`` decides a whole page of committees in at most two queries so
+    later checks are dictionary lookups. With COMMITTEE_PERMISSION_CACHE_TTL
+    set, decisions are also kept in the Django cache for that many seconds,
+    keyed by the user's role and the role tree version.
+    """
+    def __init__(self, user):
+        self.user = user
+        self.decisions = {}
+        self._tree = None
+
+    @classmethod
+    def for_request(cls, request):
+        request = getattr(request, '_request', request)
+        access = getattr(request, '_committee_access', None)
+        if access is None or access.user.pk != request.user.pk:
+            access = request._committee_access = cls(request.user)
+        return access
+
+    @property
+    def tree(self):
+        if self._tree is None:
+            self._tree = get_role_tree()
+        return self._tree
+
+    @property
+    def is_superadmin(self):
+        return bool(self.user.role) and self.user.role.role_name == 'SUPERADMIN'
+
+    def cache_key(self, committee_id, action):
+        return f"committee-permission:{self.tree.version}:{self.user.pk}:{self.user.role_id}:{committee_id}:{action}"
+
+    def has_permission(self, committee, action):
+        key = (committee.pk, action)
+        if key not in self.decisions:
+            self.prime([committee], [action])
+        return self.decisions[key]
+
+    def permissions(self, committee):
+        self.prime([committee])
+        return {action: self.decisions[(committee.pk, action)] for action in ACTIONS}
+
+    def prime(self, committees, actions=ACTIONS):
+        """Decide every (committee, action) pair not already known."""
+        pending = {committee.pk: committee for committee in committees if any(
+            (committee.pk, action) not in self.decisions for action in actions
+        )}
+        if not pending:
+            return
+        ttl = settings.COMMITTEE_PERMISSION_CACHE_TTL
+        if ttl:
+            keys = {self.cache_key(pk, action): (pk, action) for pk in pending for action in actions}
+            self.decisions.update({keys[key]: allowed for key, allowed in cache.get_many(keys).items()})
+            pending = {pk: committee for pk, committee in pending.items() if any(
+                (pk, action) not in self.decisions for action in actions
+            )}
+            if not pending:
+                return
+
+        decided = self.decide(pending.values(), actions)
+        self.decisions.update(decided)
+        if ttl:
+            cache.set_many({self.cache_key(pk, action): allowed for (pk, action), allowed in decided.items()}, ttl)
+
+    def decide(self, committees, actions):
+        committees = list(committees)
+        if self.is_superadmin:
+            return {(committee.pk, action): True for committee in committees for action in actions}
+
+        member_of = set()
+        if 'retrieve' in actions:
+            unloaded = []
+            for committee in committees:
+                memberships = getattr(committee, '_prefetched_objects_cache', {}).get('memberships')
+                if memberships is None:
+                    unloaded.append(committee.pk)
+                elif any(membership.user_id == self.user.pk for membership in memberships):
+                    member_of.add(committee.pk)
+            if unloaded:
+                member_of.update(CommitteeMembership.objects.filter(
+                    committee_id__in=unloaded, user=self.user
+                ).values_list('committee_id', flat=True))
+
+        # Use the creator's role when it was loaded with the committee
+        creator_roles, unloaded = {}, []
+        for committee in committees:
+            if committee.created_by_id is None:
+                creator_roles[committee.pk] = None
+            elif Committee.created_by.is_cached(committee):
+                creator_roles[committee.pk] = committee.created_by.role_id
+            else:
+                unloaded.append(committee.pk)
+        if unloaded:
+            creator_roles.update(Committee.objects.filter(pk__in=unloaded).values_list('pk', 'created_by__role_id'))
+        subordinate_roles = self.tree.descendant_ids(self.user.role_id) if self.user.role_id else frozenset()
+
+        decisions = {}
+        for committee in committees:
+            owns = committee.created_by_id == self.user.pk or creator_roles[committee.pk] in subordinate_roles
+            for action in actions:
+                decisions[(committee.pk, action)] = owns or (action == 'retrieve' and committee.pk in member_of)
+        return decisions
+
 class CommitteePermission(BasePermission):
     def has_permission(self, request, view):
         # Allow authenticated users to list or create committees
@@ -21,6 +131,7 @@ class CommitteePermission(BasePermission):
             'DeleteCommitteeView': 'destroy',
             'AddMemberView': 'update',
             'RemoveMemberView': 'update',
+            'BulkMembershipView': 'update',
             'GetCommitteesByMemberView': 'list',
             'GetCommitteesByDateRangeView': 'list',
             'DownloadFormationLetterView': 'retrieve'
@@ -50,6 +161,7 @@ class CommitteePermission(BasePermission):
             'DeleteCommitteeView': 'destroy',
             'AddMemberView': 'update',
             'RemoveMemberView': 'update',
+            'BulkMembershipView': 'update',
             'DownloadFormationLetterView': 'retrieve'
         }
 
@@ -58,31 +170,17 @@ class CommitteePermission(BasePermission):
 
         logger.debug(f"Checking object permission for action: {action}, user: {request.user}, object: {obj}")
 
-        # SUPERADMIN has full access
-        if request.user.role and request.user.role.role_name == 'SUPERADMIN':
-            logger.debug("Permission granted: User is SUPERADMIN")
-            return True
-
-        # Allow creator to perform all actions
-        if isinstance(obj, Committee) and obj.created_by == request.user:
-            logger.debug("Permission granted: User is the creator")
-            return True
-
-        # Allow committee members to view
-        if action == 'retrieve' and isinstance(obj, Committee):
-            if CommitteeMembership.objects.filter(committee=obj, user=request.user).exists():
-                logger.debug("Permission granted: User is a committee member")
-                return True
-
-        # Allow users with higher role hierarchy to perform actions
-        if isinstance(obj, Committee) and obj.created_by.role:
-            user_role = request.user.role
-            if user_role and obj.created_by.role in user_role.get_all_descendants():
-                logger.debug("Permission granted: User's role is higher in hierarchy")
-                return True
-
-        logger.debug("Permission denied: No matching permission criteria")
-        return False
+        access = CommitteeAccess.for_request(request)
+        if not isinstance(obj, Committee):
+            logger.debug(f"Only SUPERADMIN may act on non-committee object: {obj}")
+            return access.is_superadmin
+
+        allowed = access.has_permission(obj, action)
+        if allowed:
+            logger.debug("Permission granted: User is SUPERADMIN, the creator, a member or higher in the role hierarchy")
+        else:
+            logger.debug("Permission denied: No matching permission criteria")
+        return allowed
 
 
 ###### start of code
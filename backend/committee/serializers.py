@@ -1,14 +1,19 @@
 # committee/serializers.py
 from rest_framework import serializers
 from django.conf import settings
+from django.db import transaction
+from django.db.models import Prefetch
 from .models import Committee, CommitteeMembership
+from .memberships import apply_membership_changes, resolve_employee_ids, sync_memberships
+from .permissions import CommitteeAccess
 from users.models import CustomUser
+from core.serializers import DynamicFieldsMixin
 from procurement.models import ProcurementPlan
 import logging
 
 logger = logging.getLogger(__name__)
 
-class CommitteeMemberSerializer(serializers.ModelSerializer):
+class CommitteeMemberSerializer(DynamicFieldsMixin, serializers.ModelSerializer):
     employeeId = serializers.CharField(source='employee_id')
     name = serializers.CharField(source='username')
     role = serializers.SerializerMethodField()
@@ -22,6 +27,9 @@ class CommitteeMemberSerializer(serializers.ModelSerializer):
         fields = ['_id', 'employeeId', 'name', 'role', 'email', 'department', 'designation']
 
     def get_role(self, obj):
+        committee_roles = self.context.get('committee_roles')
+        if committee_roles is not None:
+            return committee_roles.get(obj.pk, 'member')
         membership = CommitteeMembership.objects.filter(
             user=obj, committee=self.context['committee']
         ).first()
@@ -33,13 +41,44 @@ class CommitteeMemberSerializer(serializers.ModelSerializer):
     def get_designation(self, obj):
         return getattr(obj, 'designation', None)
 
-class CommitteeSerializer(serializers.ModelSerializer):
+class MembershipOperationSerializer(serializers.Serializer):
+    op = serializers.ChoiceField(choices=['add', 'remove', 'role'])
+    employeeId = serializers.CharField()
+    role = serializers.ChoiceField(choices=CommitteeMembership.COMMITTEE_ROLES, required=False)
+
+    def validate(self, attrs):
+        if attrs['op'] == 'role' and 'role' not in attrs:
+            raise serializers.ValidationError("role is required to change a member's role.")
+        if attrs['op'] == 'add':
+            attrs.setdefault('role', 'member')
+        return attrs
+
+class BulkMembershipSerializer(serializers.Serializer):
+    operations = MembershipOperationSerializer(many=True, allow_empty=False)
+
+    def validate_operations(self, value):
+        employee_ids = [operation['employeeId'] for operation in value]
+        if len(employee_ids) != len(set(employee_ids)):
+            raise serializers.ValidationError("Each employee may appear in only one operation.")
+        return value
+
+class CommitteeListSerializer(serializers.ListSerializer):
+    def to_representation(self, data):
+        # Decide permissions for the whole page up front instead of per row
+        request = self.context.get('request')
+        if 'permissions' in self.child.fields and request and request.user.is_authenticated:
+            data = list(data.all() if hasattr(data, 'all') else data)
+            CommitteeAccess.for_request(request).prime(data)
+        return super().to_representation(data)
+
+class CommitteeSerializer(DynamicFieldsMixin, serializers.ModelSerializer):
     _id = serializers.CharField(source='id', read_only=True)
     createdBy = serializers.SerializerMethodField()
     createdAt = serializers.DateTimeField(source='created_at', read_only=True)
     updatedAt = serializers.DateTimeField(source='updated_at', read_only=True)
     formationLetterURL = serializers.SerializerMethodField()
     membersList = serializers.SerializerMethodField()
+    permissions = serializers.SerializerMethodField()
     procurement_plan = serializers.PrimaryKeyRelatedField(
         queryset=ProcurementPlan.objects.all(),
         required=False,
@@ -55,6 +94,14 @@ class CommitteeSerializer(serializers.ModelSerializer):
     approvalStatus = serializers.CharField(source='approval_status', required=False)
     deadline = serializers.DateField(required=False, allow_null=True, input_formats=['%Y-%m-%d'])
 
+    # (add, remove, change) applied by the last update(), for notifications
+    membership_changes = None
+
+    select_related_fields = {'createdBy': ['created_by__role']}
+    prefetch_related_fields = {
+        'membersList': [Prefetch('memberships', CommitteeMembership.objects.select_related('user').order_by('id'))],
+    }
+
     class Meta:
         model = Committee
         fields = [
@@ -62,12 +109,22 @@ class CommitteeSerializer(serializers.ModelSerializer):
             'formation_date', 'specification_submission_date', 'review_date',
             'schedule', 'should_notify', 'formation_letter', 'formationLetterURL',
             'createdBy', 'createdAt', 'updatedAt', 'members', 'membersList',
-            'approvalStatus', 'deadline'  # Added 'deadline'
+            'approvalStatus', 'deadline',  # Added 'deadline'
+            'permissions'
         ]
         read_only_fields = [
             '_id', 'createdBy', 'createdAt', 'updatedAt',
-            'formationLetterURL', 'membersList'
+            'formationLetterURL', 'membersList', 'permissions'
         ]
+        list_serializer_class = CommitteeListSerializer
+
+    def get_fields(self):
+        fields = super().get_fields()
+        # Only the committee list and detail endpoints ask for permissions;
+        # nested committees (plans, evaluations) never carry them.
+        if not self.context.get('with_permissions'):
+            fields.pop('permissions')
+        return fields
 
     def get_createdBy(self, obj):
         user = obj.created_by
@@ -81,6 +138,13 @@ class CommitteeSerializer(serializers.ModelSerializer):
             'employeeId': user.employee_id
         }
 
+    def get_permissions(self, obj):
+        """What the requesting user may do with this committee, for showing or hiding actions."""
+        request = self.context.get('request')
+        if not request or not request.user.is_authenticated:
+            return None
+        return CommitteeAccess.for_request(request).permissions(obj)
+
     def get_formationLetterURL(self, obj):
         if obj.formation_letter:
             return f'{settings.MEDIA_URL}{obj.formation_letter.name}'
@@ -88,28 +152,28 @@ class CommitteeSerializer(serializers.ModelSerializer):
 
     def get_membersList(self, obj):
         memberships = obj.memberships.all()
+        if 'memberships' not in getattr(obj, '_prefetched_objects_cache', {}):
+            memberships = memberships.select_related('user')
+        committee_roles = {membership.user_id: membership.committee_role for membership in memberships}
         return CommitteeMemberSerializer(
             [membership.user for membership in memberships],
             many=True,
-            context={'committee': obj}
+            context={'committee': obj, 'committee_roles': committee_roles}
         ).data
 
     def validate_members(self, value):
         if not isinstance(value, list):
             raise serializers.ValidationError("Members must be a list.")
         valid_roles = [r[0] for r in CommitteeMembership.COMMITTEE_ROLES]
-        employee_ids = []
         normalized_members = []
 
         for member in value:
             if isinstance(member, str):
                 employee_id = member
                 role = 'member'
-                normalized_members.append({'employeeId': employee_id, 'role': role})
             elif isinstance(member, dict):
                 employee_id = member.get('employeeId')
                 role = member.get('role', 'member')
-                normalized_members.append({'employeeId': employee_id, 'role': role})
             else:
                 raise serializers.ValidationError("Each member must be a string or an object with employeeId.")
 
@@ -117,12 +181,16 @@ class CommitteeSerializer(serializers.ModelSerializer):
                 raise serializers.ValidationError("Each member must have an employeeId.")
             if role not in valid_roles:
                 raise serializers.ValidationError(f"Invalid role: {role}. Must be one of {valid_roles}.")
-            if not CustomUser.objects.filter(employee_id=employee_id).exists():
-                raise serializers.ValidationError(f"User with employee_id {employee_id} not found.")
-            employee_ids.append(employee_id)
+            normalized_members.append({'employeeId': employee_id, 'role': role})
 
+        employee_ids = [member['employeeId'] for member in normalized_members]
         if len(employee_ids) != len(set(employee_ids)):
             raise serializers.ValidationError("Duplicate employee IDs are not allowed.")
+        user_ids = resolve_employee_ids(employee_ids)
+        for member in normalized_members:
+            if member['employeeId'] not in user_ids:
+                raise serializers.ValidationError(f"User with employee_id {member['employeeId']} not found.")
+            member['user_id'] = user_ids[member['employeeId']]
         return normalized_members
 
     def validate_procurement_plan(self, value):
@@ -133,18 +201,13 @@ class CommitteeSerializer(serializers.ModelSerializer):
     def create(self, validated_data):
         members = validated_data.pop('members', [])
         formation_letter = validated_data.pop('formation_letter', None)
-        committee = Committee.objects.create(
-            **validated_data,
-            formation_letter=formation_letter,
-            created_by=self.context['request'].user
-        )
-        for member in members:
-            user = CustomUser.objects.get(employee_id=member['employeeId'])
-            CommitteeMembership.objects.create(
-                committee=committee,
-                user=user,
-                committee_role=member.get('role', 'member')
+        with transaction.atomic():
+            committee = Committee.objects.create(
+                **validated_data,
+                formation_letter=formation_letter,
+                created_by=self.context['request'].user
             )
+            apply_membership_changes(committee, add={member['user_id']: member['role'] for member in members})
         return committee
 
     def update(self, instance, validated_data):
@@ -158,18 +221,12 @@ class CommitteeSerializer(serializers.ModelSerializer):
         if formation_letter is not None:
             instance.formation_letter = formation_letter
 
-        instance.save()
-
-        if members is not None:
-            CommitteeMembership.objects.filter(committee=instance).delete()
-            for member in members:
-                user = CustomUser.objects.get(employee_id=member['employeeId'])
-                CommitteeMembership.objects.create(
-                    committee=instance,
-                    user=user,
-                    committee_role=member.get('role', 'member')
-                )
-            logger.debug(f"Members updated: {[m['employeeId'] for m in members]}")
+        with transaction.atomic():
+            instance.save()
+            if members is not None:
+                add, remove, change = sync_memberships(instance, members)
+                self.membership_changes = (add, remove, change)
+                logger.debug(f"Members updated: {len(add)} added, {len(remove)} removed, {len(change)} role changes")
 
         return instance
 
@@ -0,0 +1,211 @@
+import json
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+from rest_framework import status
+from rest_framework.test import APITestCase
+from core.models import Notification, NotificationBroadcast, OutboundEmail
+from core.notifications import process_broadcasts, unread_count
+from users.models import CustomUser, RoleHierarchy
+from .models import Committee, CommitteeMembership
+
+class CommitteeMemberBatchTest(APITestCase):
+    """
+    Test that committee members are validated in one query and written in
+    bulk, and that updates only touch memberships that changed.
+    """
+    def setUp(self):
+        self.superadmin_role = RoleHierarchy.objects.create(role_name='SUPERADMIN')
+        self.superadmin = CustomUser.objects.create_user(
+            employee_id='admin', email='superadmin@ntc.net.np', password='Nepal@123', role=self.superadmin_role
+        )
+        self.users = [
+            CustomUser.objects.create_user(
+                employee_id=f'E{i:03}', email=f'e{i}@ntc.net.np', password='Nepal@123', role=self.superadmin_role
+            )
+            for i in range(15)
+        ]
+        self.client.force_authenticate(user=self.superadmin)
+
+    def create(self, members):
+        with CaptureQueriesContext(connection) as ctx:
+            response = self.client.post('/api/committee/committees/create/', {
+                'name': 'Evaluation Committee', 'purpose': 'Evaluation', 'committee_type': 'evaluation',
+                'members': json.dumps(members),
+            })
+        return response, ctx.captured_queries
+
+    def update(self, committee, members, should_notify='false'):
+        with CaptureQueriesContext(connection) as ctx:
+            response = self.client.patch(
+                f'/api/committee/committees/update/{committee.pk}/', {
+                    'name': committee.name, 'purpose': committee.purpose, 'committee_type': committee.committee_type,
+                    'should_notify': should_notify, 'members': json.dumps(members),
+                }
+            )
+        self.assertEqual(response.status_code, status.HTTP_200_OK, response.data)
+        return ctx.captured_queries
+
+    def roles(self, committee):
+        return dict(CommitteeMembership.objects.filter(committee=committee).values_list('user__employee_id', 'committee_role'))
+
+    def writes(self, queries, table='committee_committeemembership'):
+        return [q['sql'] for q in queries if table in q['sql'] and not q['sql'].startswith('SELECT')]
+
+    def test_create_cost_is_independent_of_member_count(self):
+        small, small_queries = self.create([{'employeeId': 'E000', 'role': 'chairperson'}])
+        self.assertEqual(small.status_code, status.HTTP_201_CREATED, small.data)
+        large, large_queries = self.create([user.employee_id for user in self.users])
+        self.assertEqual(large.status_code, status.HTTP_201_CREATED, large.data)
+        self.assertEqual(len(small_queries), len(large_queries))
+        self.assertEqual(len(self.writes(large_queries)), 1)
+        self.assertEqual(CommitteeMembership.objects.count(), 16)
+
+    def test_should_notify_fans_out_off_the_request_path(self):
+        with CaptureQueriesContext(connection) as ctx:
+            response = self.client.post('/api/committee/committees/create/', {
+                'name': 'Evaluation Committee', 'purpose': 'Evaluation', 'committee_type': 'evaluation',
+                'should_notify': 'true', 'members': json.dumps([user.employee_id for user in self.users]),
+            })
+        self.assertEqual(response.status_code, status.HTTP_201_CREATED, response.data)
+        # The request only queues a broadcast
+        self.assertEqual(len(self.writes(ctx.captured_queries, 'core_notificationbroadcast')), 1)
+        self.assertFalse(Notification.objects.exists())
+        self.assertFalse(OutboundEmail.objects.exists())
+
+        self.assertEqual(process_broadcasts(), (1, 15))
+        self.assertEqual(
+            sorted(r for m in OutboundEmail.objects.all() for r in m.recipients),
+            sorted(user.email for user in self.users),
+        )
+        self.assertEqual(Notification.objects.filter(recipient__in=self.users).count(), 15)
+        self.assertEqual(unread_count(self.users[0]), 1)
+
+    def test_membership_changes_notify_members_when_asked(self):
+        self.create(['E000', 'E001', 'E002'])
+        committee = Committee.objects.get()
+        self.update(committee, ['E000', 'E001'])
+        self.assertFalse(NotificationBroadcast.objects.exists())
+
+        self.update(committee, ['E000', 'E003'], should_notify='true')
+        broadcast = NotificationBroadcast.objects.get()
+        # Current members plus the one removed
+        self.assertEqual(broadcast.recipients, ['E000', 'E001', 'E003'])
+        self.assertIn('1 added, 1 removed, 0 role changes', broadcast.body)
+
+    def test_unknown_members_are_reported(self):
+        response, queries = self.create(['E000', 'E999', 'E998'])
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertIn('E999', str(response.data))
+        self.assertFalse(Committee.objects.exists())
+        self.assertEqual(len([q for q in queries if 'users_customuser' in q['sql'] and 'IN' in q['sql']]), 1)
+
+    def test_update_applies_a_diff(self):
+        response, _ = self.create(['E000', 'E001', {'employeeId': 'E002', 'role': 'secretary'}])
+        committee = Committee.objects.get()
+        kept = CommitteeMembership.objects.get(committee=committee, user__employee_id='E000')
+        queries = self.update(committee, [
+            'E000', {'employeeId': 'E002', 'role': 'chairperson'}, 'E003', 'E004',
+        ])
+        self.assertEqual(self.roles(committee), {
+            'E000': 'member', 'E002': 'chairperson', 'E003': 'member', 'E004': 'member',
+        })
+        # Delete E001, insert E003 and E004, change E002's role
+        self.assertEqual(len(self.writes(queries)), 3)
+        self.assertTrue(CommitteeMembership.objects.filter(pk=kept.pk).exists())
+
+    def test_unchanged_members_are_not_written(self):
+        self.create(['E000', 'E001'])
+        committee = Committee.objects.get()
+        queries = self.update(committee, ['E000', 'E001'])
+        self.assertEqual(self.writes(queries), [])
+
+class BulkMembershipTest(APITestCase):
+    """
+    Test that batches of membership operations are checked once, applied
+    atomically and answered with a compact diff.
+    """
+    def setUp(self):
+        self.md_role = RoleHierarchy.objects.create(role_name='MD')
+        self.director_role = RoleHierarchy.objects.create(role_name='DIRECTOR', parent=self.md_role)
+        self.director = CustomUser.objects.create_user(
+            employee_id='2001', email='2001@ntc.net.np', password='Nepal@123', role=self.director_role
+        )
+        self.users = [
+            CustomUser.objects.create_user(
+                employee_id=f'E{i:03}', email=f'e{i}@ntc.net.np', password='Nepal@123', role=self.director_role
+            )
+            for i in range(20)
+        ]
+        self.committee = Committee.objects.create(
+            name='Evaluation Committee', purpose='Evaluation', committee_type='evaluation', created_by=self.director
+        )
+        CommitteeMembership.objects.bulk_create([
+            CommitteeMembership(committee=self.committee, user=self.users[0], committee_role='chairperson'),
+            CommitteeMembership(committee=self.committee, user=self.users[1]),
+            CommitteeMembership(committee=self.committee, user=self.users[2]),
+        ])
+        self.url = f'/api/committee/committees/bulkmembers/{self.committee.pk}/'
+        self.client.force_authenticate(user=self.director)
+
+    def post(self, operations):
+        return self.client.post(self.url, {'operations': operations}, format='json')
+
+    def roles(self):
+        return dict(CommitteeMembership.objects.filter(committee=self.committee).values_list('user__employee_id', 'committee_role'))
+
+    def test_mixed_batch_returns_diff(self):
+        response = self.post([
+            {'op': 'add', 'employeeId': 'E003', 'role': 'secretary'},
+            {'op': 'add', 'employeeId': 'E004'},
+            {'op': 'remove', 'employeeId': 'E001'},
+            {'op': 'role', 'employeeId': 'E002', 'role': 'chairperson'},
+            {'op': 'role', 'employeeId': 'E000', 'role': 'chairperson'},
+        ])
+        self.assertEqual(response.status_code, status.HTTP_200_OK, response.data)
+        self.assertEqual(response.data['data'], {
+            'added': [{'employeeId': 'E003', 'role': 'secretary'}, {'employeeId': 'E004', 'role': 'member'}],
+            'removed': [{'employeeId': 'E001', 'role': 'member'}],
+            'changed': [{'employeeId': 'E002', 'role': 'chairperson', 'previousRole': 'member'}],
+        })
+        self.assertEqual(self.roles(), {
+            'E000': 'chairperson', 'E002': 'chairperson', 'E003': 'secretary', 'E004': 'member',
+        })
+
+    def test_query_count_is_independent_of_batch_size(self):
+        def count(users):
+            with CaptureQueriesContext(connection) as ctx:
+                response = self.post([{'op': 'add', 'employeeId': user.employee_id} for user in users])
+            self.assertEqual(response.status_code, status.HTTP_200_OK, response.data)
+            return len(ctx.captured_queries)
+        # The first request also loads the role tree
+        count(self.users[3:4])
+        self.assertEqual(count(self.users[4:5]), count(self.users[5:20]))
+
+    def test_batch_notifies_members_when_asked(self):
+        Committee.objects.update(should_notify=True)
+        self.post([{'op': 'add', 'employeeId': 'E003'}, {'op': 'remove', 'employeeId': 'E001'}])
+        self.assertEqual(NotificationBroadcast.objects.get().recipients, ['E000', 'E001', 'E002', 'E003'])
+
+    def test_any_failure_rejects_the_whole_batch(self):
+        response = self.post([
+            {'op': 'add', 'employeeId': 'E003'},
+            {'op': 'add', 'employeeId': 'E000'},
+            {'op': 'remove', 'employeeId': 'E005'},
+            {'op': 'remove', 'employeeId': 'E999'},
+        ])
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertEqual(len(response.data['message']), 3)
+        self.assertEqual(self.roles(), {'E000': 'chairperson', 'E001': 'member', 'E002': 'member'})
+
+    def test_invalid_operations(self):
+        self.assertEqual(self.post([]).status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertEqual(self.post([{'op': 'role', 'employeeId': 'E001'}]).status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertEqual(self.post([
+            {'op': 'add', 'employeeId': 'E003'}, {'op': 'remove', 'employeeId': 'E003'},
+        ]).status_code, status.HTTP_400_BAD_REQUEST)
+
+    def test_permission_is_checked_for_the_batch(self):
+        self.client.force_authenticate(user=self.users[1])
+        response = self.post([{'op': 'add', 'employeeId': 'E003'}])
+        self.assertEqual(response.status_code, status.HTTP_403_FORBIDDEN)
+        self.assertNotIn('E003', self.roles())
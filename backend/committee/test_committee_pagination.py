@@ -0,0 +1,90 @@
+from datetime import timedelta
+from django.test import override_settings
+from django.utils import timezone
+from rest_framework import status
+from rest_framework.test import APITestCase
+from users.models import CustomUser, RoleHierarchy
+from .models import Committee, CommitteeMembership
+
+@override_settings(COMMITTEE_PAGE_SIZE=3, COMMITTEE_MAX_PAGE_SIZE=5)
+class CommitteeKeysetPaginationTest(APITestCase):
+    """
+    Test that committee listings page newest-first on (created_at, id) with opaque cursors.
+    """
+    def setUp(self):
+        role = RoleHierarchy.objects.create(role_name='SUPERADMIN')
+        self.user = CustomUser.objects.create_user(
+            employee_id='admin', email='superadmin@ntc.net.np', password='Nepal@123', role=role
+        )
+        self.client.force_authenticate(user=self.user)
+        stamp = timezone.now()
+        self.committees = []
+        for i in range(8):
+            committee = Committee.objects.create(
+                name=f'Committee {i}', purpose='Evaluation', committee_type='evaluation',
+                formation_date='2025-04-01', created_by=self.user
+            )
+            CommitteeMembership.objects.create(committee=committee, user=self.user)
+            self.committees.append(committee)
+        # Committees 2-5 share a timestamp so the id tie-breaker is exercised.
+        Committee.objects.filter(id__in=[c.id for c in self.committees[2:6]]).update(created_at=stamp)
+        for i in (0, 1, 6, 7):
+            Committee.objects.filter(id=self.committees[i].id).update(created_at=stamp + timedelta(minutes=i - 3))
+
+    def walk(self, url, params=None):
+        names, cursor = [], None
+        while True:
+            response = self.client.get(url, dict(params or {}, **({'cursor': cursor} if cursor else {'page_size': 3})))
+            self.assertEqual(response.status_code, status.HTTP_200_OK)
+            self.assertEqual(response.data['results'], len(response.data['data']['committees']))
+            names.extend(c['name'] for c in response.data['data']['committees'])
+            cursor = response.data['next']
+            if not cursor:
+                return names
+
+    def expected(self):
+        return list(Committee.objects.order_by('-created_at', '-id').values_list('name', flat=True))
+
+    def test_pages_cover_every_committee_once(self):
+        names = self.walk('/api/committee/committees/all/')
+        self.assertEqual(names, self.expected())
+
+    def test_full_list_without_paging_parameters(self):
+        response = self.client.get('/api/committee/committees/all/')
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual([c['name'] for c in response.data['data']['committees']], self.expected())
+        self.assertEqual(response.data['results'], 8)
+        self.assertIsNone(response.data['next'])
+
+    def test_pages_by_member_and_date_range(self):
+        self.assertEqual(self.walk(f'/api/committee/committees/bymember/{self.user.employee_id}/'), self.expected())
+        self.assertEqual(
+            self.walk('/api/committee/committees/bydaterange/', {'startDate': '2025-01-01', 'endDate': '2025-12-31'}),
+            self.expected()
+        )
+
+    def test_page_size_is_capped(self):
+        response = self.client.get('/api/committee/committees/all/', {'page_size': 100})
+        self.assertEqual(response.data['results'], 5)
+        response = self.client.get('/api/committee/committees/all/', {'page_size': 2})
+        self.assertEqual(response.data['results'], 2)
+
+    def test_new_rows_do_not_shift_later_pages(self):
+        first = self.client.get('/api/committee/committees/all/', {'page_size': 3})
+        Committee.objects.create(name='Latest', purpose='Evaluation', committee_type='evaluation', created_by=self.user)
+        second = self.client.get('/api/committee/committees/all/', {'cursor': first.data['next']})
+        self.assertEqual(
+            [c['name'] for c in second.data['data']['committees']], self.expected()[4:7]
+        )
+
+    def test_count_is_opt_in(self):
+        response = self.client.get('/api/committee/committees/all/', {'page_size': 3})
+        self.assertNotIn('count', response.data)
+        response = self.client.get('/api/committee/committees/all/', {'page_size': 3, 'count': 'true'})
+        self.assertEqual(response.data['count'], 8)
+
+    def test_invalid_cursor_is_rejected(self):
+        for params in ({'cursor': 'not-a-cursor'}, {'page_size': 'many'}):
+            response = self.client.get('/api/committee/committees/all/', params)
+            self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+            self.assertEqual(response.data['status'], 'error')
@@ -0,0 +1,123 @@
+from django.core.cache import cache
+from django.test import RequestFactory, override_settings
+from rest_framework import status
+from rest_framework.test import APITestCase
+from procurement.models import ProcurementPlan
+from users.models import CustomUser, RoleHierarchy
+from .models import Committee, CommitteeMembership
+from .permissions import CommitteeAccess
+
+class CommitteeAccessTest(APITestCase):
+    """
+    Test that committee permission decisions follow creator, membership and
+    role hierarchy rules and are answered from the cache once primed.
+    """
+    def setUp(self):
+        self.superadmin_role = RoleHierarchy.objects.create(role_name='SUPERADMIN')
+        self.md_role = RoleHierarchy.objects.create(role_name='MD', parent=self.superadmin_role)
+        self.director_role = RoleHierarchy.objects.create(role_name='DIRECTOR', parent=self.md_role)
+        self.superadmin = self.user('admin', self.superadmin_role)
+        self.md = self.user('1001', self.md_role)
+        self.director = self.user('2001', self.director_role)
+        self.peer = self.user('2002', self.director_role)
+        self.committees = [
+            Committee.objects.create(
+                name=f'Committee {i}', purpose='Evaluation', committee_type='evaluation', created_by=self.director
+            )
+            for i in range(4)
+        ]
+        CommitteeMembership.objects.create(committee=self.committees[0], user=self.peer)
+        cache.clear()
+        self.addCleanup(cache.clear)
+
+    def user(self, employee_id, role):
+        return CustomUser.objects.create_user(
+            employee_id=employee_id, email=f'{employee_id}@ntc.net.np', password='Nepal@123', role=role
+        )
+
+    def access(self, user):
+        return CommitteeAccess(CustomUser.objects.get(pk=user.pk))
+
+    def test_decisions(self):
+        first = self.committees[0]
+        self.assertEqual(self.access(self.director).permissions(first), {'retrieve': True, 'update': True, 'destroy': True})
+        self.assertEqual(self.access(self.md).permissions(first), {'retrieve': True, 'update': True, 'destroy': True})
+        self.assertEqual(self.access(self.superadmin).permissions(first), {'retrieve': True, 'update': True, 'destroy': True})
+        self.assertEqual(self.access(self.peer).permissions(first), {'retrieve': True, 'update': False, 'destroy': False})
+        self.assertEqual(self.access(self.peer).permissions(self.committees[1]), {'retrieve': False, 'update': False, 'destroy': False})
+
+    def test_prime_decides_a_page_in_bulk(self):
+        access = self.access(self.peer)
+        access.is_superadmin, access.tree
+        committees = list(Committee.objects.all())
+        # Memberships and creator roles
+        with self.assertNumQueries(2):
+            access.prime(committees)
+        with self.assertNumQueries(0):
+            allowed = [access.has_permission(committee, 'retrieve') for committee in committees]
+        self.assertEqual(allowed, [True, False, False, False])
+
+    def test_prime_uses_loaded_memberships_and_creators(self):
+        access = self.access(self.peer)
+        access.is_superadmin, access.tree
+        committees = list(Committee.objects.with_members())
+        with self.assertNumQueries(0):
+            access.prime(committees)
+
+    @override_settings(COMMITTEE_PERMISSION_CACHE_TTL=60)
+    def test_decisions_are_shared_across_requests(self):
+        self.access(self.peer).prime(self.committees)
+        access = self.access(self.peer)
+        access.is_superadmin
+        # Only the role tree version is read to build the cache keys
+        with self.assertNumQueries(1):
+            access.prime(self.committees)
+        self.assertTrue(access.has_permission(self.committees[0], 'retrieve'))
+        self.assertFalse(access.has_permission(self.committees[0], 'update'))
+
+    @override_settings(COMMITTEE_PERMISSION_CACHE_TTL=60)
+    def test_role_change_is_not_served_from_cache(self):
+        self.access(self.peer).prime(self.committees)
+        self.peer.role = self.md_role
+        self.peer.save()
+        self.assertTrue(self.access(self.peer).has_permission(self.committees[1], 'update'))
+
+    def test_access_is_shared_within_a_request(self):
+        request = RequestFactory().get('/')
+        request.user = self.peer
+        self.assertIs(CommitteeAccess.for_request(request), CommitteeAccess.for_request(request))
+
+    def test_list_includes_permissions(self):
+        self.client.force_authenticate(user=self.peer)
+        CommitteeMembership.objects.create(committee=self.committees[1], user=self.peer)
+        response = self.client.get('/api/committee/committees/all/')
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        permissions = {c['name']: c['permissions'] for c in response.data['data']['committees']}
+        self.assertEqual(permissions, {
+            'Committee 0': {'retrieve': True, 'update': False, 'destroy': False},
+            'Committee 1': {'retrieve': True, 'update': False, 'destroy': False},
+        })
+
+    def test_detail_includes_permissions(self):
+        self.client.force_authenticate(user=self.peer)
+        response = self.client.get(f'/api/committee/committees/{self.committees[0].pk}/')
+        self.assertEqual(
+            response.data['data']['committee']['permissions'], {'retrieve': True, 'update': False, 'destroy': False}
+        )
+
+    def test_nested_committees_omit_permissions(self):
+        plan = ProcurementPlan.objects.create(
+            policy_number='PP-1', department='Wireline', project_name='Plan', project_description='Fibre',
+            estimated_cost=1000, budget=900, owner=self.peer, committee=self.committees[0],
+        )
+        self.client.force_authenticate(user=self.peer)
+        response = self.client.get(f'/api/procurement/plans/{plan.pk}/')
+        self.assertEqual(response.status_code, status.HTTP_200_OK, response.data)
+        self.assertNotIn('permissions', response.data['committee'])
+
+    def test_object_checks_use_decisions(self):
+        self.client.force_authenticate(user=self.peer)
+        self.assertEqual(self.client.get(f'/api/committee/committees/{self.committees[0].pk}/').status_code, status.HTTP_200_OK)
+        self.assertEqual(self.client.patch(f'/api/committee/committees/update/{self.committees[0].pk}/').status_code, status.HTTP_403_FORBIDDEN)
+        self.assertEqual(self.client.delete(f'/api/committee/committees/deletecommittee/{self.committees[0].pk}/').status_code, status.HTTP_403_FORBIDDEN)
+        self.assertTrue(Committee.objects.filter(pk=self.committees[0].pk).exists())
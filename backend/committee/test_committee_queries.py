@@ -0,0 +1,101 @@
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+from rest_framework import status
+from rest_framework.test import APITestCase
+from users.models import CustomUser, RoleHierarchy
+from .models import Committee, CommitteeMembership
+
+class CommitteeQueryCountTest(APITestCase):
+    """
+    Test that committee listings cost the same number of queries however many
+    committees and members they return.
+    """
+    def setUp(self):
+        self.superadmin_role = RoleHierarchy.objects.create(role_name='SUPERADMIN')
+        self.md_role = RoleHierarchy.objects.create(role_name='MD', parent=self.superadmin_role)
+        self.superadmin = CustomUser.objects.create_user(
+            employee_id='admin', email='superadmin@ntc.net.np', password='Nepal@123', role=self.superadmin_role
+        )
+        self.member = CustomUser.objects.create_user(
+            employee_id='7778', email='member@ntc.net.np', password='Nepal@123', role=self.md_role
+        )
+        self.users = [self.member] + [
+            CustomUser.objects.create_user(
+                employee_id=f'E{i:03}', email=f'e{i}@ntc.net.np', password='Nepal@123', role=self.md_role
+            )
+            for i in range(6)
+        ]
+        self.client.force_authenticate(user=self.superadmin)
+
+    def add_committees(self, count, member_count):
+        for i in range(count):
+            committee = Committee.objects.create(
+                name=f'Committee {Committee.objects.count()}', purpose='Evaluation', committee_type='evaluation',
+                formation_date='2025-04-01', created_by=self.member
+            )
+            CommitteeMembership.objects.bulk_create([
+                CommitteeMembership(committee=committee, user=user, committee_role='chairperson' if j == 0 else 'member')
+                for j, user in enumerate(self.users[:member_count])
+            ])
+
+    def count_queries(self, url):
+        with CaptureQueriesContext(connection) as ctx:
+            response = self.client.get(url)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        return len(ctx.captured_queries), response
+
+    def assert_constant(self, url):
+        self.add_committees(2, 2)
+        small, _ = self.count_queries(url)
+        self.add_committees(5, 7)
+        large, response = self.count_queries(url)
+        self.assertEqual(small, large)
+        return response
+
+    def test_all_committees(self):
+        response = self.assert_constant('/api/committee/committees/all/')
+        self.assertEqual(response.data['results'], 7)
+
+    def test_committees_by_member(self):
+        response = self.assert_constant(f'/api/committee/committees/bymember/{self.member.employee_id}/')
+        self.assertEqual(response.data['results'], 7)
+
+    def test_committees_by_date_range(self):
+        self.assert_constant('/api/committee/committees/bydaterange/?startDate=2025-01-01&endDate=2025-12-31')
+
+    def test_committee_detail(self):
+        self.add_committees(1, 2)
+        committee = Committee.objects.get()
+        small, _ = self.count_queries(f'/api/committee/committees/{committee.id}/')
+        CommitteeMembership.objects.bulk_create([
+            CommitteeMembership(committee=committee, user=user) for user in self.users[2:]
+        ])
+        large, _ = self.count_queries(f'/api/committee/committees/{committee.id}/')
+        self.assertEqual(small, large)
+
+    def test_member_roles_come_from_memberships(self):
+        self.add_committees(1, 3)
+        response = self.client.get('/api/committee/committees/all/')
+        members = response.data['data']['committees'][0]['membersList']
+        self.assertEqual([m['role'] for m in members], ['chairperson', 'member', 'member'])
+        self.assertEqual(response.data['data']['committees'][0]['createdBy']['role'], 'MD')
+
+    def test_hierarchy_visibility(self):
+        self.add_committees(2, 1)
+        outsider = CustomUser.objects.create_user(
+            employee_id='9999', email='outsider@ntc.net.np', password='Nepal@123',
+            role=RoleHierarchy.objects.create(role_name='CFO')
+        )
+        self.client.force_authenticate(user=outsider)
+        self.assertEqual(self.client.get('/api/committee/committees/all/').data['results'], 0)
+        self.client.force_authenticate(user=self.users[1])
+        self.assertEqual(self.client.get('/api/committee/committees/all/').data['results'], 0)
+        self.client.force_authenticate(user=self.member)
+        self.assertEqual(self.client.get('/api/committee/committees/all/').data['results'], 2)
+
+    def test_sparse_fields_skip_member_prefetch(self):
+        self.add_committees(3, 3)
+        full, _ = self.count_queries('/api/committee/committees/all/')
+        sparse, response = self.count_queries('/api/committee/committees/all/?fields=_id,name')
+        self.assertEqual(set(response.data['data']['committees'][0]), {'_id', 'name'})
+        self.assertLess(sparse, full)
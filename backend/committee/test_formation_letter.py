@@ -0,0 +1,52 @@
+import shutil
+import tempfile
+from django.core.files.uploadedfile import SimpleUploadedFile
+from django.test import override_settings
+from rest_framework import status
+from rest_framework.test import APITestCase
+from users.models import CustomUser, RoleHierarchy
+from .models import Committee
+
+MEDIA_ROOT = tempfile.mkdtemp()
+
+@override_settings(MEDIA_ROOT=MEDIA_ROOT)
+class FormationLetterDownloadTest(APITestCase):
+    """
+    Test that formation letters stream with range and conditional support after the permission check.
+    """
+    @classmethod
+    def tearDownClass(cls):
+        shutil.rmtree(MEDIA_ROOT, ignore_errors=True)
+        super().tearDownClass()
+
+    def setUp(self):
+        self.user = CustomUser.objects.create_user(
+            employee_id='admin', email='superadmin@ntc.net.np', password='Nepal@123',
+            role=RoleHierarchy.objects.create(role_name='SUPERADMIN')
+        )
+        self.client.force_authenticate(user=self.user)
+        self.body = b'%PDF-1.4 ' + b'x' * 100000
+        self.committee = Committee.objects.create(
+            name='Spec Committee', purpose='Specification', committee_type='specification', created_by=self.user,
+            formation_letter=SimpleUploadedFile('letter.pdf', self.body, content_type='application/pdf')
+        )
+        self.url = f'/api/committee/committees/{self.committee.id}/download/'
+
+    def test_letter_is_streamed_as_attachment(self):
+        response = self.client.get(self.url)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertTrue(response.streaming)
+        self.assertEqual(b''.join(response.streaming_content), self.body)
+        self.assertTrue(response['Content-Disposition'].startswith('attachment'))
+
+    def test_range_and_revalidation(self):
+        response = self.client.get(self.url, headers={'range': 'bytes=0-7'})
+        self.assertEqual(response.status_code, status.HTTP_206_PARTIAL_CONTENT)
+        self.assertEqual(b''.join(response.streaming_content), b'%PDF-1.4')
+        response = self.client.get(self.url, headers={'if-none-match': response['ETag']})
+        self.assertEqual(response.status_code, status.HTTP_304_NOT_MODIFIED)
+
+    def test_missing_letter(self):
+        self.committee.formation_letter.storage.delete(self.committee.formation_letter.name)
+        response = self.client.get(self.url)
+        self.assertEqual(response.status_code, status.HTTP_404_NOT_FOUND)
@@ -4,20 +4,50 @@ from rest_framework.response import Response
 from rest_framework import status
 from .permissions import CommitteePermission
 from .models import Committee, CommitteeMembership
-from .serializers import CommitteeSerializer
+from .serializers import BulkMembershipSerializer, CommitteeSerializer
+from .memberships import MembershipError, apply_membership_operations
+from .notifications import notify_committee_formed, notify_membership_changed
+from .pagination import CommitteePaginator
+from core.pagination import PaginationError
+from core.files import serve_file
 from users.models import CustomUser
 from procurement.models import ProcurementPlan
 from django.core.exceptions import ObjectDoesNotExist
+from django.db import transaction
 from django.utils.dateparse import parse_date
-from django.http import HttpResponse
-from django.conf import settings
-import os
 import json
 import logging
-from django.db import models
 
 logger = logging.getLogger(__name__)
 
+def paginated_committees_response(request, committees):
+    """
+    Serialize ``committees`` in the standard envelope. Keyset paging is opt-in:
+    with ``?page_size=`` or ``?cursor=`` one page is returned along with the
+    ``next`` cursor, without either the whole list is returned as before.
+    """
+    committees = CommitteeSerializer.optimize_queryset(committees, request)
+    if not {'cursor', 'page_size'} & set(request.query_params):
+        serializer = CommitteeSerializer(
+            committees.order_by(*CommitteePaginator.ordering), many=True,
+            context={'request': request, 'with_permissions': True}
+        )
+        return Response(
+            {"status": "success", "results": len(serializer.data), "next": None, "data": {"committees": serializer.data}},
+            status=status.HTTP_200_OK
+        )
+    try:
+        paginator = CommitteePaginator(request)
+        page = paginator.paginate_queryset(committees)
+    except PaginationError as e:
+        logger.error(f"Invalid pagination parameters: {str(e)}")
+        return Response(
+            {"status": "error", "message": str(e)},
+            status=status.HTTP_400_BAD_REQUEST
+        )
+    serializer = CommitteeSerializer(page, many=True, context={'request': request, 'with_permissions': True})
+    return Response(paginator.get_envelope(serializer.data, "committees"), status=status.HTTP_200_OK)
+
 class CreateCommitteeView(APIView):
     permission_classes = [CommitteePermission]
 
@@ -48,6 +78,9 @@ class CreateCommitteeView(APIView):
                     procurement_plan.committee = committee
                     procurement_plan.save()
                     logger.debug(f"Updated ProcurementPlan {procurement_plan.id} with committee {committee.id}")
+                if committee.should_notify:
+                    members = serializer.validated_data.get('members', [])
+                    notify_committee_formed(committee, [member['user_id'] for member in members])
                 logger.debug(f"Committee created: {committee.id}")
                 return Response(
                     {"status": "success", "data": {"committee": CommitteeSerializer(committee).data}},
@@ -112,6 +145,8 @@ class UpdateCommitteeView(APIView):
                     procurement_plan.committee = committee
                     procurement_plan.save()
                     logger.debug(f"Updated ProcurementPlan {procurement_plan.id} with committee {committee.id}")
+                if serializer.membership_changes:
+                    notify_membership_changed(committee, *serializer.membership_changes)
                 logger.debug(f"Committee updated: {committee.id}")
                 return Response(
                     {"status": "success", "data": {"committee": CommitteeSerializer(committee).data}},
@@ -134,25 +169,10 @@ class GetAllCommitteesView(APIView):
 
     def get(self, request):
         try:
-            if request.user.role and request.user.role.role_name == 'SUPERADMIN':
-                committees = Committee.objects.all()
-            else:
-                committees = Committee.objects.filter(
-                    models.Q(created_by=request.user) |
-                    models.Q(memberships__user=request.user) |
-                    models.Q(created_by__role__in=request.user.role.get_all_descendants())
-                ).distinct()
-
-            serializer = CommitteeSerializer(committees, many=True, context={'request': request})
-            logger.debug(f"Fetched committees: {len(serializer.data)}")
-            return Response(
-                {
-                    "status": "success",
-                    "results": len(serializer.data),
-                    "data": {"committees": serializer.data}
-                },
-                status=status.HTTP_200_OK
-            )
+            committees = Committee.objects.visible_to(request.user)
+            response = paginated_committees_response(request, committees)
+            logger.debug(f"Fetched committees: {response.data.get('results')}")
+            return response
         except Exception as e:
             logger.error(f"Failed to fetch committees: {str(e)}")
             return Response(
@@ -168,9 +188,9 @@ class GetCommitteeByIdView(APIView):
 
     def get(self, request, committee_id):
         try:
-            committee = Committee.objects.get(id=committee_id)
+            committee = CommitteeSerializer.optimize_queryset(Committee.objects.all(), request).get(id=committee_id)
             self.check_object_permissions(request, committee)
-            serializer = CommitteeSerializer(committee, context={'request': request})
+            serializer = CommitteeSerializer(committee, context={'request': request, 'with_permissions': True})
             logger.debug(f"Fetched committee with ID: {committee.id}")
             return Response(
                 {"status": "success", "data": {"committee": serializer.data}},
@@ -244,6 +264,7 @@ class AddMemberView(APIView):
                 )
 
             CommitteeMembership.objects.create(committee=committee, user=user, committee_role=committee_role)
+            notify_membership_changed(committee, added=[user.pk])
             serializer = CommitteeSerializer(committee, context={'request': request})
             logger.debug(f"Member {employee_id} added to committee {committee_id}")
             return Response(
@@ -281,6 +302,7 @@ class RemoveMemberView(APIView):
                     status=status.HTTP_400_BAD_REQUEST
                 )
             membership.delete()
+            notify_membership_changed(committee, removed=[user.pk])
             serializer = CommitteeSerializer(committee, context={'request': request})
             logger.debug(f"Member {employee_id} removed from committee {committee_id}")
             return Response(
@@ -294,24 +316,62 @@ class RemoveMemberView(APIView):
                 status=status.HTTP_404_NOT_FOUND
             )
 
+class BulkMembershipView(APIView):
+    """
+    Add, remove and re-role several members in one atomic call:
+    ``{"operations": [{"op": "add" | "remove" | "role", "employeeId": ..., "role": ...}]}``.
+    Responds with the membership diff rather than the whole committee.
+    """
+    permission_classes = [CommitteePermission]
+
+    def post(self, request, committee_id):
+        serializer = BulkMembershipSerializer(data=request.data)
+        if not serializer.is_valid():
+            logger.error(f"Serializer errors: {serializer.errors}")
+            return Response(
+                {"status": "error", "message": serializer.errors},
+                status=status.HTTP_400_BAD_REQUEST
+            )
+        with transaction.atomic():
+            # Lock the committee so concurrent batches see each other's changes
+            committee = Committee.objects.select_for_update().filter(id=committee_id).first()
+            if committee is None:
+                logger.error(f"Committee {committee_id} not found")
+                return Response(
+                    {"status": "error", "message": "Committee not found"},
+                    status=status.HTTP_404_NOT_FOUND
+                )
+            self.check_object_permissions(request, committee)
+            try:
+                diff = apply_membership_operations(committee, serializer.validated_data['operations'])
+            except MembershipError as e:
+                logger.error(f"Membership changes rejected for committee {committee_id}: {e}")
+                return Response(
+                    {"status": "error", "message": e.errors},
+                    status=status.HTTP_400_BAD_REQUEST
+                )
+            notify_membership_changed(
+                committee,
+                added=[item['employeeId'] for item in diff['added']],
+                removed=[item['employeeId'] for item in diff['removed']],
+                changed=[item['employeeId'] for item in diff['changed']],
+            )
+        logger.debug(
+            f"Committee {committee_id} members: {len(diff['added'])} added, "
+            f"{len(diff['removed'])} removed, {len(diff['changed'])} role changes"
+        )
+        return Response({"status": "success", "data": diff}, status=status.HTTP_200_OK)
+
 class GetCommitteesByMemberView(APIView):
     permission_classes = [CommitteePermission]
 
     def get(self, request, employee_id):
         try:
             user = CustomUser.objects.get(employee_id=employee_id)
-            memberships = CommitteeMembership.objects.filter(user=user)
-            committees = [membership.committee for membership in memberships]
-            serializer = CommitteeSerializer(committees, many=True, context={'request': request})
-            logger.debug(f"Fetched {len(committees)} committees for user {employee_id}")
-            return Response(
-                {
-                    "status": "success",
-                    "results": len(serializer.data),
-                    "data": {"committees": serializer.data}
-                },
-                status=status.HTTP_200_OK
-            )
+            committees = Committee.objects.filter(memberships__user=user)
+            response = paginated_committees_response(request, committees)
+            logger.debug(f"Fetched {response.data.get('results')} committees for user {employee_id}")
+            return response
         except CustomUser.DoesNotExist:
             logger.error(f"User {employee_id} not found")
             return Response(
@@ -343,24 +403,13 @@ class GetCommitteesByDateRangeView(APIView):
                 status=status.HTTP_400_BAD_REQUEST
             )
 
-        committees = Committee.objects.filter(formation_date__range=[start_date, end_date])
-        if not (request.user.role and request.user.role.role_name == 'SUPERADMIN'):
-            committees = committees.filter(
-                models.Q(created_by=request.user) |
-                models.Q(memberships__user=request.user) |
-                models.Q(created_by__role__in=request.user.role.get_all_descendants())
-            ).distinct()
+        committees = Committee.objects.filter(
+            formation_date__range=[start_date, end_date]
+        ).visible_to(request.user)
 
-        serializer = CommitteeSerializer(committees, many=True, context={'request': request})
-        logger.debug(f"Fetched {len(committees)} committees in date range")
-        return Response(
-            {
-                "status": "success",
-                "results": len(serializer.data),
-                "data": {"committees": serializer.data}
-            },
-            status=status.HTTP_200_OK
-        )
+        response = paginated_committees_response(request, committees)
+        logger.debug(f"Fetched {response.data.get('results')} committees in date range")
+        return response
 
 class DownloadFormationLetterView(APIView):
     permission_classes = [CommitteePermission]
@@ -376,12 +425,10 @@ class DownloadFormationLetterView(APIView):
                     {"status": "error", "message": "No formation letter available"},
                     status=status.HTTP_404_NOT_FOUND
                 )
-            file_path = os.path.join(settings.MEDIA_ROOT, committee.formation_letter.name)
-            with open(file_path, 'rb') as f:
-                response = HttpResponse(f.read(), content_type=committee.formation_letter.file.content_type)
-                response['Content-Disposition'] = f'attachment; filename="{committee.formation_letter.name.split("/")[-1]}"'
-                logger.debug(f"Formation letter downloaded for committee {committee_id}")
-                return response
+            letter = committee.formation_letter
+            response = serve_file(request, letter.storage, letter.name, as_attachment=True)
+            logger.debug(f"Formation letter downloaded for committee {committee_id}")
+            return response
         except ObjectDoesNotExist:
             logger.error(f"Committee {committee_id} not found")
             return Response(
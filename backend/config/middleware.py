@@ -1,5 +1,8 @@
 # config/middleware.py
+import time
 from django.conf import settings
+from django.core.exceptions import MiddlewareNotUsed
+from core import metrics
 
 class CustomXFrameOptionsMiddleware:
     def __init__(self, get_response):
@@ -9,7 +12,31 @@ class CustomXFrameOptionsMiddleware:
         response = self.get_response(request)
         if request.path.startswith(settings.MEDIA_URL):
             response['X-Frame-Options'] = 'SAMEORIGIN'
-            print(f"Set X-Frame-Options: SAMEORIGIN for {request.path}")  # Debug
         else:
             response['X-Frame-Options'] = settings.X_FRAME_OPTIONS
-        return response
\ No newline at end of file
+        return response
+
+class RequestMetricsMiddleware:
+    """
+    Record SQL query count, DB time, render time and wall time per
+    resolved URL name, served at /api/metrics and, optionally, as a
+    Server-Timing header. Removed from the chain entirely unless
+    REQUEST_METRICS_ENABLED is set.
+    """
+    def __init__(self, get_response):
+        if not settings.REQUEST_METRICS_ENABLED:
+            raise MiddlewareNotUsed
+        self.get_response = get_response
+
+    def __call__(self, request):
+        start = time.perf_counter()
+        with metrics.RequestMetrics().track() as stats:
+            response = self.get_response(request)
+        wall = time.perf_counter() - start
+
+        match = getattr(request, 'resolver_match', None)
+        view = match.view_name if match else metrics.UNRESOLVED
+        metrics.registry.record(view, request.method, response.status_code, stats, wall)
+        if settings.REQUEST_METRICS_SERVER_TIMING:
+            response['Server-Timing'] = stats.server_timing(wall)
+        return response
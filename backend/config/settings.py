@@ -43,6 +43,7 @@ AUTH_USER_MODEL = 'users.CustomUser'
 X_FRAME_OPTIONS = 'DENY'
 
 MIDDLEWARE = [
+    'config.middleware.RequestMetricsMiddleware',
     'corsheaders.middleware.CorsMiddleware',
     'django.middleware.security.SecurityMiddleware',
     'django.contrib.sessions.middleware.SessionMiddleware',
@@ -71,7 +72,7 @@ CORS_ALLOW_HEADERS = [
 
 REST_FRAMEWORK = {
     'DEFAULT_AUTHENTICATION_CLASSES': [
-        'rest_framework_simplejwt.authentication.JWTAuthentication',
+        'users.authentication.CachedJWTAuthentication',
     ],
     'DEFAULT_PERMISSION_CLASSES': [
         'rest_framework.permissions.IsAuthenticated',
@@ -79,6 +80,10 @@ REST_FRAMEWORK = {
     'DEFAULT_FILTER_BACKENDS': [
         'django_filters.rest_framework.DjangoFilterBackend',
     ],
+    'DEFAULT_RENDERER_CLASSES': [
+        'core.metrics.TimedJSONRenderer',
+        'rest_framework.renderers.BrowsableAPIRenderer',
+    ],
 }
 
 SIMPLE_JWT = {
@@ -159,3 +164,83 @@ DEFAULT_AUTO_FIELD = 'django.db.models.BigAutoField'
 
 MEDIA_URL = '/media/'
 MEDIA_ROOT = BASE_DIR / 'media'
+
+# Committee listings are keyset-paginated when the client passes ?page_size=
+# (up to the cap) or ?cursor=; without either the full list is returned.
+COMMITTEE_PAGE_SIZE = config('COMMITTEE_PAGE_SIZE', default=50, cast=int)
+COMMITTEE_MAX_PAGE_SIZE = config('COMMITTEE_MAX_PAGE_SIZE', default=200, cast=int)
+
+# Committee permission decisions are cached per request; set a TTL (seconds)
+# to also share them across requests. Membership changes may then take up to
+# that long to apply.
+COMMITTEE_PERMISSION_CACHE_TTL = config('COMMITTEE_PERMISSION_CACHE_TTL', default=0, cast=int)
+
+# File downloads stream in chunks of this size. Set FILE_ACCEL_REDIRECT_PREFIX
+# to an nginx ``internal`` location aliased to MEDIA_ROOT to let nginx send
+# the bytes after Django has checked access.
+FILE_STREAM_CHUNK_SIZE = config('FILE_STREAM_CHUNK_SIZE', default=64 * 1024, cast=int)
+FILE_ACCEL_REDIRECT_PREFIX = config('FILE_ACCEL_REDIRECT_PREFIX', default='')
+
+# Uploaded project documents are written to storage by this many threads.
+DOCUMENT_UPLOAD_WORKERS = config('DOCUMENT_UPLOAD_WORKERS', default=8, cast=int)
+
+# Per-endpoint query count and latency metrics, served at /api/metrics.
+# Scrapers must send REQUEST_METRICS_TOKEN as a Bearer token; without a token
+# only logged-in staff (admin session) can read them.
+REQUEST_METRICS_ENABLED = config('REQUEST_METRICS_ENABLED', default=False, cast=bool)
+REQUEST_METRICS_SERVER_TIMING = config('REQUEST_METRICS_SERVER_TIMING', default=True, cast=bool)
+REQUEST_METRICS_TOKEN = config('REQUEST_METRICS_TOKEN', default='')
+
+# Reference endpoints (roles, employee directory, plan dropdown) cache their
+# responses and answer conditional GETs with 304. Version stamps live in the
+# same cache, so with several worker processes use a shared backend such as
+# django.core.cache.backends.filebased.FileBasedCache or Redis.
+CACHES = {
+    'default': {
+        'BACKEND': config('CACHE_BACKEND', default='django.core.cache.backends.locmem.LocMemCache'),
+        'LOCATION': config('CACHE_LOCATION', default=''),
+    }
+}
+RESPONSE_CACHE_TIMEOUT = config('RESPONSE_CACHE_TIMEOUT', default=300, cast=int)
+
+# Employee directory page sizes; typeahead mode returns this many matches
+# unless the client asks for ?limit= (capped like page_size).
+EMPLOYEE_DIRECTORY_PAGE_SIZE = config('EMPLOYEE_DIRECTORY_PAGE_SIZE', default=50, cast=int)
+EMPLOYEE_DIRECTORY_MAX_PAGE_SIZE = config('EMPLOYEE_DIRECTORY_MAX_PAGE_SIZE', default=200, cast=int)
+EMPLOYEE_TYPEAHEAD_LIMIT = config('EMPLOYEE_TYPEAHEAD_LIMIT', default=10, cast=int)
+
+# Authenticated principals (user, role, subtree role ids) are cached per
+# access token for this many seconds; 0 loads them on every request. Caching
+# only takes effect when CACHE_BACKEND is shared between processes (Redis,
+# Memcached); with the default per-process LocMemCache it stays off. The
+# inactive and revoked-token checks use the cached copy, so changes made with
+# QuerySet.update() can take this long to apply.
+PRINCIPAL_CACHE_TTL = config('PRINCIPAL_CACHE_TTL', default=60, cast=int)
+
+# Outbound mail is queued in core.OutboundEmail and delivered by the
+# send_outbox management command, so requests never wait on the mail server.
+# Failed messages are retried with exponential backoff starting at
+# OUTBOX_RETRY_BASE_DELAY seconds and marked failed after OUTBOX_MAX_ATTEMPTS.
+EMAIL_BACKEND = config('EMAIL_BACKEND', default='django.core.mail.backends.smtp.EmailBackend')
+EMAIL_HOST = config('EMAIL_HOST', default='localhost')
+EMAIL_PORT = config('EMAIL_PORT', default=25, cast=int)
+EMAIL_HOST_USER = config('EMAIL_HOST_USER', default='')
+EMAIL_HOST_PASSWORD = config('EMAIL_HOST_PASSWORD', default='')
+EMAIL_USE_TLS = config('EMAIL_USE_TLS', default=False, cast=bool)
+EMAIL_TIMEOUT = config('EMAIL_TIMEOUT', default=30, cast=int)
+DEFAULT_FROM_EMAIL = config('DEFAULT_FROM_EMAIL', default='webmaster@localhost')
+OUTBOX_BATCH_SIZE = config('OUTBOX_BATCH_SIZE', default=50, cast=int)
+OUTBOX_POLL_INTERVAL = config('OUTBOX_POLL_INTERVAL', default=5, cast=float)
+OUTBOX_MAX_ATTEMPTS = config('OUTBOX_MAX_ATTEMPTS', default=5, cast=int)
+OUTBOX_RETRY_BASE_DELAY = config('OUTBOX_RETRY_BASE_DELAY', default=60, cast=int)
+OUTBOX_RETRY_MAX_DELAY = config('OUTBOX_RETRY_MAX_DELAY', default=3600, cast=int)
+# A worker's claim on a batch lapses after this many seconds if it dies mid-batch.
+OUTBOX_CLAIM_TIMEOUT = config('OUTBOX_CLAIM_TIMEOUT', default=300, cast=int)
+
+# In-app notifications are queued as broadcasts and fanned out to their
+# recipients by the fanout_notifications management command (polling every
+# OUTBOX_POLL_INTERVAL seconds when idle). Inbox page sizes as for committees.
+NOTIFICATION_FANOUT_BATCH_SIZE = config('NOTIFICATION_FANOUT_BATCH_SIZE', default=20, cast=int)
+NOTIFICATION_INSERT_BATCH_SIZE = config('NOTIFICATION_INSERT_BATCH_SIZE', default=1000, cast=int)
+NOTIFICATION_PAGE_SIZE = config('NOTIFICATION_PAGE_SIZE', default=20, cast=int)
+NOTIFICATION_MAX_PAGE_SIZE = config('NOTIFICATION_MAX_PAGE_SIZE', default=100, cast=int)
@@ -1,10 +1,12 @@
 # backend/config/urls.py
 from django.contrib import admin
-from django.urls import path, include
+from django.urls import path, re_path, include
 from django.conf import settings
-from django.conf.urls.static import static
 from rest_framework_simplejwt.views import TokenRefreshView
 from users.views import CustomTokenObtainPairView
+from core.views import (
+    NotificationInboxView, NotificationMarkReadView, NotificationUnreadCountView, SearchView, metrics, serve_media,
+)
 
 urlpatterns = [
     path('admin/', admin.site.urls),
@@ -20,7 +22,17 @@ urlpatterns = [
     path('evaluation/', include('evaluation.urls', namespace='evaluation')),
     path('contract/', include('contract.urls', namespace='contract')),
     path('api/port/', include('core.urls')),  # Add port endpoint
-] + static(settings.MEDIA_URL, document_root=settings.MEDIA_ROOT)
+    path('api/metrics', metrics, name='metrics'),
+    path('api/search/', SearchView.as_view(), name='search'),
+    path('api/notifications/', NotificationInboxView.as_view(), name='notification-inbox'),
+    path('api/notifications/unread-count/', NotificationUnreadCountView.as_view(), name='notification-unread-count'),
+    path('api/notifications/read/', NotificationMarkReadView.as_view(), name='notification-mark-read'),
+]
+
+if settings.DEBUG:
+    urlpatterns += [
+        re_path(rf"^{settings.MEDIA_URL.lstrip('/')}(?P<path>.*)$", serve_media),
+    ]
 
 # from django.contrib import admin
 # from django.urls import path, include
@@ -0,0 +1,17 @@
+# Generated by Django 5.1.7 on 2026-10-18 01:39
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('contract', '0001_initial'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='contract',
+            index=models.Index(fields=['award_date'], name='contract_award_date_idx'),
+        ),
+    ]
@@ -8,5 +8,10 @@ class Contract(models.Model):
     contract_document = models.FileField(upload_to='contracts/documents/', null=True, blank=True)
     status = models.CharField(max_length=20, choices=[('awarded', 'Awarded'), ('cancelled', 'Cancelled')], default='awarded')
 
+    class Meta:
+        indexes = [
+            models.Index(fields=['award_date'], name='contract_award_date_idx'),
+        ]
+
     def __str__(self):
         return f"Contract for {self.bid}"   
\ No newline at end of file
@@ -1,8 +1,21 @@
 from rest_framework import serializers
 from .models import Contract
+from django.db import transaction
 from procurement.models import ProcurementPlan
+from procurement.serializers import advance_plan_stage
+from procurement.stages import can_enter
+from bidding.serializers import BidSerializer
+from core.serializers import DynamicFieldsMixin
+
+class ContractSerializer(DynamicFieldsMixin, serializers.ModelSerializer):
+    expandable_fields = {
+        'bid': {
+            'serializer': BidSerializer,
+            'options': {'read_only': True},
+            'select_related': ['bid'],
+        },
+    }
 
-class ContractSerializer(serializers.ModelSerializer):
     class Meta:
         model = Contract
         fields = ['id', 'bid', 'contract_amount', 'award_date', 'contract_document', 'status']
@@ -11,18 +24,16 @@ class ContractSerializer(serializers.ModelSerializer):
     def validate(self, data):
         bid = data.get('bid')
         procurement_plan = bid.tender.procurement_plan
-        if procurement_plan.stage != 'evaluation':
+        if not can_enter(procurement_plan.stage, 'contract'):
             raise serializers.ValidationError("Evaluation must be completed before awarding a contract.")
         if not bid.evaluation or bid.evaluation.status != 'approved':
             raise serializers.ValidationError("Bid must be evaluated and approved before awarding a contract.")
         return data
 
     def create(self, validated_data):
-        contract = Contract.objects.create(**validated_data)
-        # Update the ProcurementPlan stage
-        procurement_plan = validated_data['bid'].tender.procurement_plan
-        procurement_plan.stage = 'contract'
-        procurement_plan.save()
+        with transaction.atomic():
+            advance_plan_stage(validated_data['bid'].tender.procurement_plan, 'contract')
+            contract = Contract.objects.create(**validated_data)
         return contract
 
     def update(self, instance, validated_data):
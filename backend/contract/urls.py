@@ -1,9 +1,10 @@
 from django.urls import path
-from .views import ContractListCreateView, ContractDetailView
+from .views import ContractListCreateView, ContractDetailView, ContractDocumentDownloadView
 
 app_name = 'contract'
 
 urlpatterns = [
     path('contracts/', ContractListCreateView.as_view(), name='contract-list-create'),
     path('contracts/<int:pk>/', ContractDetailView.as_view(), name='contract-detail'),
+    path('contracts/<int:pk>/document/', ContractDocumentDownloadView.as_view(), name='contract-document'),
 ]
\ No newline at end of file
@@ -3,29 +3,33 @@ from rest_framework.permissions import IsAuthenticated
 from rest_framework.response import Response
 from .models import Contract
 from .serializers import ContractSerializer
+from core.serializers import DynamicFieldsQuerysetMixin
+from users.mixins import HierarchyScopedQuerysetMixin
+from core.files import serve_file
 
-class ContractListCreateView(generics.ListCreateAPIView):
-    queryset = Contract.objects.all()
+class ContractListCreateView(DynamicFieldsQuerysetMixin, HierarchyScopedQuerysetMixin, generics.ListCreateAPIView):
+    queryset = Contract.objects.order_by('-award_date')
     serializer_class = ContractSerializer
     permission_classes = [IsAuthenticated]
+    hierarchy_owner_field = 'bid__tender__procurement_plan__owner'
 
-    def get_queryset(self):
-        user = self.request.user
-        if not user.is_authenticated or not user.role:
-            return Contract.objects.none()
-        allowed_roles = user.get_allowed_roles()
-        allowed_role_ids = [role.id for role in allowed_roles]
-        return Contract.objects.filter(bid__tender__procurement_plan__owner__role__id__in=allowed_role_ids).order_by('-award_date')
-
-class ContractDetailView(generics.RetrieveUpdateDestroyAPIView):
+class ContractDetailView(DynamicFieldsQuerysetMixin, HierarchyScopedQuerysetMixin, generics.RetrieveUpdateDestroyAPIView):
     queryset = Contract.objects.all()
     serializer_class = ContractSerializer
     permission_classes = [IsAuthenticated]
+    hierarchy_owner_field = 'bid__tender__procurement_plan__owner'
+
+class ContractDocumentDownloadView(HierarchyScopedQuerysetMixin, generics.GenericAPIView):
+    queryset = Contract.objects.all()
+    permission_classes = [IsAuthenticated]
+    hierarchy_owner_field = 'bid__tender__procurement_plan__owner'
 
-    def get_queryset(self):
-        user = self.request.user
-        if not user.is_authenticated or not user.role:
-            return Contract.objects.none()
-        allowed_roles = user.get_allowed_roles()
-        allowed_role_ids = [role.id for role in allowed_roles]
-        return Contract.objects.filter(bid__tender__procurement_plan__owner__role__id__in=allowed_role_ids)
\ No newline at end of file
+    def get(self, request, *args, **kwargs):
+        contract = self.get_object()
+        if not contract.contract_document:
+            return Response({'error': 'No document uploaded for this contract.'}, status=status.HTTP_404_NOT_FOUND)
+        document = contract.contract_document
+        try:
+            return serve_file(request, document.storage, document.name, as_attachment=True)
+        except FileNotFoundError:
+            return Response({'error': 'Contract document file not found.'}, status=status.HTTP_404_NOT_FOUND)
@@ -1,3 +1,24 @@
 from django.contrib import admin
+from .models import Notification, NotificationBroadcast, OutboundEmail
 
-# Register your models here.
+class OutboundEmailAdmin(admin.ModelAdmin):
+    list_display = ('subject', 'recipients', 'status', 'attempts', 'next_attempt_at', 'sent_at')
+    list_filter = ('status',)
+    search_fields = ('subject',)
+    readonly_fields = ('created_at', 'sent_at', 'last_error')
+
+admin.site.register(OutboundEmail, OutboundEmailAdmin)
+
+class NotificationBroadcastAdmin(admin.ModelAdmin):
+    list_display = ('title', 'category', 'send_email', 'created_at', 'processed_at')
+    list_filter = ('category', 'send_email')
+    search_fields = ('title',)
+
+class NotificationAdmin(admin.ModelAdmin):
+    list_display = ('title', 'recipient', 'category', 'is_read', 'created_at')
+    list_filter = ('category', 'is_read')
+    search_fields = ('title', 'recipient__employee_id')
+    raw_id_fields = ('recipient',)
+
+admin.site.register(NotificationBroadcast, NotificationBroadcastAdmin)
+admin.site.register(Notification, NotificationAdmin)
@@ -0,0 +1,111 @@
+# core/cache.py
+import hashlib
+import time
+from functools import wraps
+from django.conf import settings
+from django.core.cache import cache
+from django.db.models.signals import post_delete, post_save
+from django.http import HttpResponse
+from django.utils.cache import get_conditional_response, patch_vary_headers
+from django.utils.http import http_date
+from rest_framework.request import Request
+from rest_framework.response import Response
+
+def version_key(model):
+    return f"model-version:{model._meta.label_lower}"
+
+def stamps(keys):
+    """
+    Current version stamp (a timestamp of the last change) for each key.
+    Keys without a stamp yet get one now, which is also what happens if the
+    cache evicts one, so a lost stamp only ever causes a miss.
+    """
+    versions = cache.get_many(keys)
+    missing = [key for key in keys if key not in versions]
+    if missing:
+        now = time.time()
+        for key in missing:
+            cache.add(key, now, timeout=None)
+        versions.update(cache.get_many(missing))
+    return [versions.get(key, time.time()) for key in keys]
+
+def bump_stamp(key):
+    cache.set(key, time.time(), timeout=None)
+
+def model_versions(models):
+    return stamps([version_key(model) for model in models])
+
+def bump_model_version(model):
+    """Invalidate cached responses built from ``model``; call after bulk writes that skip signals."""
+    bump_stamp(version_key(model))
+
+def _bump_on_change(sender, update_fields=None, **kwargs):
+    # Logins save last_login only, which no cached response shows
+    if update_fields is not None and set(update_fields) <= {'last_login'}:
+        return
+    bump_model_version(sender)
+
+def track_model_changes(*models):
+    for model in models:
+        for signal in (post_save, post_delete):
+            signal.connect(_bump_on_change, sender=model, dispatch_uid=f"{version_key(model)}:{signal}")
+
+def cached_get(*models, scope=None):
+    """
+    Cache a GET handler's response under its URL, the requesting user's
+    ``scope(request)`` and the version stamps of ``models``, which are bumped
+    on every save or delete of those models.
+
+    Responses carry an ETag and Last-Modified, and a matching If-None-Match
+    gets a 304 without running the handler. If-Modified-Since alone is not
+    honoured: one-second resolution and per-user scope make it unreliable.
+
+    Works on plain Django views and on DRF handlers, where it runs after
+    authentication and permission checks (decorate ``get`` with
+    ``method_decorator``). DRF responses are cached as data, others as bytes.
+    """
+    track_model_changes(*models)
+
+    def decorator(handler):
+        @wraps(handler)
+        def wrapper(request, *args, **kwargs):
+            if request.method not in ('GET', 'HEAD'):
+                return handler(request, *args, **kwargs)
+            versions = model_versions(models)
+            user_scope = scope(request) if scope else ''
+            key = hashlib.sha1(
+                f"{request.get_full_path()}|{user_scope}|{'|'.join(map(repr, versions))}".encode()
+            ).hexdigest()
+            etag = f'"{key}"'
+            last_modified = int(max(versions)) if versions else None
+
+            response = get_conditional_response(request, etag=etag)
+            if response is None:
+                cached = cache.get(f"response:{key}")
+                if cached is None:
+                    response = handler(request, *args, **kwargs)
+                    if response.status_code != 200:
+                        return response
+                    if isinstance(response, Response):
+                        cached = {'data': response.data}
+                    else:
+                        cached = {'content': response.content, 'content_type': response['Content-Type']}
+                    cache.set(f"response:{key}", cached, settings.RESPONSE_CACHE_TIMEOUT)
+                elif 'data' in cached:
+                    response = Response(cached['data'])
+                else:
+                    response = HttpResponse(cached['content'], content_type=cached['content_type'])
+
+            response['ETag'] = etag
+            if last_modified is not None:
+                response['Last-Modified'] = http_date(last_modified)
+            response['Cache-Control'] = 'private, no-cache'
+            if isinstance(request, Request):
+                patch_vary_headers(response, ['Authorization'])
+            return response
+        return wrapper
+    return decorator
+
+def role_scope(request):
+    """Scope for responses that depend on the user's position in the role hierarchy."""
+    return f"role:{request.user.role_id}"
@@ -0,0 +1,124 @@
+# core/files.py
+import mimetypes
+import os
+import re
+from urllib.parse import quote
+from django.conf import settings
+from django.http import FileResponse, HttpResponse, StreamingHttpResponse
+from django.utils.cache import get_conditional_response
+from django.utils.http import content_disposition_header, http_date, parse_http_date_safe
+
+RANGE_RE = re.compile(r'^bytes=(\d*)-(\d*)$')
+
+class RangeNotSatisfiable(ValueError):
+    pass
+
+def file_etag(size, modified):
+    return f'"{int(modified):x}-{size:x}"'
+
+def parse_range(header, size):
+    """
+    Return the inclusive ``(start, end)`` of a single byte range, or None when
+    the header is absent or not a single range (the whole file is served).
+    """
+    match = RANGE_RE.match(header.strip()) if header else None
+    if not match or match.groups() == ('', ''):
+        return None
+    first, last = match.groups()
+    if first:
+        start, end = int(first), int(last) if last else size - 1
+    else:
+        start, end = max(size - int(last), 0), size - 1
+    if start >= size or start > end:
+        raise RangeNotSatisfiable(header)
+    return start, min(end, size - 1)
+
+def if_range_matches(request, etag, modified):
+    if_range = request.headers.get('If-Range')
+    if not if_range:
+        return True
+    if if_range.startswith('"') or if_range.startswith('W/'):
+        return if_range == etag
+    return parse_http_date_safe(if_range) == int(modified)
+
+class FileRange:
+    """
+    Iterable over ``length`` bytes of ``name`` from ``start``. The file is only
+    opened once iteration starts, and ``close()`` (which StreamingHttpResponse
+    calls when it is closed) releases it whether or not the body was sent.
+    """
+    def __init__(self, storage, name, start, length, chunk_size):
+        self.storage, self.name = storage, name
+        self.start, self.length, self.chunk_size = start, length, chunk_size
+        self.fh = None
+
+    def __iter__(self):
+        self.fh = self.storage.open(self.name, 'rb')
+        self.fh.seek(self.start)
+        remaining = self.length
+        while remaining > 0:
+            chunk = self.fh.read(min(self.chunk_size, remaining))
+            if not chunk:
+                break
+            remaining -= len(chunk)
+            yield chunk
+        self.close()
+
+    def close(self):
+        if self.fh is not None:
+            self.fh.close()
+            self.fh = None
+
+def serve_file(request, storage, name, as_attachment=False, filename=None):
+    """
+    Stream ``name`` from ``storage`` without loading it into memory.
+
+    Honours If-None-Match/If-Modified-Since (304) and single byte ranges
+    (206). When FILE_ACCEL_REDIRECT_PREFIX is set the body is left to nginx
+    through X-Accel-Redirect, so call this only after access has been
+    checked. Raises FileNotFoundError if the file is missing.
+    """
+    size = storage.size(name)
+    modified = storage.get_modified_time(name).timestamp()
+    filename = filename or os.path.basename(name)
+    content_type = mimetypes.guess_type(filename)[0] or 'application/octet-stream'
+
+    headers = HttpResponse()
+    headers['ETag'] = file_etag(size, modified)
+    headers['Last-Modified'] = http_date(modified)
+    headers['Cache-Control'] = 'private, no-cache'
+    conditional = get_conditional_response(
+        request, etag=headers['ETag'], last_modified=int(modified), response=headers
+    )
+    if conditional is not headers:
+        return conditional
+
+    if settings.FILE_ACCEL_REDIRECT_PREFIX:
+        response = HttpResponse(content_type=content_type)
+        response['X-Accel-Redirect'] = f"{settings.FILE_ACCEL_REDIRECT_PREFIX.rstrip('/')}/{quote(name)}"
+    else:
+        range_header = request.headers.get('Range') if if_range_matches(request, headers['ETag'], modified) else None
+        try:
+            byte_range = parse_range(range_header, size)
+        except RangeNotSatisfiable:
+            response = HttpResponse(status=416)
+            response['Content-Range'] = f'bytes */{size}'
+            return response
+        if byte_range:
+            start, end = byte_range
+            response = StreamingHttpResponse(
+                FileRange(storage, name, start, end - start + 1, settings.FILE_STREAM_CHUNK_SIZE),
+                status=206, content_type=content_type
+            )
+            response['Content-Length'] = str(end - start + 1)
+            response['Content-Range'] = f'bytes {start}-{end}/{size}'
+        else:
+            response = FileResponse(storage.open(name, 'rb'), content_type=content_type)
+            response.block_size = settings.FILE_STREAM_CHUNK_SIZE
+            response['Content-Length'] = str(size)
+        response['Accept-Ranges'] = 'bytes'
+
+    for header in ('ETag', 'Last-Modified', 'Cache-Control'):
+        response[header] = headers[header]
+    response['Content-Disposition'] = content_disposition_header(as_attachment, filename)
+    return response
@@ -0,0 +1,98 @@
+# core/mail.py
+import logging
+from datetime import timedelta
+from django.conf import settings
+from django.core.mail import EmailMessage, get_connection
+from django.db import transaction
+from django.utils import timezone
+from .models import OutboundEmail
+
+logger = logging.getLogger(__name__)
+
+def enqueue_mail(subject, body, recipients, from_email=None):
+    """Queue one message for the ``send_outbox`` worker instead of sending it inline."""
+    return OutboundEmail.objects.create(
+        subject=subject, body=body, recipients=list(recipients),
+        from_email=from_email or settings.DEFAULT_FROM_EMAIL,
+    )
+
+def enqueue_mass_mail(messages, from_email=None):
+    """Queue ``(subject, body, recipients)`` tuples with a single INSERT."""
+    from_email = from_email or settings.DEFAULT_FROM_EMAIL
+    return OutboundEmail.objects.bulk_create([
+        OutboundEmail(subject=subject, body=body, recipients=list(recipients), from_email=from_email)
+        for subject, body, recipients in messages
+    ])
+
+def retry_delay(attempts):
+    """Exponential backoff after the ``attempts``-th failure, capped at OUTBOX_RETRY_MAX_DELAY."""
+    return timedelta(seconds=min(
+        settings.OUTBOX_RETRY_BASE_DELAY * 2 ** (attempts - 1), settings.OUTBOX_RETRY_MAX_DELAY
+    ))
+
+def due_messages(now):
+    return OutboundEmail.objects.filter(status=OutboundEmail.PENDING, next_attempt_at__lte=now)
+
+def claim_batch(batch_size, now):
+    """
+    Claim up to ``batch_size`` due messages in a short transaction. Rows are
+    locked with SELECT ... FOR UPDATE SKIP LOCKED and their next attempt is
+    pushed OUTBOX_CLAIM_TIMEOUT seconds out, so other workers skip them
+    while they are being sent and a crashed worker's claim lapses.
+    """
+    with transaction.atomic():
+        batch = list(
+            due_messages(now).select_for_update(skip_locked=True).order_by('next_attempt_at')[:batch_size]
+        )
+        if batch:
+            OutboundEmail.objects.filter(pk__in=[message.pk for message in batch]).update(
+                next_attempt_at=now + timedelta(seconds=settings.OUTBOX_CLAIM_TIMEOUT)
+            )
+    return batch
+
+def send_pending(batch_size=None):
+    """
+    Send up to ``batch_size`` due messages over one mail server connection.
+    The connection is opened before anything is claimed, so while the mail
+    server is unreachable the queue is left untouched. Each message's
+    outcome is saved as soon as it is sent, outside any transaction, so a
+    later failure cannot undo the record of mail that already went out. A
+    failed message is retried with exponential backoff and marked failed
+    after OUTBOX_MAX_ATTEMPTS. Returns ``(sent, failed)`` counts for the batch.
+    """
+    batch_size = batch_size or settings.OUTBOX_BATCH_SIZE
+    now = timezone.now()
+    if not due_messages(now).exists():
+        return 0, 0
+    try:
+        connection = get_connection(fail_silently=False)
+        connection.open()
+    except Exception as e:
+        logger.error(f"Could not connect to the mail server: {str(e)}")
+        return 0, 0
+    sent = failed = 0
+    try:
+        for message in claim_batch(batch_size, now):
+            message.attempts += 1
+            try:
+                EmailMessage(
+                    message.subject, message.body, message.from_email, message.recipients, connection=connection
+                ).send()
+            except Exception as e:
+                message.last_error = str(e)
+                if message.attempts >= settings.OUTBOX_MAX_ATTEMPTS:
+                    message.status = OutboundEmail.FAILED
+                    logger.error(f"Giving up on outbound email {message.pk} after {message.attempts} attempts: {str(e)}")
+                else:
+                    message.next_attempt_at = now + retry_delay(message.attempts)
+                failed += 1
+            else:
+                message.status = OutboundEmail.SENT
+                message.sent_at = timezone.now()
+                message.last_error = ''
+                sent += 1
+            message.save(update_fields=['status', 'attempts', 'next_attempt_at', 'last_error', 'sent_at'])
+    finally:
+        connection.close()
+    logger.info(f"Outbox batch: {sent} sent, {failed} failed")
+    return sent, failed
@@ -0,0 +1,31 @@
+import time
+from django.conf import settings
+from django.core.management.base import BaseCommand
+from core.notifications import process_broadcasts
+
+class Command(BaseCommand):
+    help = (
+        'Fan queued notification broadcasts out to their recipients. Runs until '
+        'interrupted, polling every --interval seconds once the queue is empty; '
+        '--once drains the queue and exits.'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--batch-size', type=int, default=settings.NOTIFICATION_FANOUT_BATCH_SIZE, help='Broadcasts per batch'
+        )
+        parser.add_argument('--interval', type=float, default=settings.OUTBOX_POLL_INTERVAL, help='Seconds to wait when idle')
+        parser.add_argument('--once', action='store_true', help='Exit once the queue is empty')
+
+    def handle(self, *args, **options):
+        total_broadcasts = total_notified = 0
+        while True:
+            broadcasts, notified = process_broadcasts(options['batch_size'])
+            total_broadcasts += broadcasts
+            total_notified += notified
+            if broadcasts:
+                continue
+            if options['once']:
+                break
+            time.sleep(options['interval'])
+        self.stdout.write(self.style.SUCCESS(f'{total_broadcasts} broadcasts, {total_notified} notifications'))
@@ -0,0 +1,29 @@
+import time
+from django.conf import settings
+from django.core.management.base import BaseCommand
+from core.mail import send_pending
+
+class Command(BaseCommand):
+    help = (
+        'Deliver queued outbound email in batches, one mail server connection per '
+        'batch. Runs until interrupted, polling every --interval seconds once the '
+        'queue is empty; --once drains the due messages and exits.'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--batch-size', type=int, default=settings.OUTBOX_BATCH_SIZE, help='Messages per batch')
+        parser.add_argument('--interval', type=float, default=settings.OUTBOX_POLL_INTERVAL, help='Seconds to wait when idle')
+        parser.add_argument('--once', action='store_true', help='Exit once no messages are due')
+
+    def handle(self, *args, **options):
+        total_sent = total_failed = 0
+        while True:
+            sent, failed = send_pending(options['batch_size'])
+            total_sent += sent
+            total_failed += failed
+            if sent or failed:
+                continue
+            if options['once']:
+                break
+            time.sleep(options['interval'])
+        self.stdout.write(self.style.SUCCESS(f'{total_sent} sent, {total_failed} failed'))
@@ -0,0 +1,177 @@
+# core/metrics.py
+import threading
+import time
+from collections import defaultdict
+from contextlib import ExitStack, contextmanager
+from contextvars import ContextVar
+from django.db import connections
+from rest_framework.renderers import JSONRenderer
+
+# Upper bounds (seconds) of the request duration histogram buckets
+DURATION_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+UNRESOLVED = '<unresolved>'
+
+current = ContextVar('request_metrics', default=None)
+
+class RequestMetrics:
+    """
+    Query count, DB, serializer and response render time for a single
+    request. Used as a ``connection.execute_wrapper`` while ``track()`` is
+    active.
+    """
+    __slots__ = ('queries', 'db_time', 'serializer_time', 'render_time', 'serializing')
+
+    def __init__(self):
+        self.queries = 0
+        self.db_time = 0.0
+        self.serializer_time = 0.0
+        self.render_time = 0.0
+        self.serializing = False
+
+    def __call__(self, execute, sql, params, many, context):
+        start = time.perf_counter()
+        try:
+            return execute(sql, params, many, context)
+        finally:
+            self.db_time += time.perf_counter() - start
+            self.queries += 1
+
+    @contextmanager
+    def track(self):
+        with ExitStack() as stack:
+            for connection in connections.all():
+                stack.enter_context(connection.execute_wrapper(self))
+            token = current.set(self)
+            try:
+                yield self
+            finally:
+                current.reset(token)
+
+    def server_timing(self, wall):
+        return ', '.join([
+            f'db;dur={self.db_time * 1000:.1f};desc="{self.queries} queries"',
+            f'serialize;dur={self.serializer_time * 1000:.1f}',
+            f'render;dur={self.render_time * 1000:.1f}',
+            f'total;dur={wall * 1000:.1f}',
+        ])
+
+class TimedSerializerMixin:
+    """
+    Serializer mixin that adds the time spent turning instances into
+    primitives to the current request's metrics. Only the outermost
+    serializer is timed, so nested serializers are not counted twice; with
+    ``many=True`` each item is timed as it is represented. Queries issued
+    while serializing count here as well as under DB time.
+    """
+    def to_representation(self, instance):
+        metrics = current.get()
+        if metrics is None or metrics.serializing:
+            return super().to_representation(instance)
+        metrics.serializing = True
+        start = time.perf_counter()
+        try:
+            return super().to_representation(instance)
+        finally:
+            metrics.serializer_time += time.perf_counter() - start
+            metrics.serializing = False
+
+class TimedJSONRenderer(JSONRenderer):
+    """
+    JSONRenderer that adds its rendering time to the current request's
+    metrics. Building serializer ``.data`` is timed by TimedSerializerMixin;
+    this covers encoding the response body.
+    """
+    def render(self, data, accepted_media_type=None, renderer_context=None):
+        metrics = current.get()
+        if metrics is None:
+            return super().render(data, accepted_media_type, renderer_context)
+        start = time.perf_counter()
+        try:
+            return super().render(data, accepted_media_type, renderer_context)
+        finally:
+            metrics.render_time += time.perf_counter() - start
+
+class EndpointStats:
+    __slots__ = ('responses', 'buckets', 'duration', 'queries', 'db_time', 'serializer_time', 'render_time')
+
+    def __init__(self):
+        self.responses = defaultdict(int)
+        self.buckets = [0] * len(DURATION_BUCKETS)
+        self.duration = 0.0
+        self.queries = 0
+        self.db_time = 0.0
+        self.serializer_time = 0.0
+        self.render_time = 0.0
+
+    @property
+    def count(self):
+        return sum(self.responses.values())
+
+def label(value):
+    return str(value).replace('\\', '\\\\').replace('"', '\\"').replace('\n', '\\n')
+
+class MetricsRegistry:
+    """
+    Per-endpoint request statistics for this process, keyed by
+    ``(view name, method)``. Each worker process keeps its own registry, so
+    scrape every worker (or aggregate in Prometheus) for the full picture.
+    """
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.endpoints = {}
+
+    def record(self, view, method, status, metrics, wall):
+        with self.lock:
+            stats = self.endpoints.get((view, method))
+            if stats is None:
+                stats = self.endpoints[(view, method)] = EndpointStats()
+            stats.responses[status] += 1
+            for index, bound in enumerate(DURATION_BUCKETS):
+                if wall <= bound:
+                    stats.buckets[index] += 1
+            stats.duration += wall
+            stats.queries += metrics.queries
+            stats.db_time += metrics.db_time
+            stats.serializer_time += metrics.serializer_time
+            stats.render_time += metrics.render_time
+
+    def reset(self):
+        with self.lock:
+            self.endpoints = {}
+
+    def render(self):
+        """The registry in the Prometheus text exposition format."""
+        with self.lock:
+            endpoints = sorted(self.endpoints.items())
+            lines = [
+                '# HELP http_requests_total Requests handled, by view, method and status.',
+                '# TYPE http_requests_total counter',
+            ]
+            for (view, method), stats in endpoints:
+                for status, count in sorted(stats.responses.items()):
+                    lines.append(f'http_requests_total{{view="{label(view)}",method="{label(method)}",status="{status}"}} {count}')
+
+            lines += [
+                '# HELP http_request_duration_seconds Wall time spent handling requests.',
+                '# TYPE http_request_duration_seconds histogram',
+            ]
+            for (view, method), stats in endpoints:
+                labels = f'view="{label(view)}",method="{label(method)}"'
+                for bound, count in zip(DURATION_BUCKETS, stats.buckets):
+                    lines.append(f'http_request_duration_seconds_bucket{{{labels},le="{bound}"}} {count}')
+                lines.append(f'http_request_duration_seconds_bucket{{{labels},le="+Inf"}} {stats.count}')
+                lines.append(f'http_request_duration_seconds_sum{{{labels}}} {stats.duration:.6f}')
+                lines.append(f'http_request_duration_seconds_count{{{labels}}} {stats.count}')
+
+            for name, help_text, attr, fmt in (
+                ('http_request_db_queries_total', 'SQL queries executed while handling requests.', 'queries', 'd'),
+                ('http_request_db_seconds_total', 'Time spent executing SQL queries.', 'db_time', '.6f'),
+                ('http_request_serializer_seconds_total', 'Time spent serializing response data.', 'serializer_time', '.6f'),
+                ('http_request_render_seconds_total', 'Time spent rendering response bodies.', 'render_time', '.6f'),
+            ):
+                lines += [f'# HELP {name} {help_text}', f'# TYPE {name} counter']
+                for (view, method), stats in endpoints:
+                    lines.append(f'{name}{{view="{label(view)}",method="{label(method)}"}} {getattr(stats, attr):{fmt}}')
+        return '\n'.join(lines) + '\n'
+
+registry = MetricsRegistry()
@@ -0,0 +1,23 @@
+# Generated by Django 5.1.7 on 2026-10-18 02:33
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('core', '0002_notifications'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='notificationbroadcast',
+            name='failed_at',
+            field=models.DateTimeField(blank=True, null=True),
+        ),
+        migrations.AddField(
+            model_name='notificationbroadcast',
+            name='last_error',
+            field=models.TextField(blank=True, default=''),
+        ),
+    ]
@@ -1,3 +1,101 @@
+# core/models.py
+from django.conf import settings
 from django.db import models
+from django.utils import timezone
 
-# Create your models here.
+class OutboundEmail(models.Model):
+    """
+    One message in the outbound mail queue. Requests only insert rows; the
+    ``send_outbox`` worker delivers them, so a slow or unreachable mail
+    server never holds up a request.
+    """
+    PENDING = 'pending'
+    SENT = 'sent'
+    FAILED = 'failed'
+    STATUS_CHOICES = [
+        (PENDING, 'Pending'),
+        (SENT, 'Sent'),
+        (FAILED, 'Failed'),
+    ]
+
+    subject = models.CharField(max_length=255)
+    body = models.TextField()
+    from_email = models.CharField(max_length=254)
+    recipients = models.JSONField(default=list)
+    status = models.CharField(max_length=10, choices=STATUS_CHOICES, default=PENDING)
+    attempts = models.PositiveSmallIntegerField(default=0)
+    # Not picked up again before this time; pushed back after each failure.
+    next_attempt_at = models.DateTimeField(default=timezone.now)
+    last_error = models.TextField(blank=True, default='')
+    created_at = models.DateTimeField(auto_now_add=True)
+    sent_at = models.DateTimeField(null=True, blank=True)
+
+    class Meta:
+        indexes = [
+            # The worker's "due messages" scan; sent and failed rows stay out of it.
+            models.Index(
+                fields=['next_attempt_at'], name='outbox_pending_due_idx',
+                condition=models.Q(status='pending'),
+            ),
+        ]
+
+    def __str__(self):
+        return f"{self.subject} -> {', '.join(self.recipients)} ({self.status})"
+
+class NotificationBroadcast(models.Model):
+    """
+    A notification waiting to be fanned out to ``recipients`` (user pks).
+    Requests insert one of these; the ``fanout_notifications`` worker turns
+    it into one Notification per recipient, bumps their unread counters and,
+    with ``send_email``, queues the matching emails.
+    """
+    category = models.CharField(max_length=50)
+    title = models.CharField(max_length=255)
+    body = models.TextField(blank=True, default='')
+    link = models.CharField(max_length=255, blank=True, default='')
+    recipients = models.JSONField(default=list)
+    send_email = models.BooleanField(default=False)
+    created_at = models.DateTimeField(auto_now_add=True)
+    processed_at = models.DateTimeField(null=True, blank=True)
+    # Set when the fan-out raised; the worker skips the broadcast from then on.
+    failed_at = models.DateTimeField(null=True, blank=True)
+    last_error = models.TextField(blank=True, default='')
+
+    class Meta:
+        indexes = [
+            models.Index(
+                fields=['created_at'], name='broadcast_pending_idx',
+                condition=models.Q(processed_at__isnull=True),
+            ),
+        ]
+
+    def __str__(self):
+        return f"{self.title} ({len(self.recipients)} recipients)"
+
+class Notification(models.Model):
+    recipient = models.ForeignKey(settings.AUTH_USER_MODEL, on_delete=models.CASCADE, related_name='notifications')
+    category = models.CharField(max_length=50)
+    title = models.CharField(max_length=255)
+    body = models.TextField(blank=True, default='')
+    link = models.CharField(max_length=255, blank=True, default='')
+    is_read = models.BooleanField(default=False)
+    created_at = models.DateTimeField(default=timezone.now)
+
+    class Meta:
+        indexes = [
+            # Serves the inbox's keyset pagination, newest first.
+            models.Index(fields=['recipient', '-created_at', '-id'], name='notification_inbox_idx'),
+        ]
+
+    def __str__(self):
+        return f"{self.title} -> {self.recipient_id}"
+
+class NotificationCounter(models.Model):
+    """Denormalized unread notification count, so the badge is a primary key lookup."""
+    user = models.OneToOneField(
+        settings.AUTH_USER_MODEL, on_delete=models.CASCADE, primary_key=True, related_name='notification_counter'
+    )
+    unread = models.PositiveIntegerField(default=0)
+
+    def __str__(self):
+        return f"{self.user_id}: {self.unread} unread"
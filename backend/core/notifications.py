@@ -0,0 +1,100 @@
+# core/notifications.py
+import logging
+from django.conf import settings
+from django.contrib.auth import get_user_model
+from django.db import transaction
+from django.db.models import F
+from django.db.models.functions import Greatest
+from django.utils import timezone
+from .mail import enqueue_mass_mail
+from .models import Notification, NotificationBroadcast, NotificationCounter
+
+logger = logging.getLogger(__name__)
+
+def broadcast(recipients, title, body='', category='', link='', send_email=False):
+    """
+    Queue a notification for ``recipients`` (user pks). This is a single
+    INSERT whatever the audience size; the fan-out to each recipient happens
+    in the ``fanout_notifications`` worker. Returns the broadcast, or None if
+    there is nobody to tell.
+    """
+    recipients = sorted(set(recipients))
+    if not recipients:
+        return None
+    return NotificationBroadcast.objects.create(
+        recipients=recipients, title=title, body=body, category=category, link=link, send_email=send_email
+    )
+
+def fan_out(item):
+    """
+    Deliver one broadcast: one bulk INSERT of notifications, one INSERT of
+    missing counters plus one UPDATE of all of them and, with ``send_email``,
+    one bulk INSERT into the mail outbox. Recipients deleted or deactivated
+    since the broadcast was queued are skipped. Returns the number notified.
+    """
+    users = dict(
+        get_user_model().objects.filter(pk__in=item.recipients, is_active=True).values_list('pk', 'email')
+    )
+    with transaction.atomic():
+        Notification.objects.bulk_create([
+            Notification(
+                recipient_id=user_id, category=item.category, title=item.title, body=item.body,
+                link=item.link, created_at=item.created_at,
+            )
+            for user_id in users
+        ], batch_size=settings.NOTIFICATION_INSERT_BATCH_SIZE)
+        NotificationCounter.objects.bulk_create(
+            [NotificationCounter(user_id=user_id) for user_id in users], ignore_conflicts=True
+        )
+        NotificationCounter.objects.filter(user_id__in=users).update(unread=F('unread') + 1)
+        if item.send_email:
+            enqueue_mass_mail((item.title, item.body, [email]) for email in users.values() if email)
+        item.processed_at = timezone.now()
+        item.save(update_fields=['processed_at'])
+    return len(users)
+
+def process_broadcasts(batch_size=None):
+    """
+    Fan out up to ``batch_size`` queued broadcasts, oldest first. Rows are
+    claimed with SELECT ... FOR UPDATE SKIP LOCKED so several workers never
+    deliver the same broadcast twice. Each broadcast runs in its own
+    savepoint; one that fails is rolled back, marked failed and skipped so
+    it cannot hold up the rest of the queue. Returns ``(broadcasts, notifications)``.
+    """
+    batch_size = batch_size or settings.NOTIFICATION_FANOUT_BATCH_SIZE
+    notified = failed = 0
+    with transaction.atomic():
+        batch = list(
+            NotificationBroadcast.objects.select_for_update(skip_locked=True)
+            .filter(processed_at__isnull=True, failed_at__isnull=True).order_by('created_at')[:batch_size]
+        )
+        for item in batch:
+            try:
+                with transaction.atomic():
+                    notified += fan_out(item)
+            except Exception as e:
+                logger.exception(f"Fan-out of broadcast {item.pk} failed; skipping it")
+                item.failed_at = timezone.now()
+                item.last_error = str(e)
+                item.save(update_fields=['failed_at', 'last_error'])
+                failed += 1
+    if batch:
+        logger.info(f"Fanned out {len(batch) - failed} broadcasts to {notified} recipients, {failed} failed")
+    return len(batch), notified
+
+def unread_count(user):
+    return NotificationCounter.objects.filter(user=user).values_list('unread', flat=True).first() or 0
+
+def mark_read(user, ids=None):
+    """
+    Mark ``user``'s unread notifications (all, or just ``ids``) as read and
+    take them off the counter. Returns ``(marked, unread)``.
+    """
+    with transaction.atomic():
+        unread = Notification.objects.filter(recipient=user, is_read=False)
+        if ids is not None:
+            unread = unread.filter(pk__in=ids)
+        marked = unread.update(is_read=True)
+        if marked:
+            NotificationCounter.objects.filter(user=user).update(unread=Greatest(F('unread') - marked, 0))
+        return marked, unread_count(user)
@@ -0,0 +1,73 @@
+# core/operations.py
+from django.contrib.postgres.operations import AddIndexConcurrently
+from django.db.migrations.operations.base import Operation
+
+class AddIndexConcurrentlyOnPostgres(AddIndexConcurrently):
+    """GIN and pg_trgm only exist on PostgreSQL; other backends skip the index."""
+
+    def database_forwards(self, app_label, schema_editor, from_state, to_state):
+        if schema_editor.connection.vendor == 'postgresql':
+            super().database_forwards(app_label, schema_editor, from_state, to_state)
+
+    def database_backwards(self, app_label, schema_editor, from_state, to_state):
+        if schema_editor.connection.vendor == 'postgresql':
+            super().database_backwards(app_label, schema_editor, from_state, to_state)
+
+class CreateSearchVectorTrigger(Operation):
+    """
+    Keep ``model_name``'s ``search_vector`` column in sync with ``columns``
+    (``{field name: weight}``) through a BEFORE INSERT/UPDATE trigger, and
+    backfill existing rows. A trigger also covers bulk_create and
+    QuerySet.update(), which skip model signals. PostgreSQL only.
+    """
+    reversible = True
+
+    def __init__(self, model_name, columns, config='english'):
+        self.model_name = model_name
+        self.columns = columns
+        self.config = config
+
+    def deconstruct(self):
+        return self.__class__.__name__, [self.model_name, self.columns], {'config': self.config}
+
+    def state_forwards(self, app_label, state):
+        pass
+
+    def names(self, schema_editor, model):
+        quote = schema_editor.quote_name
+        table = model._meta.db_table
+        columns = [model._meta.get_field(name).column for name in self.columns]
+        return quote(table), quote(f'{table}_search_vector'), quote(f'{table}_search_vector_update'), [quote(c) for c in columns]
+
+    def vector_sql(self, columns, row=''):
+        return ' || '.join(
+            f"setweight(to_tsvector('{self.config}', coalesce({row}{column}, '')), '{weight}')"
+            for column, weight in zip(columns, self.columns.values())
+        )
+
+    def database_forwards(self, app_label, schema_editor, from_state, to_state):
+        if schema_editor.connection.vendor != 'postgresql':
+            return
+        model = to_state.apps.get_model(app_label, self.model_name)
+        table, trigger, function, columns = self.names(schema_editor, model)
+        schema_editor.execute(
+            f"CREATE OR REPLACE FUNCTION {function}() RETURNS trigger AS $$ BEGIN "
+            f"NEW.search_vector := {self.vector_sql(columns, 'NEW.')}; RETURN NEW; "
+            f"END $$ LANGUAGE plpgsql"
+        )
+        schema_editor.execute(
+            f"CREATE TRIGGER {trigger} BEFORE INSERT OR UPDATE OF {', '.join(columns)} ON {table} "
+            f"FOR EACH ROW EXECUTE FUNCTION {function}()"
+        )
+        schema_editor.execute(f"UPDATE {table} SET search_vector = {self.vector_sql(columns)}")
+
+    def database_backwards(self, app_label, schema_editor, from_state, to_state):
+        if schema_editor.connection.vendor != 'postgresql':
+            return
+        model = from_state.apps.get_model(app_label, self.model_name)
+        table, trigger, function, _ = self.names(schema_editor, model)
+        schema_editor.execute(f"DROP TRIGGER IF EXISTS {trigger} ON {table}")
+        schema_editor.execute(f"DROP FUNCTION IF EXISTS {function}()")
+
+    def describe(self):
+        return f"Maintain search_vector on {self.model_name} from {', '.join(self.columns)}"
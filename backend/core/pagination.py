@@ -0,0 +1,109 @@
+# core/pagination.py
+import base64
+import binascii
+import json
+from django.conf import settings
+from django.core.exceptions import ValidationError
+from django.db import connection
+from django.db.models import Q
+
+class PaginationError(ValueError):
+    pass
+
+def bounded_int(value, default, maximum, name):
+    """``value`` as an int clamped to ``1..maximum``, or ``default`` when missing."""
+    if not value:
+        return default
+    try:
+        return max(1, min(int(value), maximum))
+    except ValueError:
+        raise PaginationError(f"{name} must be an integer")
+
+class KeysetPaginator:
+    """
+    Keyset pagination over ``ordering``, by default ``(created_at, id)``
+    newest first. The cursor is an opaque token encoding the ordering values
+    of the last row of the previous page, so each page is a single index
+    range scan no matter how deep the client pages. The ordering must end in
+    a unique, non-null column.
+
+    Query params: ``cursor``, ``page_size`` (capped at the setting named by
+    ``max_page_size_setting``) and ``count=true`` for an approximate total.
+    Subclasses name the settings holding their default and maximum page size,
+    and override ``ordering`` to page over other columns.
+    """
+    ordering = ('-created_at', '-id')
+    page_size_setting = None
+    max_page_size_setting = None
+
+    def __init__(self, request):
+        self.cursor = request.query_params.get('cursor')
+        self.include_count = request.query_params.get('count') in ('1', 'true')
+        self.page_size = bounded_int(
+            request.query_params.get('page_size'), getattr(settings, self.page_size_setting),
+            getattr(settings, self.max_page_size_setting), 'page_size',
+        )
+        self.next_cursor = None
+        self.count = None
+
+    @property
+    def cursor_fields(self):
+        return [name.lstrip('-') for name in self.ordering]
+
+    def encode_cursor(self, obj):
+        values = [getattr(obj, name) for name in self.cursor_fields]
+        # isoformat() keeps microseconds, which DjangoJSONEncoder would drop
+        payload = json.dumps(values, default=lambda value: value.isoformat() if hasattr(value, 'isoformat') else str(value))
+        return base64.urlsafe_b64encode(payload.encode()).decode().rstrip('=')
+
+    def decode_cursor(self, cursor, model):
+        """The ordering values encoded in ``cursor``, converted by ``model``'s fields."""
+        try:
+            padded = cursor + '=' * (-len(cursor) % 4)
+            values = json.loads(base64.b64decode(padded, altchars=b'-_', validate=True))
+            if not isinstance(values, list) or len(values) != len(self.cursor_fields) or None in values:
+                raise ValueError
+            return [model._meta.get_field(name).to_python(value) for name, value in zip(self.cursor_fields, values)]
+        except (ValueError, TypeError, binascii.Error, ValidationError):
+            raise PaginationError("Invalid cursor")
+
+    def after_cursor(self, values):
+        """Rows strictly after ``values`` in ``ordering``, as one OR of prefix comparisons."""
+        condition = Q()
+        for i, name in enumerate(self.ordering):
+            lookup = 'lt' if name.startswith('-') else 'gt'
+            equal = {field: value for field, value in zip(self.cursor_fields[:i], values)}
+            condition |= Q(**equal, **{f'{name.lstrip("-")}__{lookup}': values[i]})
+        return condition
+
+    def paginate_queryset(self, queryset):
+        if self.include_count:
+            self.count = self.estimate_count(queryset)
+        queryset = queryset.order_by(*self.ordering)
+        if self.cursor:
+            queryset = queryset.filter(self.after_cursor(self.decode_cursor(self.cursor, queryset.model)))
+        page = list(queryset[:self.page_size + 1])
+        if len(page) > self.page_size:
+            page = page[:self.page_size]
+            self.next_cursor = self.encode_cursor(page[-1])
+        return page
+
+    @staticmethod
+    def estimate_count(queryset):
+        """Planner row estimate on PostgreSQL; an exact count elsewhere."""
+        queryset = queryset.order_by()
+        if connection.vendor == 'postgresql':
+            plan = json.loads(queryset.explain(format='json'))
+            return int(plan[0]['Plan']['Plan Rows'])
+        return queryset.count()
+
+    def get_envelope(self, data, key):
+        envelope = {
+            "status": "success",
+            "results": len(data),
+            "next": self.next_cursor,
+            "data": {key: data},
+        }
+        if self.count is not None:
+            envelope["count"] = self.count
+        return envelope
@@ -0,0 +1,134 @@
+# core/search.py
+import re
+from django.contrib.postgres.search import SearchHeadline, SearchQuery, SearchRank
+from django.db import connection
+from django.db.models import F, FloatField, Q, TextField, Value
+from django.db.models.functions import Concat
+from django.utils.html import escape
+from agency_app.models import Comment, Project
+from committee.models import Committee
+from procurement.models import ProcurementPlan
+from users.utils import hierarchy_owners
+
+# Text search configuration used by the search_vector triggers
+SEARCH_CONFIG = 'english'
+SNIPPET_LENGTH = 200
+# Highlight delimiters PostgreSQL wraps matches in. Control characters can't
+# be mistaken for markup, so the text is escaped before they become <mark>.
+START_SEL, STOP_SEL = '\x02', '\x03'
+FIELD_SEPARATOR = ' \u2014 '
+
+def visible_projects(user):
+    owners = hierarchy_owners(user)
+    return Project.objects.filter(Q(created_by__in=owners) | Q(procurement_plan__owner__in=owners))
+
+def mark(headline):
+    """A PostgreSQL headline as HTML: the text escaped, only the matches wrapped in <mark>."""
+    return escape(headline).replace(START_SEL, '<mark>').replace(STOP_SEL, '</mark>')
+
+def highlight(text, query):
+    """
+    The fallback headline: up to SNIPPET_LENGTH characters of ``text`` around
+    the first case-insensitive match of any word in ``query``, HTML-escaped,
+    with the matches wrapped in <mark>.
+    """
+    words = re.findall(r'\w+', query)
+    if not words:
+        return escape(text[:SNIPPET_LENGTH])
+    pattern = re.compile('|'.join(re.escape(word) for word in words), re.IGNORECASE)
+    first = pattern.search(text)
+    start = max(first.start() - SNIPPET_LENGTH // 4, 0) if first else 0
+    text = text[start:start + SNIPPET_LENGTH]
+    parts, end = [], 0
+    for match in pattern.finditer(text):
+        parts += [escape(text[end:match.start()]), '<mark>', escape(match.group()), '</mark>']
+        end = match.end()
+    parts.append(escape(text[end:]))
+    return ''.join(parts)
+
+class SearchSource:
+    """
+    One searchable model: how to scope it to a user, which field is its
+    title and which fields it is searched on. The headline highlights
+    matches across all of ``fields``, as HTML-safe text with <mark> tags;
+    the fallback (non-PostgreSQL) search matches them with icontains.
+    """
+    def __init__(self, type, scope, title, fields, extra=()):
+        self.type = type
+        self.scope = scope
+        self.title = title
+        self.fields = fields
+        self.extra = extra
+
+    @property
+    def document(self):
+        """``fields`` joined into one text, for the headline."""
+        if len(self.fields) == 1:
+            return F(self.fields[0])
+        parts = [F(self.fields[0])]
+        for field in self.fields[1:]:
+            parts += [Value(FIELD_SEPARATOR), F(field)]
+        return Concat(*parts, output_field=TextField())
+
+    def search(self, user, text, limit):
+        queryset = self.scope(user)
+        postgres = connection.vendor == 'postgresql'
+        if postgres:
+            query = SearchQuery(text, search_type='websearch', config=SEARCH_CONFIG)
+            queryset = queryset.filter(search_vector=query).annotate(
+                rank=SearchRank(F('search_vector'), query),
+                headline=SearchHeadline(
+                    self.document, query, config=SEARCH_CONFIG,
+                    start_sel=START_SEL, stop_sel=STOP_SEL, max_fragments=2,
+                ),
+            )
+        else:
+            match = Q()
+            for field in self.fields:
+                match |= Q(**{f'{field}__icontains': text})
+            queryset = queryset.filter(match).annotate(
+                rank=Value(0.0, output_field=FloatField()), headline=self.document
+            )
+        fields = ['id', 'rank', 'headline', *self.extra]
+        aliases = {} if self.title == 'title' else {'title': F(self.title)}
+        if not aliases:
+            fields.append('title')
+        rows = queryset.order_by('-rank', '-pk').values(*fields, **aliases)
+        hits = []
+        for row in rows[:limit]:
+            headline = row['headline'] or ''
+            row['headline'] = mark(headline) if postgres else highlight(headline, text)
+            hits.append({'type': self.type, **row})
+        return hits
+
+SOURCES = {
+    'project': SearchSource(
+        'project', visible_projects, 'title', ['title', 'one_line_description', 'description'],
+    ),
+    'comment': SearchSource(
+        'comment', lambda user: Comment.objects.filter(project__in=visible_projects(user).values('pk')),
+        'project__title', ['content'], extra=['project_id'],
+    ),
+    'committee': SearchSource(
+        'committee', lambda user: Committee.objects.visible_to(user), 'name', ['name', 'purpose'],
+    ),
+    'plan': SearchSource(
+        'plan', lambda user: ProcurementPlan.objects.filter(owner__in=hierarchy_owners(user)),
+        'project_name', ['project_name', 'project_description'],
+    ),
+}
+
+def search(user, text, types=None, limit=20):
+    """
+    Ranked hits for ``text`` across ``types`` (all sources by default), each
+    scoped to what ``user``'s role subtree may see. On PostgreSQL matching,
+    ranking and highlighting run against the stored search_vector columns in
+    one query per source.
+    """
+    if not user.role_id:
+        return []
+    hits = []
+    for type in types or SOURCES:
+        hits.extend(SOURCES[type].search(user, text, limit))
+    hits.sort(key=lambda hit: hit['rank'], reverse=True)
+    return hits[:limit]
@@ -0,0 +1,95 @@
+# core/serializers.py
+from rest_framework import serializers
+from rest_framework.permissions import SAFE_METHODS
+from .metrics import TimedSerializerMixin
+from .models import Notification
+
+def requested_names(request, param):
+    """Comma-separated names from a query parameter, as a set."""
+    if request is None or request.method not in SAFE_METHODS:
+        return set()
+    return {name.strip() for name in request.query_params.get(param, '').split(',') if name.strip()}
+
+class DynamicFieldsMixin(TimedSerializerMixin):
+    """
+    Serializer mixin for sparse fieldsets on reads.
+
+    ``?fields=a,b`` keeps only the named top-level fields and ``?expand=x``
+    swaps in the nested representation declared in ``expandable_fields``
+    (``{'name': {'serializer': cls, 'options': {...}}}``). Names passed to
+    ``expand`` are always kept, so ``?fields=id&expand=committee`` also works
+    for relations that are nested by default. Writes ignore both parameters.
+
+    ``select_related_fields`` and ``prefetch_related_fields`` map a field name
+    to the lookups it needs; ``optimize_queryset`` applies only those of the
+    fields that will be emitted. Expansions carry their own lookups under the
+    same keys and replace the compact field's lookups when requested.
+    """
+    expandable_fields = {}
+    select_related_fields = {}
+    prefetch_related_fields = {}
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        request = self.context.get('request')
+        expand = self.requested_expansions(request)
+        for name in expand:
+            expansion = self.expandable_fields[name]
+            self.fields[name] = expansion['serializer'](**expansion.get('options', {}))
+        fields = requested_names(request, 'fields')
+        if fields:
+            for name in set(self.fields) - fields - requested_names(request, 'expand'):
+                self.fields.pop(name)
+
+    @classmethod
+    def requested_expansions(cls, request):
+        return requested_names(request, 'expand') & set(cls.expandable_fields)
+
+    @classmethod
+    def emitted_fields(cls, request):
+        """Names of the top-level fields the response will contain."""
+        expand = cls.requested_expansions(request)
+        names = set(cls.Meta.fields) | expand
+        fields = requested_names(request, 'fields')
+        return names & (fields | requested_names(request, 'expand')) if fields else names
+
+    @classmethod
+    def optimize_queryset(cls, queryset, request):
+        """Reset the queryset's joins to exactly those the emitted fields need."""
+        emitted = cls.emitted_fields(request)
+        expand = cls.requested_expansions(request)
+        select_related, prefetch_related = [], []
+        for name in emitted:
+            hints = cls.expandable_fields[name] if name in expand else {
+                'select_related': cls.select_related_fields.get(name, []),
+                'prefetch_related': cls.prefetch_related_fields.get(name, []),
+            }
+            select_related.extend(hints.get('select_related', []))
+            prefetch_related.extend(hints.get('prefetch_related', []))
+        queryset = queryset.select_related(None).prefetch_related(None)
+        if select_related:
+            queryset = queryset.select_related(*select_related)
+        if prefetch_related:
+            queryset = queryset.prefetch_related(*prefetch_related)
+        return queryset
+
+class DynamicFieldsQuerysetMixin:
+    """
+    Generic view mixin that trims the queryset's joins to the fields requested
+    from a DynamicFieldsMixin serializer.
+    """
+    def get_queryset(self):
+        queryset = super().get_queryset()
+        serializer_class = self.get_serializer_class()
+        if issubclass(serializer_class, DynamicFieldsMixin):
+            queryset = serializer_class.optimize_queryset(queryset, self.request)
+        return queryset
+
+class NotificationSerializer(TimedSerializerMixin, serializers.ModelSerializer):
+    class Meta:
+        model = Notification
+        fields = ['id', 'category', 'title', 'body', 'link', 'is_read', 'created_at']
+
+class MarkReadSerializer(serializers.Serializer):
+    """Notifications to mark as read; leaving out ``ids`` marks every unread notification as read."""
+    ids = serializers.ListField(child=serializers.IntegerField(), required=False, allow_empty=False)
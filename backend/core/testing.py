@@ -0,0 +1,17 @@
+# core/testing.py
+from django.db import connection
+
+class QueryPlanMixin:
+    """
+    TestCase helpers for checking which index the database chooses for a
+    queryset. Seed representative data, call ``analyze()`` so the planner
+    has fresh statistics, then ``assertUsesIndex``.
+    """
+    @staticmethod
+    def analyze():
+        with connection.cursor() as cursor:
+            cursor.execute('ANALYZE')
+
+    def assertUsesIndex(self, queryset, index_name):
+        plan = queryset.explain()
+        self.assertIn(index_name, plan, f"Expected the plan to use {index_name}:\n{plan}")
@@ -1,3 +1,566 @@
-from django.test import TestCase
+import shutil
+import tempfile
+from datetime import date, timedelta
+from io import StringIO
+from unittest import mock, skipUnless
+from django.core import mail
+from django.core.management import call_command
+from django.core.files.base import ContentFile
+from django.core.files.storage import FileSystemStorage
+from django.db import DatabaseError, connection
+from django.test.utils import CaptureQueriesContext
+from django.http import FileResponse, StreamingHttpResponse
+from django.test import RequestFactory, SimpleTestCase, TestCase, override_settings
+from django.urls import path
+from django.utils import timezone
+from rest_framework import serializers, status
+from rest_framework.response import Response
+from rest_framework.test import APITestCase
+from rest_framework.views import APIView
+from agency_app.models import Comment, Project
+from bidding.models import Bid
+from committee.models import Committee, CommitteeMembership
+from contract.models import Contract
+from evaluation.models import Evaluation
+from procurement.models import ProcurementPlan
+from tender.models import Tender
+from users.models import CustomUser, RoleHierarchy
+from . import views
+from .files import serve_file
+from .mail import enqueue_mail, send_pending
+from .metrics import TimedSerializerMixin, registry
+from .models import Notification, NotificationCounter, OutboundEmail
+from .notifications import broadcast, process_broadcasts, unread_count
+from .testing import QueryPlanMixin
 
-# Create your tests here.
+class ServeFileTest(SimpleTestCase):
+    """
+    Test that serve_file streams, honours conditional and range requests, and hands off to nginx.
+    """
+    body = bytes(range(256)) * 1024
+
+    def setUp(self):
+        self.root = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, self.root)
+        self.storage = FileSystemStorage(location=self.root)
+        self.name = self.storage.save('letters/letter.pdf', ContentFile(self.body))
+        self.factory = RequestFactory()
+
+    def serve(self, **headers):
+        return serve_file(self.factory.get('/', headers=headers), self.storage, self.name, as_attachment=True)
+
+    def content(self, response):
+        return b''.join(response.streaming_content)
+
+    def test_full_file_is_streamed(self):
+        response = self.serve()
+        self.assertIsInstance(response, FileResponse)
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response['Content-Length'], str(len(self.body)))
+        self.assertEqual(response['Content-Type'], 'application/pdf')
+        self.assertEqual(response['Accept-Ranges'], 'bytes')
+        self.assertIn('attachment; filename="letter.pdf"', response['Content-Disposition'])
+        self.assertEqual(self.content(response), self.body)
+
+    def test_matching_etag_is_not_modified(self):
+        etag = self.serve()['ETag']
+        response = self.serve(if_none_match=etag)
+        self.assertEqual(response.status_code, 304)
+        self.assertEqual(response['ETag'], etag)
+
+    def test_unchanged_since_is_not_modified(self):
+        last_modified = self.serve()['Last-Modified']
+        self.assertEqual(self.serve(if_modified_since=last_modified).status_code, 304)
+
+    def test_byte_range(self):
+        response = self.serve(range='bytes=100-1123')
+        self.assertIsInstance(response, StreamingHttpResponse)
+        self.assertEqual(response.status_code, 206)
+        self.assertEqual(response['Content-Range'], f'bytes 100-1123/{len(self.body)}')
+        self.assertEqual(response['Content-Length'], '1024')
+        self.assertEqual(self.content(response), self.body[100:1124])
+
+    def test_range_file_is_closed_with_the_response(self):
+        handles = []
+        def storage_open(name, mode):
+            handles.append(FileSystemStorage.open(self.storage, name, mode))
+            return handles[-1]
+        with mock.patch.object(self.storage, 'open', side_effect=storage_open):
+            # Discarded before iteration: never opened
+            self.serve(range='bytes=0-9').close()
+            self.assertEqual(handles, [])
+            response = self.serve(range='bytes=0-9999')
+            next(iter(response.streaming_content))
+            response.close()
+        self.assertEqual(len(handles), 1)
+        self.assertTrue(handles[0].closed)
+
+    def test_open_and_suffix_ranges(self):
+        self.assertEqual(self.content(self.serve(range=f'bytes={len(self.body) - 10}-')), self.body[-10:])
+        self.assertEqual(self.content(self.serve(range='bytes=-20')), self.body[-20:])
+
+    def test_unsatisfiable_range(self):
+        response = self.serve(range=f'bytes={len(self.body)}-')
+        self.assertEqual(response.status_code, 416)
+        self.assertEqual(response['Content-Range'], f'bytes */{len(self.body)}')
+
+    def test_stale_if_range_serves_whole_file(self):
+        response = self.serve(range='bytes=0-9', if_range='"stale"')
+        self.assertEqual(response.status_code, 200)
+        etag = response['ETag']
+        self.assertEqual(self.serve(range='bytes=0-9', if_range=etag).status_code, 206)
+
+    @override_settings(FILE_ACCEL_REDIRECT_PREFIX='/protected-media/')
+    def test_accel_redirect_hands_off_body(self):
+        response = self.serve()
+        self.assertEqual(response['X-Accel-Redirect'], '/protected-media/letters/letter.pdf')
+        self.assertEqual(response.content, b'')
+        self.assertIn('ETag', response)
+
+    def test_missing_file_raises(self):
+        with self.assertRaises(FileNotFoundError):
+            serve_file(self.factory.get('/'), self.storage, 'letters/missing.pdf')
+
+class UserNameSerializer(TimedSerializerMixin, serializers.ModelSerializer):
+    class Meta:
+        model = CustomUser
+        fields = ['employee_id', 'name']
+
+class UserNamesView(APIView):
+    authentication_classes = []
+    permission_classes = []
+
+    def get(self, request):
+        return Response(UserNameSerializer(CustomUser.objects.all(), many=True).data)
+
+urlpatterns = [
+    path('names/', UserNamesView.as_view(), name='user-names'),
+    path('api/metrics', views.metrics, name='metrics'),
+]
+
+@override_settings(ROOT_URLCONF='core.tests', REQUEST_METRICS_ENABLED=True, REQUEST_METRICS_TOKEN='scrape-secret')
+class RequestMetricsTest(TestCase):
+    """
+    Test that the metrics middleware records queries and timings per URL name.
+    """
+    def setUp(self):
+        registry.reset()
+        self.addCleanup(registry.reset)
+
+    def metric(self, text, line_start):
+        return [line for line in text.splitlines() if line.startswith(line_start)]
+
+    def test_queries_and_timings_are_recorded_per_view(self):
+        response = self.client.get('/names/')
+        self.assertEqual(response.status_code, 200)
+        timing = response['Server-Timing']
+        self.assertIn('db;dur=', timing)
+        self.assertIn('desc="1 queries"', timing)
+        self.assertIn('render;dur=', timing)
+        self.assertIn('total;dur=', timing)
+        self.client.get('/names/')
+        self.client.get('/missing/')
+
+        text = self.client.get('/api/metrics', headers={'Authorization': 'Bearer scrape-secret'}).content.decode()
+        self.assertEqual(
+            self.metric(text, 'http_requests_total{view="user-names"'),
+            ['http_requests_total{view="user-names",method="GET",status="200"} 2'],
+        )
+        self.assertEqual(
+            self.metric(text, 'http_request_db_queries_total{view="user-names"'),
+            ['http_request_db_queries_total{view="user-names",method="GET"} 2'],
+        )
+        self.assertIn('http_request_duration_seconds_count{view="user-names",method="GET"} 2', text)
+        self.assertIn('http_request_duration_seconds_bucket{view="user-names",method="GET",le="+Inf"} 2', text)
+        self.assertTrue(self.metric(text, 'http_request_render_seconds_total{view="user-names"'))
+        self.assertIn('http_requests_total{view="<unresolved>",method="GET",status="404"} 1', text)
+
+    def test_serializer_time_is_recorded(self):
+        for i in range(20):
+            CustomUser.objects.create_user(employee_id=f'E{i:03}', email=f'e{i}@ntc.net.np', password='Nepal@123')
+        response = self.client.get('/names/')
+        self.assertEqual(len(response.json()), 20)
+        self.assertRegex(response['Server-Timing'], r'serialize;dur=\d')
+        text = self.client.get('/api/metrics', headers={'Authorization': 'Bearer scrape-secret'}).content.decode()
+        [sample] = self.metric(text, 'http_request_serializer_seconds_total{view="user-names"')
+        self.assertGreater(float(sample.rsplit(' ', 1)[1]), 0)
+
+    def test_metrics_require_token(self):
+        self.assertEqual(self.client.get('/api/metrics').status_code, 401)
+        self.assertEqual(self.client.get('/api/metrics', headers={'Authorization': 'Bearer wrong'}).status_code, 401)
+        response = self.client.get('/api/metrics', headers={'Authorization': 'Bearer scrape-secret'})
+        self.assertEqual(response.status_code, 200)
+        self.assertTrue(response['Content-Type'].startswith('text/plain; version=0.0.4'))
+
+    @override_settings(REQUEST_METRICS_TOKEN='')
+    def test_without_token_only_staff_can_read_metrics(self):
+        self.assertEqual(self.client.get('/api/metrics').status_code, 401)
+        user = CustomUser.objects.create_user(employee_id='1001', email='md@ntc.net.np', password='Nepal@123')
+        self.client.force_login(user)
+        self.assertEqual(self.client.get('/api/metrics').status_code, 401)
+        CustomUser.objects.filter(pk=user.pk).update(is_staff=True)
+        self.assertEqual(self.client.get('/api/metrics').status_code, 200)
+
+    @override_settings(REQUEST_METRICS_ENABLED=False)
+    def test_disabled_metrics_leave_requests_alone(self):
+        response = self.client.get('/names/')
+        self.assertNotIn('Server-Timing', response)
+        self.assertEqual(self.client.get('/api/metrics').status_code, 404)
+        self.assertEqual(registry.endpoints, {})
+
+class IndexUsageTest(QueryPlanMixin, TestCase):
+    """
+    Test that the planner picks the hot-path indexes on a seeded dataset.
+    """
+    @classmethod
+    def setUpTestData(cls):
+        now = timezone.now()
+        cls.users = CustomUser.objects.bulk_create([
+            CustomUser(employee_id=f'E{i:04}', username=f'E{i:04}', email=f'e{i}@ntc.net.np', _id=f'u{i}')
+            for i in range(50)
+        ])
+        plans = ProcurementPlan.objects.bulk_create([
+            ProcurementPlan(
+                policy_number=f'P-{i}', department='Wireline', dept_index=str(i), project_name=f'Project {i}',
+                project_description='Seeded', estimated_cost=1000, budget=900, owner=cls.users[i % 50]
+            )
+            for i in range(400)
+        ])
+        tenders = Tender.objects.bulk_create([
+            Tender(procurement_plan=plan, title=f'Tender {i}', description='Seeded', publication_date=now, closing_date=now)
+            for i, plan in enumerate(plans)
+        ])
+        bids = Bid.objects.bulk_create([
+            Bid(tender=tender, bidder=cls.users[j], bid_amount=100 + j) for tender in tenders for j in range(3)
+        ])
+        committees = Committee.objects.bulk_create([
+            Committee(
+                name=f'Committee {i}', purpose='Seeded', committee_type='evaluation',
+                formation_date=date(2020, 1, 1) + timedelta(days=i), created_by=cls.users[i % 5]
+            )
+            for i in range(1000)
+        ])
+        CommitteeMembership.objects.bulk_create([
+            CommitteeMembership(committee=committee, user=cls.users[(i + j) % 50])
+            for i, committee in enumerate(committees) for j in range(3)
+        ])
+        evaluations = Evaluation.objects.bulk_create([
+            Evaluation(bid=bid, committee=committees[i % 1000], score=50, comments='Seeded') for i, bid in enumerate(bids[:600])
+        ])
+        contracts = Contract.objects.bulk_create([Contract(bid=bid, contract_amount=100) for bid in bids[:600]])
+        projects = Project.objects.bulk_create([
+            Project(
+                title=f'Road project {i}', one_line_description='Seeded', description='Seeded', program='Seeded',
+                start_date=date(2024, 1, 1), deadline_date=date(2025, 1, 1), identification_no=str(i),
+                selected_contractor='Seeded', status='approved' if i % 20 == 0 else 'pending'
+            )
+            for i in range(600)
+        ])
+        comments = Comment.objects.bulk_create([
+            Comment(project=projects[i % 600], author='Seeded', content='Seeded') for i in range(2400)
+        ])
+
+        # auto_now_add fields are set on insert; spread them out for realistic range statistics
+        for model, objects, field in (
+            (ProcurementPlan, plans, 'created_at'), (Bid, bids, 'submission_date'),
+            (Evaluation, evaluations, 'evaluation_date'), (Contract, contracts, 'award_date'),
+            (Project, projects, 'created_at'), (Comment, comments, 'created_at'),
+        ):
+            for i, obj in enumerate(objects):
+                setattr(obj, field, now - timedelta(hours=i))
+            model.objects.bulk_update(objects, [field], batch_size=500)
+        cls.plan, cls.tender, cls.project = plans[0], tenders[0], projects[0]
+        cls.analyze()
+
+    def test_committee_formation_range_by_creator(self):
+        self.assertUsesIndex(
+            Committee.objects.filter(formation_date__range=(date(2020, 2, 1), date(2020, 2, 10)), created_by=self.users[0]),
+            'committee_formed_creator_idx',
+        )
+
+    def test_memberships_by_user(self):
+        self.assertUsesIndex(
+            CommitteeMembership.objects.filter(user=self.users[0]).values('committee_id'),
+            'membership_user_committee_idx',
+        )
+
+    def test_plans_by_owner_newest_first(self):
+        self.assertUsesIndex(
+            ProcurementPlan.objects.filter(owner=self.users[0]).order_by('-created_at'), 'plan_owner_created_idx'
+        )
+
+    def test_bids_for_tender_by_submission(self):
+        self.assertUsesIndex(Bid.objects.filter(tender=self.tender).order_by('-submission_date'), 'bid_tender_submitted_idx')
+
+    def test_recent_evaluations_and_contracts(self):
+        since = timezone.now() - timedelta(hours=12)
+        self.assertUsesIndex(Evaluation.objects.filter(evaluation_date__gte=since), 'evaluation_date_idx')
+        self.assertUsesIndex(Contract.objects.filter(award_date__gte=since), 'contract_award_date_idx')
+
+    def test_project_comments_in_order(self):
+        self.assertUsesIndex(Comment.objects.filter(project=self.project).order_by('created_at'), 'comment_project_created_idx')
+
+    def test_projects_by_status_newest_first(self):
+        self.assertUsesIndex(
+            Project.objects.filter(status='approved').order_by('-created_at'), 'project_status_created_idx'
+        )
+
+    @skipUnless(connection.vendor == 'postgresql', 'Trigram indexes need PostgreSQL with pg_trgm')
+    def test_project_title_search(self):
+        self.assertUsesIndex(Project.objects.filter(title__icontains='project 42'), 'project_title_trgm_idx')
+
+class SearchTest(APITestCase):
+    """
+    Test that search covers every source and only returns what the user's role subtree may see.
+    """
+    url = '/api/search/'
+
+    def setUp(self):
+        superadmin_role = RoleHierarchy.objects.create(role_name='SUPERADMIN')
+        md_role = RoleHierarchy.objects.create(role_name='MD', parent=superadmin_role)
+        director_role = RoleHierarchy.objects.create(role_name='DIRECTOR', parent=md_role)
+        self.md = CustomUser.objects.create_user(employee_id='1001', email='md@ntc.net.np', password='Nepal@123', role=md_role)
+        self.director = CustomUser.objects.create_user(
+            employee_id='2001', email='director@ntc.net.np', password='Nepal@123', role=director_role
+        )
+        plan = ProcurementPlan.objects.create(
+            policy_number='P-1', department='Wireline', dept_index='1', project_name='Fiber backbone upgrade',
+            project_description='Replace aging fiber links', estimated_cost=1000, budget=900, owner=self.md
+        )
+        self.project = Project.objects.create(
+            title='Fiber rollout', one_line_description='Rural fiber', description='Lay fiber to rural exchanges',
+            program='Broadband', start_date=date(2025, 1, 1), deadline_date=date(2025, 12, 31),
+            identification_no='FR-1', selected_contractor='Acme', created_by=self.director
+        )
+        Comment.objects.create(project=self.project, author='Director', content='Fiber survey done', user=self.director)
+        Committee.objects.create(
+            name='Fiber evaluation', purpose='Evaluate fiber bids', committee_type='evaluation', created_by=self.director
+        )
+        self.plan = plan
+
+    def hits(self, user, **params):
+        self.client.force_authenticate(user=user)
+        response = self.client.get(self.url, {'q': 'fiber', **params})
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        return response.data['data']['hits']
+
+    def test_hits_are_scoped_to_role_subtree(self):
+        self.assertEqual(
+            sorted(hit['type'] for hit in self.hits(self.md)), ['comment', 'committee', 'plan', 'project']
+        )
+        self.assertEqual(sorted(hit['type'] for hit in self.hits(self.director)), ['comment', 'committee', 'project'])
+
+    def test_hit_shape(self):
+        comment = self.hits(self.director, types='comment')[0]
+        self.assertEqual(comment['title'], 'Fiber rollout')
+        self.assertEqual(comment['project_id'], self.project.pk)
+        plan = self.hits(self.md, types='plan')[0]
+        self.assertEqual((plan['id'], plan['title']), (self.plan.pk, 'Fiber backbone upgrade'))
+        self.assertIn('fiber', plan['headline'])
+
+    def test_headlines_are_escaped(self):
+        Comment.objects.create(
+            project=self.project, author='Director', content='<script>alert(1)</script> fiber & copper', user=self.director
+        )
+        headlines = [hit['headline'] for hit in self.hits(self.director, types='comment')]
+        self.assertTrue(any('&lt;script&gt;' in headline for headline in headlines))
+        for headline in headlines:
+            self.assertNotIn('<script>', headline)
+            self.assertIn('<mark>', headline)
+
+    def test_project_title_is_highlighted(self):
+        Project.objects.filter(pk=self.project.pk).update(description='Lay cable to rural exchanges')
+        hit = self.hits(self.director, types='project')[0]
+        self.assertIn('<mark>Fiber</mark> rollout', hit['headline'])
+
+    def test_limit(self):
+        self.assertEqual(len(self.hits(self.md, limit=2)), 2)
+
+    def test_invalid_parameters(self):
+        self.client.force_authenticate(user=self.md)
+        self.assertEqual(self.client.get(self.url).status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertEqual(self.client.get(self.url, {'q': 'fiber', 'types': 'tender'}).status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertEqual(self.client.get(self.url, {'q': 'fiber', 'limit': 'ten'}).status_code, status.HTTP_400_BAD_REQUEST)
+
+    @skipUnless(connection.vendor == 'postgresql', 'Full-text search needs PostgreSQL')
+    def test_ranked_and_highlighted(self):
+        hits = self.hits(self.md, types='project,plan')
+        self.assertEqual(hits[0]['type'], 'project')
+        self.assertGreaterEqual(hits[0]['rank'], hits[-1]['rank'])
+        self.assertIn('<mark>', hits[0]['headline'])
+
+@override_settings(
+    EMAIL_BACKEND='django.core.mail.backends.locmem.EmailBackend',
+    OUTBOX_MAX_ATTEMPTS=3, OUTBOX_RETRY_BASE_DELAY=60, OUTBOX_RETRY_MAX_DELAY=3600,
+)
+class OutboxTest(APITestCase):
+    """
+    Test that mail is queued on the request path and delivered by the worker
+    in batches over one connection, with backoff and a retry limit.
+    """
+    def test_forgot_password_queues_instead_of_sending(self):
+        CustomUser.objects.create_user(employee_id='1001', email='md@ntc.net.np', password='Nepal@123')
+        response = self.client.post('/api/users/forgot-password/', {'email': 'MD@ntc.net.np'}, format='json')
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(mail.outbox, [])
+        queued = OutboundEmail.objects.get()
+        self.assertEqual(queued.recipients, ['MD@ntc.net.np'])
+        self.assertIn(CustomUser.objects.get().reset_token, queued.body)
+
+    def test_batch_shares_one_connection(self):
+        for i in range(5):
+            enqueue_mail(f'Subject {i}', 'Body', [f'user{i}@ntc.net.np'])
+        with mock.patch('core.mail.get_connection', wraps=mail.get_connection) as get_connection:
+            self.assertEqual(send_pending(batch_size=3), (3, 0))
+            self.assertEqual(send_pending(batch_size=3), (2, 0))
+            self.assertEqual(send_pending(batch_size=3), (0, 0))
+        self.assertEqual(get_connection.call_count, 2)
+        self.assertEqual(len(mail.outbox), 5)
+        self.assertFalse(OutboundEmail.objects.exclude(status=OutboundEmail.SENT).exists())
+
+    def test_failures_back_off_then_give_up(self):
+        message = enqueue_mail('Subject', 'Body', ['md@ntc.net.np'])
+        with mock.patch('core.mail.EmailMessage.send', side_effect=ConnectionError('refused')):
+            self.assertEqual(send_pending(), (0, 1))
+            message.refresh_from_db()
+            self.assertEqual((message.status, message.attempts, message.last_error), ('pending', 1, 'refused'))
+            self.assertGreater(message.next_attempt_at, timezone.now() + timedelta(seconds=50))
+            # Not due yet
+            self.assertEqual(send_pending(), (0, 0))
+            OutboundEmail.objects.update(next_attempt_at=timezone.now())
+            send_pending()
+            message.refresh_from_db()
+            self.assertGreater(message.next_attempt_at, timezone.now() + timedelta(seconds=110))
+            OutboundEmail.objects.update(next_attempt_at=timezone.now())
+            send_pending()
+        message.refresh_from_db()
+        self.assertEqual((message.status, message.attempts), ('failed', 3))
+        self.assertEqual(send_pending(), (0, 0))
+        self.assertEqual(mail.outbox, [])
+
+    def test_connection_failure_leaves_queue_untouched(self):
+        message = enqueue_mail('Subject', 'Body', ['md@ntc.net.np'])
+        due = message.next_attempt_at
+        with mock.patch('core.mail.get_connection', side_effect=ConnectionError('refused')):
+            self.assertEqual(send_pending(), (0, 0))
+        message.refresh_from_db()
+        self.assertEqual((message.status, message.attempts, message.next_attempt_at), ('pending', 0, due))
+
+    def test_each_message_is_saved_as_it_is_sent(self):
+        first = enqueue_mail('First', 'Body', ['a@ntc.net.np'])
+        second = enqueue_mail('Second', 'Body', ['b@ntc.net.np'])
+        save = OutboundEmail.save
+        def fail_on_second(message, *args, **kwargs):
+            if message.pk == second.pk:
+                raise DatabaseError('lost connection')
+            return save(message, *args, **kwargs)
+        with mock.patch.object(OutboundEmail, 'save', fail_on_second), self.assertRaises(DatabaseError):
+            send_pending()
+        first.refresh_from_db()
+        second.refresh_from_db()
+        self.assertEqual(first.status, 'sent')
+        # Still claimed, so it is retried only once the claim lapses
+        self.assertEqual((second.status, second.attempts), ('pending', 0))
+        self.assertGreater(second.next_attempt_at, timezone.now() + timedelta(seconds=250))
+
+    def test_send_outbox_command_drains_queue(self):
+        for i in range(4):
+            enqueue_mail(f'Subject {i}', 'Body', [f'user{i}@ntc.net.np'])
+        out = StringIO()
+        call_command('send_outbox', '--once', '--batch-size', '3', stdout=out)
+        self.assertIn('4 sent, 0 failed', out.getvalue())
+        self.assertEqual(sorted(m.subject for m in mail.outbox), [f'Subject {i}' for i in range(4)])
+
+class NotificationTest(APITestCase):
+    """
+    Test that broadcasts fan out in bulk, keep the unread counters in step
+    and are served through the inbox endpoints.
+    """
+    def setUp(self):
+        self.users = [
+            CustomUser.objects.create_user(employee_id=f'E{i:03}', email=f'e{i}@ntc.net.np', password='Nepal@123')
+            for i in range(10)
+        ]
+        self.user = self.users[0]
+        self.client.force_authenticate(user=self.user)
+
+    def test_fan_out_cost_is_independent_of_audience(self):
+        def queries(recipients):
+            broadcast(recipients, 'Title', send_email=True)
+            with CaptureQueriesContext(connection) as ctx:
+                process_broadcasts()
+            return len(ctx.captured_queries)
+        self.assertEqual(queries(['E000']), queries([user.pk for user in self.users]))
+        self.assertEqual(Notification.objects.count(), 11)
+        self.assertEqual(OutboundEmail.objects.count(), 11)
+        self.assertEqual(unread_count(self.user), 2)
+        self.assertEqual(unread_count(self.users[1]), 1)
+
+    def test_inactive_and_missing_recipients_are_skipped(self):
+        CustomUser.objects.filter(pk='E001').update(is_active=False)
+        broadcast(['E000', 'E001', 'E999'], 'Title')
+        self.assertEqual(process_broadcasts(), (1, 1))
+        self.assertEqual(process_broadcasts(), (0, 0))
+        self.assertEqual(list(Notification.objects.values_list('recipient_id', flat=True)), ['E000'])
+
+    def test_failing_broadcast_is_rolled_back_and_skipped(self):
+        broadcast(['E000'], 'First')
+        bad = broadcast(['E001'], 'Bad', send_email=True)
+        broadcast(['E002'], 'Last')
+        with mock.patch('core.notifications.enqueue_mass_mail', side_effect=DatabaseError('outbox full')):
+            self.assertEqual(process_broadcasts(), (3, 2))
+        bad.refresh_from_db()
+        self.assertIsNone(bad.processed_at)
+        self.assertEqual(bad.last_error, 'outbox full')
+        self.assertEqual(sorted(Notification.objects.values_list('title', flat=True)), ['First', 'Last'])
+        self.assertEqual(unread_count(self.users[1]), 0)
+        self.assertEqual(process_broadcasts(), (0, 0))
+
+    def test_unread_count_is_read_from_the_counter(self):
+        NotificationCounter.objects.create(user=self.user, unread=7)
+        with CaptureQueriesContext(connection) as ctx:
+            response = self.client.get('/api/notifications/unread-count/')
+        self.assertEqual(response.data['data'], {'unread': 7})
+        self.assertFalse([q for q in ctx.captured_queries if 'core_notification"' in q['sql']])
+
+    def test_inbox_is_paginated_newest_first(self):
+        for i in range(5):
+            broadcast([self.user.pk, 'E001'], f'Title {i}')
+            process_broadcasts()
+        response = self.client.get('/api/notifications/', {'page_size': 3})
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual([n['title'] for n in response.data['data']['notifications']], ['Title 4', 'Title 3', 'Title 2'])
+        response = self.client.get('/api/notifications/', {'page_size': 3, 'cursor': response.data['next']})
+        self.assertEqual([n['title'] for n in response.data['data']['notifications']], ['Title 1', 'Title 0'])
+        self.assertIsNone(response.data['next'])
+        self.assertEqual(self.client.get('/api/notifications/', {'cursor': 'bogus'}).status_code, status.HTTP_400_BAD_REQUEST)
+
+    def test_mark_read_updates_counter(self):
+        for i in range(3):
+            broadcast([self.user.pk], f'Title {i}')
+        process_broadcasts()
+        first = Notification.objects.filter(recipient=self.user).order_by('id').first()
+        response = self.client.post('/api/notifications/read/', {'ids': [first.pk, first.pk]}, format='json')
+        self.assertEqual(response.data['data'], {'marked': 1, 'unread': 2})
+        # Marking again is a no-op
+        response = self.client.post('/api/notifications/read/', {'ids': [first.pk]}, format='json')
+        self.assertEqual(response.data['data'], {'marked': 0, 'unread': 2})
+        self.assertEqual(len(self.client.get('/api/notifications/', {'unread': 'true'}).data['data']['notifications']), 2)
+        response = self.client.post('/api/notifications/read/', {}, format='json')
+        self.assertEqual(response.data['data'], {'marked': 2, 'unread': 0})
+
+    def test_other_users_notifications_are_not_touched(self):
+        broadcast(['E001'], 'Title')
+        process_broadcasts()
+        other = Notification.objects.get()
+        response = self.client.post('/api/notifications/read/', {'ids': [other.pk]}, format='json')
+        self.assertEqual(response.data['data'], {'marked': 0, 'unread': 0})
+        self.assertEqual(self.client.get('/api/notifications/').data['data']['notifications'], [])
+        self.assertEqual(unread_count(self.users[1]), 1)
+
+    def test_fanout_command_drains_queue(self):
+        broadcast(['E000', 'E001'], 'Title')
+        broadcast(['E002'], 'Title')
+        out = StringIO()
+        call_command('fanout_notifications', '--once', stdout=out)
+        self.assertIn('2 broadcasts, 3 notifications', out.getvalue())
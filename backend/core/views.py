@@ -2,12 +2,106 @@
 from rest_framework.views import APIView
 from rest_framework.response import Response
 from rest_framework import status
-from django.http import HttpRequest
-from rest_framework.permissions import AllowAny
+from django.conf import settings
+from django.core.exceptions import SuspiciousFileOperation
+from django.core.files.storage import default_storage
+from django.http import Http404, HttpRequest, HttpResponse
+from django.utils.crypto import constant_time_compare
+from rest_framework.permissions import AllowAny, IsAuthenticated
+from .files import serve_file
+from .metrics import registry
+from .models import Notification
+from .pagination import KeysetPaginator, PaginationError
+from .notifications import mark_read, unread_count
+from .search import SOURCES, search
+from .serializers import MarkReadSerializer, NotificationSerializer
 
 class PortView(APIView):
     permission_classes = [AllowAny]
 
     def get(self, request: HttpRequest):
         port = request.META.get('SERVER_PORT', '8000')
-        return Response({'port': port}, status=status.HTTP_200_OK)
\ No newline at end of file
+        return Response({'port': port}, status=status.HTTP_200_OK)
+
+class SearchView(APIView):
+    """Ranked, highlighted search over projects, comments, committees and procurement plans."""
+    permission_classes = [IsAuthenticated]
+    max_limit = 100
+
+    def get(self, request):
+        text = request.query_params.get('q', '').strip()
+        if not text:
+            return Response({"status": "error", "message": "q is required"}, status=status.HTTP_400_BAD_REQUEST)
+        types = [t.strip() for t in request.query_params.get('types', '').split(',') if t.strip()]
+        unknown = [t for t in types if t not in SOURCES]
+        if unknown:
+            return Response(
+                {"status": "error", "message": f"Unknown types: {', '.join(unknown)}. Must be among {list(SOURCES)}"},
+                status=status.HTTP_400_BAD_REQUEST
+            )
+        try:
+            limit = min(max(int(request.query_params.get('limit', 20)), 1), self.max_limit)
+        except ValueError:
+            return Response({"status": "error", "message": "limit must be an integer"}, status=status.HTTP_400_BAD_REQUEST)
+
+        hits = search(request.user, text, types, limit)
+        return Response({"status": "success", "results": len(hits), "data": {"hits": hits}}, status=status.HTTP_200_OK)
+
+class NotificationPaginator(KeysetPaginator):
+    page_size_setting = 'NOTIFICATION_PAGE_SIZE'
+    max_page_size_setting = 'NOTIFICATION_MAX_PAGE_SIZE'
+
+class NotificationInboxView(APIView):
+    """The user's notifications, newest first, keyset-paginated; ``?unread=true`` for unread only."""
+    permission_classes = [IsAuthenticated]
+
+    def get(self, request):
+        notifications = Notification.objects.filter(recipient=request.user)
+        if request.query_params.get('unread') in ('1', 'true'):
+            notifications = notifications.filter(is_read=False)
+        try:
+            paginator = NotificationPaginator(request)
+            page = paginator.paginate_queryset(notifications)
+        except PaginationError as e:
+            return Response({"status": "error", "message": str(e)}, status=status.HTTP_400_BAD_REQUEST)
+        data = NotificationSerializer(page, many=True).data
+        return Response(paginator.get_envelope(data, "notifications"), status=status.HTTP_200_OK)
+
+class NotificationUnreadCountView(APIView):
+    """Unread notification count, read from the denormalized counter."""
+    permission_classes = [IsAuthenticated]
+
+    def get(self, request):
+        return Response({"status": "success", "data": {"unread": unread_count(request.user)}}, status=status.HTTP_200_OK)
+
+class NotificationMarkReadView(APIView):
+    """Mark ``{"ids": [...]}``, or every unread notification when ids is omitted, as read."""
+    permission_classes = [IsAuthenticated]
+
+    def post(self, request):
+        serializer = MarkReadSerializer(data=request.data)
+        if not serializer.is_valid():
+            return Response({"status": "error", "message": serializer.errors}, status=status.HTTP_400_BAD_REQUEST)
+        marked, unread = mark_read(request.user, serializer.validated_data.get('ids'))
+        return Response({"status": "success", "data": {"marked": marked, "unread": unread}}, status=status.HTTP_200_OK)
+
+def serve_media(request, path):
+    """Development replacement for static() that streams with Range/ETag support."""
+    try:
+        return serve_file(request, default_storage, path)
+    except (OSError, SuspiciousFileOperation):
+        raise Http404("File not found")
+
+def metrics(request):
+    """
+    Request metrics in the Prometheus text format, for scrapers sending
+    REQUEST_METRICS_TOKEN as a Bearer token or logged-in staff; 404 while
+    metrics are disabled.
+    """
+    if not settings.REQUEST_METRICS_ENABLED:
+        raise Http404("Metrics are disabled")
+    token = settings.REQUEST_METRICS_TOKEN
+    scraper = token and constant_time_compare(request.headers.get('Authorization', ''), f'Bearer {token}')
+    if not scraper and not request.user.is_staff:
+        return HttpResponse(status=401)
+    return HttpResponse(registry.render(), content_type='text/plain; version=0.0.4; charset=utf-8')
@@ -0,0 +1,17 @@
+# Generated by Django 5.1.7 on 2026-10-18 01:39
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('evaluation', '0001_initial'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='evaluation',
+            index=models.Index(fields=['evaluation_date'], name='evaluation_date_idx'),
+        ),
+    ]
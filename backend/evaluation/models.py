@@ -10,5 +10,10 @@ class Evaluation(models.Model):
     evaluation_date = models.DateTimeField(auto_now_add=True)
     status = models.CharField(max_length=20, choices=[('approved', 'Approved'), ('rejected', 'Rejected'), ('pending', 'Pending')], default='pending')
 
+    class Meta:
+        indexes = [
+            models.Index(fields=['evaluation_date'], name='evaluation_date_idx'),
+        ]
+
     def __str__(self):
         return f"Evaluation of {self.bid} by {self.committee.name}"
\ No newline at end of file
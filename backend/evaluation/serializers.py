@@ -1,8 +1,29 @@
 from rest_framework import serializers
 from .models import Evaluation
+from django.db.models import Prefetch
+from django.db import transaction
 from procurement.models import ProcurementPlan
+from procurement.serializers import advance_plan_stage
+from procurement.stages import can_enter
+from bidding.serializers import BidSerializer
+from committee.models import Committee
+from committee.serializers import CommitteeSerializer
+from core.serializers import DynamicFieldsMixin
+
+class EvaluationSerializer(DynamicFieldsMixin, serializers.ModelSerializer):
+    expandable_fields = {
+        'bid': {
+            'serializer': BidSerializer,
+            'options': {'read_only': True},
+            'select_related': ['bid'],
+        },
+        'committee': {
+            'serializer': CommitteeSerializer,
+            'options': {'read_only': True},
+            'prefetch_related': [Prefetch('committee', Committee.objects.with_members())],
+        },
+    }
 
-class EvaluationSerializer(serializers.ModelSerializer):
     class Meta:
         model = Evaluation
         fields = ['id', 'bid', 'committee', 'score', 'comments', 'evaluation_date', 'status']
@@ -11,16 +32,14 @@ class EvaluationSerializer(serializers.ModelSerializer):
     def validate(self, data):
         bid = data.get('bid')
         procurement_plan = bid.tender.procurement_plan
-        if procurement_plan.stage != 'bidding':
+        if not can_enter(procurement_plan.stage, 'evaluation'):
             raise serializers.ValidationError("Bidding process must be completed before evaluation.")
         return data
 
     def create(self, validated_data):
-        evaluation = Evaluation.objects.create(**validated_data)
-        # Update the ProcurementPlan stage
-        procurement_plan = validated_data['bid'].tender.procurement_plan
-        procurement_plan.stage = 'evaluation'
-        procurement_plan.save()
+        with transaction.atomic():
+            advance_plan_stage(validated_data['bid'].tender.procurement_plan, 'evaluation')
+            evaluation = Evaluation.objects.create(**validated_data)
         return evaluation
 
     def update(self, instance, validated_data):
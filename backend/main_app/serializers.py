@@ -2,6 +2,7 @@ from rest_framework import serializers
 # from .models import Department
 from users.models import CustomUser
 from users.serializers import UserSerializer
+from core.serializers import TimedSerializerMixin
 
 # class DepartmentSerializer(serializers.ModelSerializer):
 #     class Meta:
@@ -9,7 +10,7 @@ from users.serializers import UserSerializer
 #         fields = '__all__'
 
 from .models import Procurement, ProcurementMember   
-class ProcurementMemberSerializer(serializers.ModelSerializer):
+class ProcurementMemberSerializer(TimedSerializerMixin, serializers.ModelSerializer):
     user = UserSerializer(read_only=True)
     user_id = serializers.PrimaryKeyRelatedField(queryset=CustomUser.objects.all(), write_only=True)
 
@@ -21,7 +22,7 @@ class ProcurementMemberSerializer(serializers.ModelSerializer):
         user = validated_data.pop("user_id")
         return ProcurementMember.objects.create(user=user, **validated_data)
 
-class ProcurementSerializer(serializers.ModelSerializer):
+class ProcurementSerializer(TimedSerializerMixin, serializers.ModelSerializer):
     created_by = UserSerializer(read_only=True)
     members = ProcurementMemberSerializer(many=True, required=False)
 
@@ -0,0 +1,25 @@
+# Generated by Django 5.1.7 on 2026-10-18 01:39
+
+import django.db.models.deletion
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('procurement', '0003_procurementplan_stage'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='procurementplan',
+            index=models.Index(fields=['owner', 'created_at'], name='plan_owner_created_idx'),
+        ),
+        migrations.AlterField(
+            model_name='procurementplan',
+            name='owner',
+            field=models.ForeignKey(db_index=False, on_delete=django.db.models.deletion.CASCADE, to=settings.AUTH_USER_MODEL),
+        ),
+    ]
@@ -0,0 +1,28 @@
+# Generated by Django 5.1.7 on 2026-10-18 02:05
+
+import django.contrib.postgres.indexes
+import django.contrib.postgres.search
+from django.db import migrations
+from core.operations import AddIndexConcurrentlyOnPostgres, CreateSearchVectorTrigger
+
+
+class Migration(migrations.Migration):
+    # The GIN index is built concurrently, after the backfill.
+    atomic = False
+
+    dependencies = [
+        ('procurement', '0004_plan_owner_created_idx'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='procurementplan',
+            name='search_vector',
+            field=django.contrib.postgres.search.SearchVectorField(editable=False, null=True),
+        ),
+        CreateSearchVectorTrigger('procurementplan', {'project_name': 'A', 'project_description': 'B'}),
+        AddIndexConcurrentlyOnPostgres(
+            model_name='procurementplan',
+            index=django.contrib.postgres.indexes.GinIndex(fields=['search_vector'], name='plan_search_vector_idx'),
+        ),
+    ]
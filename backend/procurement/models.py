@@ -1,3 +1,5 @@
+from django.contrib.postgres.indexes import GinIndex
+from django.contrib.postgres.search import SearchVectorField
 from django.db import models
 from users.models import CustomUser
 
@@ -38,10 +40,18 @@ class ProcurementPlan(models.Model):
     project_description = models.TextField()
     estimated_cost = models.DecimalField(max_digits=15, decimal_places=2)
     budget = models.DecimalField(max_digits=15, decimal_places=2)
-    owner = models.ForeignKey(CustomUser, on_delete=models.CASCADE)
+    owner = models.ForeignKey(CustomUser, on_delete=models.CASCADE, db_index=False)  # Indexed by plan_owner_created_idx
     created_at = models.DateTimeField(auto_now_add=True)
     committee = models.ForeignKey('committee.Committee', null=True, blank=True, on_delete=models.SET_NULL)
     stage = models.CharField(max_length=20, choices=STAGE_CHOICES, default='planning')  # Track the current stage
+    # Maintained by a database trigger from project_name and project_description
+    search_vector = SearchVectorField(null=True, editable=False)
+
+    class Meta:
+        indexes = [
+            models.Index(fields=['owner', 'created_at'], name='plan_owner_created_idx'),
+            GinIndex(fields=['search_vector'], name='plan_search_vector_idx'),
+        ]
 
     def proposed_budget_percentage(self):
         if self.estimated_cost > 0:
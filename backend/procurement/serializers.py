@@ -1,24 +1,39 @@
 from rest_framework import serializers
+from django.db.models import Prefetch
 from .models import ProcurementPlan, QuarterlyTarget
+from .stages import StageTransitionError, advance_stage
 from committee.models import Committee
 from committee.serializers import CommitteeSerializer
+from core.serializers import DynamicFieldsMixin
 
-class QuarterlyTargetSerializer(serializers.ModelSerializer):
+def advance_plan_stage(plan, stage):
+    """advance_stage for serializer create(); a refused transition is a validation error."""
+    try:
+        return advance_stage(plan, stage)
+    except StageTransitionError as e:
+        raise serializers.ValidationError(str(e))
+
+class QuarterlyTargetSerializer(DynamicFieldsMixin, serializers.ModelSerializer):
     class Meta:
         model = QuarterlyTarget
         fields = ['id', 'quarter', 'target_details', 'status', 'created_at']
         read_only_fields = ['id', 'created_at']
 
-class ProcurementPlanDropdownSerializer(serializers.ModelSerializer):
+class ProcurementPlanDropdownSerializer(DynamicFieldsMixin, serializers.ModelSerializer):
     class Meta:
         model = ProcurementPlan
         fields = ['id', 'project_name', 'policy_number']
 
-class ProcurementPlanSerializer(serializers.ModelSerializer):
+class ProcurementPlanSerializer(DynamicFieldsMixin, serializers.ModelSerializer):
     quarterly_targets = QuarterlyTargetSerializer(many=True, required=False)
     committee = CommitteeSerializer(read_only=True)
     proposed_budget_percentage = serializers.SerializerMethodField()
 
+    prefetch_related_fields = {
+        'quarterly_targets': ['quarterly_targets'],
+        'committee': [Prefetch('committee', Committee.objects.with_members())],
+    }
+
     class Meta:
         model = ProcurementPlan
         fields = [
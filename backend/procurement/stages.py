@@ -0,0 +1,46 @@
+# procurement/stages.py
+from django.db import transaction
+from .models import ProcurementPlan
+
+# Stage -> stages a plan may advance to from it
+STAGE_TRANSITIONS = {
+    'planning': ('specification',),
+    'specification': ('tender',),
+    'tender': ('committee',),
+    'committee': ('bidding',),
+    'bidding': ('evaluation',),
+    'evaluation': ('contract',),
+    'contract': ('complaint', 'management'),
+    'complaint': ('management',),
+    'management': (),
+}
+# A tender takes many bids and every bid gets evaluated, so entering these
+# stages again is allowed and leaves the plan where it is.
+REPEATABLE_STAGES = {'bidding', 'evaluation'}
+
+class StageTransitionError(ValueError):
+    pass
+
+def can_enter(current, stage):
+    """Whether a plan in ``current`` may move to (or, for repeatable stages, stay in) ``stage``."""
+    if current == stage:
+        return stage in REPEATABLE_STAGES
+    return stage in STAGE_TRANSITIONS.get(current, ())
+
+def advance_stage(plan, stage):
+    """
+    Move ``plan`` to ``stage`` under a row lock, so concurrent requests see
+    each other's transitions and only one of them writes. Only the stage
+    column is updated, and only when it actually changes. Raises
+    StageTransitionError if the plan's locked, current stage does not allow
+    the move. Returns whether the stage changed.
+    """
+    with transaction.atomic():
+        current = ProcurementPlan.objects.select_for_update().values_list('stage', flat=True).get(pk=plan.pk)
+        if not can_enter(current, stage):
+            raise StageTransitionError(f"Procurement plan {plan.pk} cannot move from '{current}' to '{stage}'.")
+        plan.stage = stage
+        if current == stage:
+            return False
+        ProcurementPlan.objects.filter(pk=plan.pk).update(stage=stage)
+        return True
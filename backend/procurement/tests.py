@@ -1,3 +1,235 @@
-from django.test import TestCase
+from datetime import timedelta
+from django.core.cache import cache
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+from django.utils import timezone
+from rest_framework import status
+from rest_framework.test import APITestCase
+from users.models import CustomUser, RoleHierarchy
+from tender.models import Tender
+from committee.models import Committee, CommitteeMembership
+from .models import ProcurementPlan, QuarterlyTarget
+from .stages import StageTransitionError, advance_stage, can_enter
 
-# Create your tests here.
+class HierarchyScopingTest(APITestCase):
+    """
+    Test that pipeline list endpoints scope by role subtree in a constant number of queries.
+    """
+    def build_chain(self, depth):
+        """Create a role chain ``depth`` levels deep with a plan and tender owned at the leaf."""
+        roles = [RoleHierarchy.objects.create(role_name=f'D{depth}-0')]
+        for level in range(1, depth):
+            roles.append(RoleHierarchy.objects.create(role_name=f'D{depth}-{level}', parent=roles[-1]))
+        head = CustomUser.objects.create_user(
+            employee_id=f'H{depth}', email=f'head{depth}@ntc.net.np', password='Nepal@123', role=roles[0]
+        )
+        owner = CustomUser.objects.create_user(
+            employee_id=f'O{depth}', email=f'owner{depth}@ntc.net.np', password='Nepal@123', role=roles[-1]
+        )
+        plan = ProcurementPlan.objects.create(
+            policy_number=f'PP-2081-WL-N-{depth:02}', department='Wireline', project_name=f'Plan {depth}',
+            project_description='Fibre rollout', estimated_cost=1000, budget=900, owner=owner
+        )
+        Tender.objects.create(
+            procurement_plan=plan, title=f'Tender {depth}', description='Fibre rollout',
+            publication_date=timezone.now(), closing_date=timezone.now() + timedelta(days=30)
+        )
+        return head
+
+    def count_queries(self, user, url):
+        self.client.force_authenticate(user=user)
+        with CaptureQueriesContext(connection) as ctx:
+            response = self.client.get(url)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(len(response.data), 1)
+        return len(ctx.captured_queries)
+
+    def test_list_query_count_independent_of_depth(self):
+        shallow, deep = self.build_chain(2), self.build_chain(12)
+        for url in ['/api/procurement/plans/', '/tender/tenders/']:
+            self.assertEqual(self.count_queries(shallow, url), self.count_queries(deep, url), url)
+
+    def test_tender_list_is_single_statement(self):
+        deep = self.build_chain(12)
+        self.assertEqual(self.count_queries(deep, '/tender/tenders/'), 1)
+
+    def test_other_branches_are_hidden(self):
+        head = self.build_chain(3)
+        self.build_chain(4)
+        self.client.force_authenticate(user=head)
+        response = self.client.get('/api/procurement/plans/')
+        self.assertEqual([plan['project_name'] for plan in response.data], ['Plan 3'])
+
+    def test_user_without_role_is_refused(self):
+        user = CustomUser.objects.create_user(employee_id='N1', email='norole@ntc.net.np', password='Nepal@123')
+        self.client.force_authenticate(user=user)
+        response = self.client.get('/api/procurement/plans/')
+        self.assertEqual(response.status_code, status.HTTP_403_FORBIDDEN)
+
+class DynamicFieldsTest(APITestCase):
+    """
+    Test that ?fields= and ?expand= shape responses and trim the joins behind them.
+    """
+    def setUp(self):
+        role = RoleHierarchy.objects.create(role_name='MD')
+        self.user = CustomUser.objects.create_user(
+            employee_id='7778', email='md@ntc.net.np', password='Nepal@123', role=role
+        )
+        self.client.force_authenticate(user=self.user)
+        committee = Committee.objects.create(
+            name='Spec Committee', purpose='Specification', committee_type='specification', created_by=self.user
+        )
+        CommitteeMembership.objects.create(committee=committee, user=self.user)
+        for i in range(3):
+            plan = ProcurementPlan.objects.create(
+                policy_number=f'PP-2081-WL-N-{i:02}', department='Wireline', project_name=f'Plan {i}',
+                project_description='Fibre rollout', estimated_cost=1000, budget=900, owner=self.user,
+                committee=committee
+            )
+            QuarterlyTarget.objects.create(procurement_plan=plan, quarter='Q1', target_details='Survey')
+            Tender.objects.create(
+                procurement_plan=plan, title=f'Tender {i}', description='Fibre rollout',
+                publication_date=timezone.now(), closing_date=timezone.now() + timedelta(days=30)
+            )
+
+    def get(self, url, params=None):
+        with CaptureQueriesContext(connection) as ctx:
+            response = self.client.get(url, params or {})
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        return response, len(ctx.captured_queries)
+
+    def test_default_payload_is_unchanged(self):
+        response, _ = self.get('/api/procurement/plans/')
+        self.assertEqual(response.data[0]['committee']['name'], 'Spec Committee')
+        self.assertEqual(len(response.data[0]['quarterly_targets']), 1)
+
+    def test_fields_drops_nested_relations_and_their_queries(self):
+        full, full_queries = self.get('/api/procurement/plans/')
+        sparse, sparse_queries = self.get('/api/procurement/plans/', {'fields': 'id,project_name'})
+        self.assertEqual(set(sparse.data[0]), {'id', 'project_name'})
+        self.assertLess(sparse_queries, full_queries)
+
+    def test_expand_keeps_named_relation(self):
+        response, _ = self.get('/api/procurement/plans/', {'fields': 'id', 'expand': 'committee'})
+        self.assertEqual(set(response.data[0]), {'id', 'committee'})
+        self.assertEqual(len(response.data[0]['committee']['membersList']), 1)
+
+    def test_expand_swaps_primary_key_for_summary(self):
+        compact, _ = self.get('/tender/tenders/')
+        self.assertIsInstance(compact.data[0]['procurement_plan'], int)
+        expanded, queries = self.get('/tender/tenders/', {'expand': 'procurement_plan'})
+        self.assertEqual(set(expanded.data[0]['procurement_plan']), {'id', 'project_name', 'policy_number'})
+        self.assertEqual(queries, 1)
+
+    def test_writes_ignore_field_selection(self):
+        response = self.client.post('/api/procurement/plans/?fields=id', {
+            'policy_number': 'PP-2081-WL-N-99', 'department': 'Wireline', 'dept_index': 'WL-99', 'project_name': 'New',
+            'project_description': 'Fibre rollout', 'estimated_cost': 1000, 'budget': 900,
+        }, format='json')
+        self.assertEqual(response.status_code, status.HTTP_201_CREATED, response.data)
+        self.assertIn('project_name', response.data)
+
+class PlanDropdownTest(APITestCase):
+    """
+    Test that the plan dropdown is cached per role subtree and refreshed when plans change.
+    """
+    def setUp(self):
+        cache.clear()
+        self.addCleanup(cache.clear)
+        md_role = RoleHierarchy.objects.create(role_name='MD')
+        wireline_role = RoleHierarchy.objects.create(role_name='WIRELINE', parent=md_role)
+        wireless_role = RoleHierarchy.objects.create(role_name='WIRELESS', parent=md_role)
+        self.md = CustomUser.objects.create_user(employee_id='1001', email='1001@ntc.net.np', password='Nepal@123', role=md_role)
+        self.wireline = CustomUser.objects.create_user(employee_id='2001', email='2001@ntc.net.np', password='Nepal@123', role=wireline_role)
+        self.wireless = CustomUser.objects.create_user(employee_id='2002', email='2002@ntc.net.np', password='Nepal@123', role=wireless_role)
+        self.plan('PP-2081-WL-N-01', 'Fibre', self.wireline)
+        self.plan('PP-2081-WS-N-01', 'Towers', self.wireless)
+
+    def plan(self, policy_number, project_name, owner):
+        return ProcurementPlan.objects.create(
+            policy_number=policy_number, department='Wireline', project_name=project_name,
+            project_description='Rollout', estimated_cost=1000, budget=900, owner=owner
+        )
+
+    def names(self, user):
+        self.client.force_authenticate(user=user)
+        response = self.client.get('/api/procurement/plans/dropdown/')
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        return [plan['project_name'] for plan in response.data]
+
+    def test_each_role_gets_its_own_cached_list(self):
+        self.assertEqual(self.names(self.md), ['Fibre', 'Towers'])
+        self.assertEqual(self.names(self.wireline), ['Fibre'])
+        self.assertEqual(self.names(self.wireless), ['Towers'])
+        with self.assertNumQueries(0):
+            self.assertEqual(self.names(self.wireline), ['Fibre'])
+
+    def test_new_plan_invalidates(self):
+        self.client.force_authenticate(user=self.wireline)
+        etag = self.client.get('/api/procurement/plans/dropdown/')['ETag']
+        self.assertEqual(
+            self.client.get('/api/procurement/plans/dropdown/', HTTP_IF_NONE_MATCH=etag).status_code,
+            status.HTTP_304_NOT_MODIFIED
+        )
+        self.plan('PP-2081-WL-N-02', 'Backbone', self.wireline)
+        self.assertEqual(self.names(self.wireline), ['Backbone', 'Fibre'])
+
+class StageTransitionTest(APITestCase):
+    """
+    Test that plan stages only advance along the declared transitions, with
+    a stage-only UPDATE under a row lock.
+    """
+    def setUp(self):
+        role = RoleHierarchy.objects.create(role_name='MD')
+        self.user = CustomUser.objects.create_user(employee_id='1001', email='1001@ntc.net.np', password='Nepal@123', role=role)
+        self.plan = ProcurementPlan.objects.create(
+            policy_number='PP-2081-WL-N-01', department='Wireline', project_name='Fibre',
+            project_description='Rollout', estimated_cost=1000, budget=900, owner=self.user
+        )
+
+    def stage(self):
+        return ProcurementPlan.objects.values_list('stage', flat=True).get(pk=self.plan.pk)
+
+    def test_declared_transitions(self):
+        self.assertTrue(can_enter('planning', 'specification'))
+        self.assertFalse(can_enter('planning', 'tender'))
+        self.assertFalse(can_enter('tender', 'specification'))
+        self.assertFalse(can_enter('specification', 'specification'))
+        self.assertTrue(can_enter('bidding', 'bidding'))
+
+    def test_advance_updates_only_the_stage(self):
+        with CaptureQueriesContext(connection) as ctx:
+            self.assertTrue(advance_stage(self.plan, 'specification'))
+        updates = [q['sql'] for q in ctx.captured_queries if q['sql'].startswith('UPDATE')]
+        self.assertEqual(len(updates), 1)
+        self.assertNotIn('project_name', updates[0])
+        self.assertEqual(self.stage(), 'specification')
+        self.assertEqual(self.plan.stage, 'specification')
+
+    def test_staying_in_a_repeatable_stage_writes_nothing(self):
+        ProcurementPlan.objects.filter(pk=self.plan.pk).update(stage='bidding')
+        with CaptureQueriesContext(connection) as ctx:
+            self.assertFalse(advance_stage(self.plan, 'bidding'))
+        self.assertFalse([q for q in ctx.captured_queries if q['sql'].startswith('UPDATE')])
+
+    def test_transition_is_checked_against_the_stored_stage(self):
+        # Another request moved the plan on after this copy was loaded
+        ProcurementPlan.objects.filter(pk=self.plan.pk).update(stage='tender')
+        with self.assertRaises(StageTransitionError):
+            advance_stage(self.plan, 'specification')
+        self.assertEqual(self.stage(), 'tender')
+
+    def test_every_bid_is_accepted_once_bidding_opens(self):
+        ProcurementPlan.objects.filter(pk=self.plan.pk).update(stage='committee')
+        tender = Tender.objects.create(
+            procurement_plan=self.plan, title='Fibre tender', description='Rollout', is_published=True,
+            publication_date=timezone.now(), closing_date=timezone.now() + timedelta(days=7)
+        )
+        bidder = CustomUser.objects.create_user(
+            employee_id='1002', email='1002@ntc.net.np', password='Nepal@123', role=self.user.role
+        )
+        for user, amount in ((self.user, 900), (bidder, 850)):
+            self.client.force_authenticate(user=user)
+            response = self.client.post('/bidding/bids/', {'tender': tender.pk, 'bid_amount': amount}, format='json')
+            self.assertEqual(response.status_code, status.HTTP_201_CREATED, response.data)
+        self.assertEqual(self.stage(), 'bidding')
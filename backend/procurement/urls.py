@@ -1,9 +1,10 @@
 from django.urls import path
-from .views import ProcurementPlanListCreateView, ProcurementPlanDetailView
+from .views import ProcurementPlanListCreateView, ProcurementPlanDetailView, ProcurementPlanDropdownView
 
 app_name = 'procurement'
 
 urlpatterns = [
     path('plans/', ProcurementPlanListCreateView.as_view(), name='plan-list-create'),
+    path('plans/dropdown/', ProcurementPlanDropdownView.as_view(), name='plan-dropdown'),
     path('plans/<int:pk>/', ProcurementPlanDetailView.as_view(), name='plan-detail'),
 ]
\ No newline at end of file
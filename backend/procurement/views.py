@@ -2,51 +2,53 @@ from rest_framework import generics
 from rest_framework.permissions import IsAuthenticated
 from rest_framework.response import Response
 from rest_framework import status
+from django.utils.decorators import method_decorator
+from core.cache import cached_get, role_scope
 from .models import ProcurementPlan
 from .serializers import ProcurementPlanSerializer, ProcurementPlanDropdownSerializer
+from core.serializers import DynamicFieldsQuerysetMixin
+from users.mixins import HierarchyScopedQuerysetMixin
 from users.models import CustomUser, RoleHierarchy
 
 # procurement/views.py
-class ProcurementPlanListCreateView(generics.ListCreateAPIView):
-    queryset = ProcurementPlan.objects.all()
+class ProcurementPlanListCreateView(DynamicFieldsQuerysetMixin, HierarchyScopedQuerysetMixin, generics.ListCreateAPIView):
+    queryset = ProcurementPlan.objects.order_by('-created_at')
     serializer_class = ProcurementPlanSerializer  # Use full serializer
     permission_classes = [IsAuthenticated]
 
-    def get_queryset(self):
-        user = self.request.user
-        if not user.is_authenticated or not user.role:
-            return ProcurementPlan.objects.none()
-        allowed_roles = user.get_allowed_roles()
-        allowed_role_ids = [role.id for role in allowed_roles]
-        return ProcurementPlan.objects.filter(owner__role__id__in=allowed_role_ids).order_by('-created_at')
-
     def perform_create(self, serializer):
         serializer.save(owner=self.request.user)
 
     def get(self, request, *args, **kwargs):
-        if not request.user.role:
+        if not request.user.role_id:
             return Response(
                 {'error': 'User must have a role to view procurement plans.'},
                 status=status.HTTP_403_FORBIDDEN
             )
         return super().get(request, *args, **kwargs)
 
-class ProcurementPlanDetailView(generics.RetrieveUpdateDestroyAPIView):
+class ProcurementPlanDetailView(DynamicFieldsQuerysetMixin, HierarchyScopedQuerysetMixin, generics.RetrieveUpdateDestroyAPIView):
     queryset = ProcurementPlan.objects.all()
     serializer_class = ProcurementPlanSerializer
     permission_classes = [IsAuthenticated]
 
-    def get_queryset(self):
-        user = self.request.user
-        if not user.is_authenticated or not user.role:
-            return ProcurementPlan.objects.none()
+    def get(self, request, *args, **kwargs):
+        if not request.user.role_id:
+            return Response(
+                {'error': 'User must have a role to view procurement plans.'},
+                status=status.HTTP_403_FORBIDDEN
+            )
+        return super().get(request, *args, **kwargs)
 
-        allowed_roles = user.get_allowed_roles()
-        allowed_role_ids = [role.id for role in allowed_roles]
-        return ProcurementPlan.objects.filter(owner__role__id__in=allowed_role_ids)
+# Visible plans depend on who holds which role, so user and role changes invalidate too
+@method_decorator(cached_get(ProcurementPlan, CustomUser, RoleHierarchy, scope=role_scope), name='get')
+class ProcurementPlanDropdownView(HierarchyScopedQuerysetMixin, generics.ListAPIView):
+    queryset = ProcurementPlan.objects.only('id', 'project_name', 'policy_number').order_by('project_name')
+    serializer_class = ProcurementPlanDropdownSerializer
+    permission_classes = [IsAuthenticated]
 
     def get(self, request, *args, **kwargs):
-        if not request.user.role:
+        if not request.user.role_id:
             return Response(
                 {'error': 'User must have a role to view procurement plans.'},
                 status=status.HTTP_403_FORBIDDEN
@@ -1,8 +1,12 @@
 from rest_framework import serializers
 from .models import Specification
+from django.db import transaction
 from procurement.models import ProcurementPlan
+from procurement.serializers import advance_plan_stage
+from procurement.stages import can_enter
+from core.serializers import TimedSerializerMixin
 
-class SpecificationSerializer(serializers.ModelSerializer):
+class SpecificationSerializer(TimedSerializerMixin, serializers.ModelSerializer):
     class Meta:
         model = Specification
         fields = ['id', 'procurement_plan', 'title', 'description', 'created_at', 'updated_at', 'draft_status']
@@ -11,16 +15,14 @@ class SpecificationSerializer(serializers.ModelSerializer):
     def validate_procurement_plan(self, value):
         if not value.committee:
             raise serializers.ValidationError("A committee must be formed before creating a specification.")
-        if value.stage != 'planning':
+        if not can_enter(value.stage, 'specification'):
             raise serializers.ValidationError("Procurement plan must be in the 'planning' stage to create a specification.")
         return value
 
     def create(self, validated_data):
-        specification = Specification.objects.create(**validated_data)
-        # Update the ProcurementPlan stage
-        procurement_plan = validated_data['procurement_plan']
-        procurement_plan.stage = 'specification'
-        procurement_plan.save()
+        with transaction.atomic():
+            advance_plan_stage(validated_data['procurement_plan'], 'specification')
+            specification = Specification.objects.create(**validated_data)
         return specification
 
     def update(self, instance, validated_data):
@@ -1,3 +1,53 @@
-from django.test import TestCase
+from rest_framework import status
+from rest_framework.test import APITestCase
+from procurement.models import ProcurementPlan
+from users.models import CustomUser, RoleHierarchy
+from .models import Specification
 
-# Create your tests here.
+class SpecificationScopingTest(APITestCase):
+    """
+    Test that specifications are listed and served only to users whose role
+    subtree contains the owner of the specification's procurement plan.
+    """
+    def setUp(self):
+        md = RoleHierarchy.objects.create(role_name='MD')
+        wireline = RoleHierarchy.objects.create(role_name='WIRELINE', parent=md)
+        wireless = RoleHierarchy.objects.create(role_name='WIRELESS', parent=md)
+        self.md = self.user('md', md)
+        self.wireline = self.user('wireline', wireline)
+        self.wireless = self.user('wireless', wireless)
+        self.wireline_spec = self.specification('Fibre', self.wireline)
+        self.wireless_spec = self.specification('Tower', self.wireless)
+
+    def user(self, employee_id, role):
+        return CustomUser.objects.create_user(
+            employee_id=employee_id, email=f'{employee_id}@ntc.net.np', password='Nepal@123', role=role
+        )
+
+    def specification(self, name, owner):
+        plan = ProcurementPlan.objects.create(
+            policy_number=f'PP-2081-{name}', department=name, project_name=f'{name} rollout',
+            project_description=f'{name} rollout', estimated_cost=1000, budget=900, owner=owner
+        )
+        return Specification.objects.create(procurement_plan=plan, title=f'{name} spec', description='Specs')
+
+    def titles(self, user):
+        self.client.force_authenticate(user=user)
+        response = self.client.get('/specification/specifications/')
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        return sorted(spec['title'] for spec in response.data)
+
+    def test_list_is_limited_to_the_role_subtree(self):
+        self.assertEqual(self.titles(self.md), ['Fibre spec', 'Tower spec'])
+        self.assertEqual(self.titles(self.wireline), ['Fibre spec'])
+        self.assertEqual(self.titles(self.wireless), ['Tower spec'])
+
+    def test_users_without_a_role_see_nothing(self):
+        self.assertEqual(self.titles(self.user('guest', None)), [])
+
+    def test_other_branches_specification_is_not_found(self):
+        self.client.force_authenticate(user=self.wireline)
+        response = self.client.get(f'/specification/specifications/{self.wireless_spec.pk}/')
+        self.assertEqual(response.status_code, status.HTTP_404_NOT_FOUND)
+        response = self.client.get(f'/specification/specifications/{self.wireline_spec.pk}/')
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
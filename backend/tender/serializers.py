@@ -1,8 +1,20 @@
 from rest_framework import serializers
 from .models import Tender
 from procurement.models import ProcurementPlan
+from django.db import transaction
+from procurement.serializers import ProcurementPlanDropdownSerializer, advance_plan_stage
+from procurement.stages import can_enter
+from core.serializers import DynamicFieldsMixin
+
+class TenderSerializer(DynamicFieldsMixin, serializers.ModelSerializer):
+    expandable_fields = {
+        'procurement_plan': {
+            'serializer': ProcurementPlanDropdownSerializer,
+            'options': {'read_only': True},
+            'select_related': ['procurement_plan'],
+        },
+    }
 
-class TenderSerializer(serializers.ModelSerializer):
     class Meta:
         model = Tender
         fields = ['id', 'procurement_plan', 'specification', 'title', 'description', 'publication_date', 'closing_date', 'created_at', 'updated_at', 'is_published']
@@ -12,7 +24,7 @@ class TenderSerializer(serializers.ModelSerializer):
         procurement_plan = data.get('procurement_plan')
         specification = data.get('specification')
 
-        if procurement_plan.stage != 'specification':
+        if not can_enter(procurement_plan.stage, 'tender'):
             raise serializers.ValidationError("Procurement plan must be in the 'specification' stage to create a tender.")
         if specification.draft_status:
             raise serializers.ValidationError("Specification must be finalized (draft_status=False) to create a tender.")
@@ -21,11 +33,9 @@ class TenderSerializer(serializers.ModelSerializer):
         return data
 
     def create(self, validated_data):
-        tender = Tender.objects.create(**validated_data)
-        # Update the ProcurementPlan stage
-        procurement_plan = validated_data['procurement_plan']
-        procurement_plan.stage = 'tender'
-        procurement_plan.save()
+        with transaction.atomic():
+            advance_plan_stage(validated_data['procurement_plan'], 'tender')
+            tender = Tender.objects.create(**validated_data)
         return tender
 
     def update(self, instance, validated_data):
@@ -1,11 +1,25 @@
 # backend/users/authentication.py
+from django.conf import settings
 from django.contrib.auth.backends import ModelBackend
 from django.contrib.auth import get_user_model
+from django.core.cache import cache
+from django.db import DEFAULT_DB_ALIAS
+from django.utils.translation import gettext_lazy as _
+from rest_framework_simplejwt.authentication import JWTAuthentication
+from rest_framework_simplejwt.exceptions import AuthenticationFailed, InvalidToken
+from rest_framework_simplejwt.settings import api_settings as jwt_settings
+from rest_framework_simplejwt.utils import get_md5_hash_password
+from core.cache import bump_stamp, stamps, version_key
+from .models import RoleClosure, RoleHierarchy
 import logging
 
 logger = logging.getLogger(__name__)
 User = get_user_model()
 
+def find_login_user(identifier):
+    """The user matching ``identifier`` as an employee_id or else an email, with their role, in one query."""
+    return User.objects.select_related('role').find_identity(identifier)
+
 class CustomAuthBackend(ModelBackend):
     def authenticate(self, request, employee_id=None, password=None, **kwargs):
         logger.debug(f"Authenticating with employee_id: {employee_id}")
@@ -13,18 +27,13 @@ class CustomAuthBackend(ModelBackend):
             logger.error("No employee_id provided for authentication")
             return None
 
-        try:
-            # Try employee_id (case-insensitive)
-            user = User.objects.get(employee_id__iexact=employee_id)
-            logger.debug(f"Found user by employee_id: {user.employee_id}")
-        except User.DoesNotExist:
-            try:
-                # Try email
-                user = User.objects.get(email=employee_id)
-                logger.debug(f"Found user by email: {user.email}")
-            except User.DoesNotExist:
-                logger.error(f"No user found for identifier: {employee_id}")
-                return None
+        user = find_login_user(employee_id)
+        if user is None:
+            logger.error(f"No user found for identifier: {employee_id}")
+            # Hash anyway so unknown identifiers take as long as wrong passwords.
+            # make_password(None) skips hashing, so always hash a string.
+            User().set_password(password or '')
+            return None
 
         if user.check_password(password) and self.user_can_authenticate(user):
             logger.debug(f"Authentication successful for user: {user.employee_id}")
@@ -37,3 +46,112 @@ class CustomAuthBackend(ModelBackend):
         logger.debug(f"Checking if user can authenticate: {user.employee_id}, is_active: {is_active}")
         return is_active
 
+
+# Backends whose entries live in one process; a principal cached there would
+# miss invalidations made by the other workers.
+PER_PROCESS_CACHES = {
+    'django.core.cache.backends.locmem.LocMemCache',
+    'django.core.cache.backends.dummy.DummyCache',
+}
+
+def principal_cache_ttl():
+    """PRINCIPAL_CACHE_TTL, or 0 (no caching) unless the default cache is shared between processes."""
+    if settings.CACHES['default']['BACKEND'] in PER_PROCESS_CACHES:
+        return 0
+    return settings.PRINCIPAL_CACHE_TTL
+
+def principal_key(user_id):
+    return f"principal-version:{user_id}"
+
+def invalidate_principal(user_id):
+    """Drop every cached principal of ``user_id``, whichever token it was cached under."""
+    bump_stamp(principal_key(user_id))
+
+class CachedJWTAuthentication(JWTAuthentication):
+    """
+    JWTAuthentication that caches the authenticated principal (the user,
+    their role and ``allowed_role_ids``, the ids of the roles in their
+    subtree) per access token for PRINCIPAL_CACHE_TTL seconds, so repeat
+    requests authenticate without queries.
+
+    Only ``user_fields`` are cached; other columns of a cached principal load
+    on first access. The password hash and reset token are never cached:
+    with CHECK_REVOKE_TOKEN only the token's revoke digest of the password is
+    kept.
+
+    Cached principals are dropped when the user is saved or deleted and when
+    the role tree changes. Those version stamps live in the default cache, so
+    caching is off unless that cache is shared between processes (Redis,
+    Memcached, ...); with a per-process cache a deactivation in one worker
+    would go unseen by the others. The inactive-user and revoked-token checks
+    run on every request but against the cached copy, so a deactivation or
+    password change made through QuerySet.update() applies only once the TTL
+    expires.
+    """
+    # In model order, as from_db() expects
+    user_fields = [
+        field.attname for field in User._meta.concrete_fields
+        if field.attname in {
+            'employee_id', 'role_id', 'is_active', 'is_staff', 'is_superuser',
+            'username', 'name', 'email', 'department', 'designation',
+        }
+    ]
+    role_fields = [field.attname for field in RoleHierarchy._meta.concrete_fields]
+
+    def get_user(self, validated_token):
+        try:
+            user_id = validated_token[jwt_settings.USER_ID_CLAIM]
+        except KeyError:
+            raise InvalidToken(_("Token contained no recognizable user identification"))
+
+        jti = validated_token.get(jwt_settings.JTI_CLAIM)
+        ttl = principal_cache_ttl()
+        if not ttl or not jti:
+            user = self.load_principal(user_id)
+        else:
+            token_key = f"jwt-principal:{jti}"
+            versions = stamps([principal_key(user_id), version_key(RoleHierarchy)])
+            cached = cache.get(token_key)
+            if cached is not None and cached[0] == versions:
+                user = self.build_principal(*cached[1:])
+            else:
+                user = self.load_principal(user_id)
+                cache.set(token_key, (versions, *self.dump_principal(user)), ttl)
+        self.check_user(user, validated_token)
+        return user
+
+    def load_principal(self, user_id):
+        try:
+            user = self.user_model.objects.select_related('role').get(**{jwt_settings.USER_ID_FIELD: user_id})
+        except self.user_model.DoesNotExist:
+            raise AuthenticationFailed(_("User not found"), code="user_not_found")
+        user.allowed_role_ids = frozenset(
+            RoleClosure.objects.filter(ancestor_id=user.role_id).values_list('descendant_id', flat=True)
+        ) if user.role_id else frozenset()
+        user.revoke_digest = get_md5_hash_password(user.password) if jwt_settings.CHECK_REVOKE_TOKEN else None
+        return user
+
+    def dump_principal(self, user):
+        role = user.role
+        return (
+            {name: getattr(user, name) for name in self.user_fields},
+            tuple(getattr(role, name) for name in self.role_fields) if role else None,
+            user.allowed_role_ids,
+            user.revoke_digest,
+        )
+
+    def build_principal(self, user_values, role_values, allowed_role_ids, revoke_digest):
+        user = self.user_model.from_db(DEFAULT_DB_ALIAS, list(user_values), list(user_values.values()))
+        role = RoleHierarchy.from_db(DEFAULT_DB_ALIAS, self.role_fields, role_values) if role_values else None
+        self.user_model.role.field.set_cached_value(user, role)
+        user.allowed_role_ids = allowed_role_ids
+        user.revoke_digest = revoke_digest
+        return user
+
+    def check_user(self, user, validated_token):
+        if jwt_settings.CHECK_USER_IS_ACTIVE and not user.is_active:
+            raise AuthenticationFailed(_("User is inactive"), code="user_inactive")
+        if jwt_settings.CHECK_REVOKE_TOKEN and (
+            validated_token.get(jwt_settings.REVOKE_TOKEN_CLAIM) != user.revoke_digest
+        ):
+            raise AuthenticationFailed(_("The user's password has been changed."), code="password_changed")
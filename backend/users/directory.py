@@ -0,0 +1,28 @@
+# users/directory.py
+from django.db.models import Q
+from core.pagination import KeysetPaginator
+from .models import EmployeeDetail
+
+SEARCH_FIELDS = ('employee_id', 'name', 'email', 'position')
+TYPEAHEAD_FIELDS = ('employee_id', 'name', 'position')
+
+def search_employees(text):
+    """Employees with any of SEARCH_FIELDS starting with ``text``, case-insensitively."""
+    queryset = EmployeeDetail.objects.all()
+    text = (text or '').strip()
+    if text:
+        match = Q()
+        for field in SEARCH_FIELDS:
+            match |= Q(**{f'{field}__istartswith': text})
+        queryset = queryset.filter(match)
+    return queryset
+
+class DirectoryPaginator(KeysetPaginator):
+    """Keyset pagination over ``employee_id``, so every page is one index range scan."""
+    ordering = ('employee_id',)
+    page_size_setting = 'EMPLOYEE_DIRECTORY_PAGE_SIZE'
+    max_page_size_setting = 'EMPLOYEE_DIRECTORY_MAX_PAGE_SIZE'
+
+def typeahead(text, limit):
+    """The first ``limit`` matches for ``text`` as plain dicts of TYPEAHEAD_FIELDS."""
+    return list(search_employees(text).order_by('employee_id').values(*TYPEAHEAD_FIELDS)[:limit])
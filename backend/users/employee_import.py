@@ -0,0 +1,216 @@
+# users/employee_import.py
+import csv
+import json
+import os
+from datetime import date, datetime
+import pandas as pd
+from django.conf import settings
+from openpyxl import load_workbook
+from core.cache import bump_model_version
+from .models import EmployeeDetail
+
+EMAIL_DOMAIN = 'ntc.net.np'
+
+# Spreadsheet column -> EmployeeDetail field
+COLUMNS = {
+    'eno': 'employee_id',
+    'Name': 'name',
+    'Position': 'position',
+    'Level': 'level',
+    'Service': 'service',
+    'Group': 'group',
+    'Qualification': 'qualification',
+    'Seniority': 'seniority',
+    'Retirement': 'retirement',
+    'mno': 'mno',
+}
+DATE_FIELDS = ['seniority', 'retirement']
+FIELDS = ['employee_id', 'name', 'email', 'position', 'level', 'service', 'group', 'qualification', 'seniority', 'retirement', 'mno']
+UPDATE_FIELDS = [field for field in FIELDS if field != 'employee_id']
+
+def clean_text(series):
+    """Strip whitespace and turn blanks and stray 'nan' strings into None."""
+    series = series.astype('string').str.strip()
+    return series.mask(series.isna() | series.isin(['', 'nan', 'NaN', 'None']))
+
+def clean_frame(df):
+    """
+    Map spreadsheet columns onto EmployeeDetail fields, column by column.
+    Returns ``(rows, errors)`` where ``errors`` lists rejected rows with a
+    reason, keyed by their spreadsheet index.
+    """
+    missing = [column for column in ('eno', 'Name') if column not in df.columns]
+    if missing:
+        raise ValueError(f"Missing required columns: {', '.join(missing)}")
+    rows = pd.DataFrame(index=df.index)
+    for column, field in COLUMNS.items():
+        if column not in df.columns:
+            rows[field] = pd.Series(pd.NA, index=df.index, dtype='string')
+        elif field in DATE_FIELDS:
+            dates = pd.to_datetime(clean_text(df[column]), errors='coerce')
+            rows[field] = dates.dt.tz_localize(settings.TIME_ZONE) if dates.dt.tz is None else dates
+        else:
+            rows[field] = clean_text(df[column])
+    rows['employee_id'] = rows['employee_id'].str.replace(r'\.0$', '', regex=True)
+
+    errors = pd.Series(pd.NA, index=rows.index, dtype='string')
+    errors = errors.mask(rows['name'].isna(), 'Empty Name')
+    errors = errors.mask(rows['employee_id'].isna(), 'Empty or invalid employee_id')
+    duplicated = rows['employee_id'].notna() & rows['employee_id'].duplicated(keep='last')
+    errors = errors.mask(errors.isna() & duplicated, 'Duplicate employee_id; a later row wins')
+    return rows[errors.isna()], errors.dropna()
+
+def assign_emails(rows, taken):
+    """
+    Generate ``firstname.lastname@`` addresses, falling back to
+    ``firstname.lastname<employee_id>@`` on collision. ``taken`` maps emails
+    already in use to the employee owning them and is updated in place.
+    Returns ``(rows, errors)`` like ``clean_frame``.
+    """
+    parts = rows['name'].str.lower().str.split()
+    stem = parts.str[0] + '.' + parts.str[-1]
+    ids = rows['employee_id']
+    base = stem + f'@{EMAIL_DOMAIN}'
+    fallback = stem + ids + f'@{EMAIL_DOMAIN}'
+
+    owner = base.map(taken)
+    clash = (owner.notna() & (owner != ids)) | base.duplicated()
+    email = base.where(~clash, fallback)
+    owner = email.map(taken)
+    failed = clash & ((owner.notna() & (owner != ids)) | email.duplicated(keep=False))
+
+    rows = rows.assign(email=email)
+    errors = ('Cannot generate unique email for ' + rows['name'] + ' (employee_id: ' + ids + ')')[failed]
+    rows = rows[~failed]
+    taken.update(zip(rows['email'], rows['employee_id']))
+    return rows, errors
+
+def existing_emails():
+    return dict(EmployeeDetail.objects.values_list('email', 'employee_id'))
+
+def to_instances(rows):
+    records = rows[FIELDS].astype(object).where(rows[FIELDS].notna(), None).to_dict('records')
+    for record in records:
+        for field in DATE_FIELDS:
+            if record[field] is not None:
+                record[field] = record[field].to_pydatetime()
+    return [EmployeeDetail(**record) for record in records]
+
+def diff(rows):
+    """
+    Compare cleaned rows with the database. Returns ``(created, updated,
+    unchanged)`` where ``updated`` maps employee_id to ``{field: (old, new)}``.
+    """
+    current = {
+        employee.employee_id: employee
+        for employee in EmployeeDetail.objects.filter(employee_id__in=list(rows['employee_id']))
+    }
+    created, updated, unchanged = [], {}, 0
+    for incoming in to_instances(rows):
+        existing = current.get(incoming.employee_id)
+        if existing is None:
+            created.append(incoming.employee_id)
+            continue
+        changes = {
+            field: (getattr(existing, field), getattr(incoming, field))
+            for field in UPDATE_FIELDS if getattr(existing, field) != getattr(incoming, field)
+        }
+        if changes:
+            updated[incoming.employee_id] = changes
+        else:
+            unchanged += 1
+    return created, updated, unchanged
+
+def upsert(rows, batch_size):
+    """Insert or update ``rows`` with one INSERT ... ON CONFLICT per batch."""
+    EmployeeDetail.objects.bulk_create(
+        to_instances(rows),
+        batch_size=batch_size,
+        update_conflicts=True,
+        unique_fields=['employee_id'],
+        update_fields=UPDATE_FIELDS,
+    )
+    # bulk_create sends no post_save, so invalidate cached employee lists here
+    bump_model_version(EmployeeDetail)
+    return len(rows)
+
+def read_xlsx(path):
+    workbook = load_workbook(path, read_only=True, data_only=True)
+    try:
+        yield from workbook.active.iter_rows(values_only=True)
+    finally:
+        workbook.close()
+
+def read_csv(path):
+    with open(path, newline='', encoding='utf-8-sig') as f:
+        yield from csv.reader(f)
+
+def read_rows(path):
+    """Stream raw rows, header first, without loading the whole file."""
+    extension = os.path.splitext(path)[1].lower()
+    if extension in ('.xlsx', '.xlsm'):
+        return read_xlsx(path)
+    if extension == '.csv':
+        return read_csv(path)
+    raise ValueError(f"Unsupported file type: {extension or path}")
+
+def cell_text(value):
+    if value is None:
+        return None
+    if isinstance(value, float) and value.is_integer():
+        return str(int(value))
+    if isinstance(value, (datetime, date)):
+        return value.isoformat()
+    return str(value)
+
+def iter_chunks(path, chunk_size, skip=0):
+    """
+    Yield ``(frame, next_row)`` for consecutive chunks of at most
+    ``chunk_size`` data rows, starting after the first ``skip`` rows.
+    ``next_row`` is where a resumed import should pick up.
+    """
+    rows = read_rows(path)
+    header = [cell_text(value) for value in next(rows, ())]
+    chunk = {}
+    for index, row in enumerate(rows):
+        if index < skip:
+            continue
+        values = [cell_text(value) for value in row][:len(header)]
+        if any(value is not None and value.strip() for value in values):
+            chunk[index] = values + [None] * (len(header) - len(values))
+        if len(chunk) == chunk_size:
+            yield pd.DataFrame.from_dict(chunk, orient='index', columns=header), index + 1
+            chunk = {}
+    if chunk:
+        yield pd.DataFrame.from_dict(chunk, orient='index', columns=header), index + 1
+
+class Checkpoint:
+    """
+    Progress marker for a resumable import, stored as JSON beside the source
+    file. It only applies while the source file is unchanged.
+    """
+    def __init__(self, source, path=None):
+        self.path = path or f"{source}.import-checkpoint.json"
+        stat = os.stat(source)
+        self.fingerprint = {'source': os.path.abspath(source), 'size': stat.st_size, 'mtime': stat.st_mtime}
+
+    def load(self):
+        """Rows already committed, or 0 when there is no matching checkpoint."""
+        try:
+            with open(self.path) as f:
+                data = json.load(f)
+        except (FileNotFoundError, ValueError):
+            return 0
+        if data.get('fingerprint') != self.fingerprint:
+            return 0
+        return data.get('rows_committed', 0)
+
+    def save(self, rows_committed):
+        temp_path = f"{self.path}.tmp"
+        with open(temp_path, 'w') as f:
+            json.dump({'fingerprint': self.fingerprint, 'rows_committed': rows_committed}, f)
+        os.replace(temp_path, self.path)
+
+    def clear(self):
+        if os.path.exists(self.path):
+            os.remove(self.path)
@@ -0,0 +1,70 @@
+import time
+from unittest import mock
+from django.contrib.auth import base_user
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connection, transaction
+from rest_framework.test import APIRequestFactory
+from users.models import CustomUser
+from users.views import CustomTokenObtainPairView
+
+class Rollback(Exception):
+    pass
+
+class Command(BaseCommand):
+    help = (
+        'Measure login throughput of this worker through the token endpoint, with '
+        'password hashes and queries per login. Uses a throwaway account that is '
+        'rolled back unless --employee-id and --password are given.'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--requests', type=int, default=100, help='Number of logins to time')
+        parser.add_argument('--employee-id', help='Log in as this existing user')
+        parser.add_argument('--password', help='Password of --employee-id')
+
+    def handle(self, *args, **options):
+        if bool(options['employee_id']) != bool(options['password']):
+            raise CommandError('--employee-id and --password must be given together')
+        try:
+            with transaction.atomic():
+                employee_id, password = options['employee_id'], options['password']
+                if not employee_id:
+                    employee_id, password = 'bench-login', 'Bench@12345'
+                    CustomUser.objects.create_user(
+                        employee_id=employee_id, email='bench-login@example.invalid', password=password
+                    )
+                self.run(employee_id, password, options['requests'])
+                raise Rollback
+        except Rollback:
+            pass
+
+    def run(self, employee_id, password, count):
+        view = CustomTokenObtainPairView.as_view()
+        factory = APIRequestFactory()
+        hashes = queries = 0
+        check_password = base_user.check_password
+
+        def counting_check_password(*args, **kwargs):
+            nonlocal hashes
+            hashes += 1
+            return check_password(*args, **kwargs)
+
+        def count_query(execute, *args):
+            nonlocal queries
+            queries += 1
+            return execute(*args)
+
+        with mock.patch.object(base_user, 'check_password', counting_check_password), \
+                connection.execute_wrapper(count_query):
+            started = time.perf_counter()
+            for _ in range(count):
+                request = factory.post('/api/token/', {'employee_id': employee_id, 'password': password}, format='json')
+                response = view(request)
+                if response.status_code != 200:
+                    raise CommandError(f'Login failed with {response.status_code}: {response.data}')
+            elapsed = time.perf_counter() - started
+
+        self.stdout.write(self.style.SUCCESS(
+            f'{count} logins in {elapsed:.2f}s: {count / elapsed:.1f} logins/s per worker, '
+            f'{hashes / count:.2f} password hashes and {queries / count:.2f} queries per login'
+        ))
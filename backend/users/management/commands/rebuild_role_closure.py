@@ -0,0 +1,14 @@
+from django.core.management.base import BaseCommand
+from users.models import RoleClosure
+from users.role_tree import bump_role_tree_version
+
+class Command(BaseCommand):
+    help = 'Rebuild the RoleClosure table and invalidate cached role trees'
+
+    def handle(self, *args, **options):
+        try:
+            count = RoleClosure.objects.rebuild()
+            bump_role_tree_version()
+            self.stdout.write(self.style.SUCCESS(f'Role closure rebuilt with {count} links'))
+        except Exception as e:
+            self.stdout.write(self.style.ERROR(f'Error rebuilding role closure: {str(e)}'))
@@ -0,0 +1,43 @@
+# Generated by Django 5.1.7 on 2026-10-18 01:17
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+def populate_role_closure(apps, schema_editor):
+    RoleHierarchy = apps.get_model('users', 'RoleHierarchy')
+    RoleClosure = apps.get_model('users', 'RoleClosure')
+    parents = dict(RoleHierarchy.objects.values_list('id', 'parent_id'))
+    links = []
+    for role_id in parents:
+        ancestor_id, depth, seen = role_id, 0, set()
+        while ancestor_id is not None and ancestor_id not in seen:
+            seen.add(ancestor_id)
+            links.append(RoleClosure(ancestor_id=ancestor_id, descendant_id=role_id, depth=depth))
+            ancestor_id = parents.get(ancestor_id)
+            depth += 1
+    RoleClosure.objects.bulk_create(links, batch_size=1000)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('users', '0004_add_reset_token'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='RoleClosure',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('depth', models.PositiveIntegerField()),
+                ('ancestor', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='descendant_links', to='users.rolehierarchy')),
+                ('descendant', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='ancestor_links', to='users.rolehierarchy')),
+            ],
+            options={
+                'indexes': [models.Index(fields=['descendant', 'depth'], name='users_roleclosure_desc_depth')],
+                'unique_together': {('ancestor', 'descendant')},
+            },
+        ),
+        migrations.RunPython(populate_role_closure, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,26 @@
+# Generated by Django 5.1.7 on 2026-10-18 01:18
+
+from django.db import migrations, models
+
+
+def create_version_row(apps, schema_editor):
+    RoleTreeVersion = apps.get_model('users', 'RoleTreeVersion')
+    RoleTreeVersion.objects.get_or_create(pk=1, defaults={'version': 1})
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('users', '0005_roleclosure'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='RoleTreeVersion',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('version', models.PositiveBigIntegerField(default=0)),
+            ],
+        ),
+        migrations.RunPython(create_version_row, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,34 @@
+# Generated by Django 5.1.7 on 2026-10-18 01:45
+
+import django.contrib.postgres.indexes
+import django.db.models.functions.text
+from django.db import migrations, models
+from core.operations import AddIndexConcurrentlyOnPostgres
+
+
+class Migration(migrations.Migration):
+    # CREATE INDEX CONCURRENTLY cannot run inside a transaction.
+    atomic = False
+
+    dependencies = [
+        ('users', '0006_roletreeversion'),
+    ]
+
+    operations = [
+        AddIndexConcurrentlyOnPostgres(
+            model_name='employeedetail',
+            index=models.Index(django.contrib.postgres.indexes.OpClass(django.db.models.functions.text.Upper('employee_id'), name='varchar_pattern_ops'), name='employee_id_prefix_idx'),
+        ),
+        AddIndexConcurrentlyOnPostgres(
+            model_name='employeedetail',
+            index=models.Index(django.contrib.postgres.indexes.OpClass(django.db.models.functions.text.Upper('name'), name='varchar_pattern_ops'), name='employee_name_prefix_idx'),
+        ),
+        AddIndexConcurrentlyOnPostgres(
+            model_name='employeedetail',
+            index=models.Index(django.contrib.postgres.indexes.OpClass(django.db.models.functions.text.Upper('email'), name='varchar_pattern_ops'), name='employee_email_prefix_idx'),
+        ),
+        AddIndexConcurrentlyOnPostgres(
+            model_name='employeedetail',
+            index=models.Index(django.contrib.postgres.indexes.OpClass(django.db.models.functions.text.Upper('position'), name='varchar_pattern_ops'), name='employee_position_prefix_idx'),
+        ),
+    ]
@@ -0,0 +1,25 @@
+# Generated by Django 5.1.7 on 2026-10-18 01:54
+
+import django.db.models.functions.text
+from django.db import migrations, models
+from core.operations import AddIndexConcurrentlyOnPostgres
+
+
+class Migration(migrations.Migration):
+    # CREATE INDEX CONCURRENTLY cannot run inside a transaction.
+    atomic = False
+
+    dependencies = [
+        ('users', '0007_employee_directory_indexes'),
+    ]
+
+    operations = [
+        AddIndexConcurrentlyOnPostgres(
+            model_name='customuser',
+            index=models.Index(django.db.models.functions.text.Upper('employee_id'), name='user_employee_id_upper_idx'),
+        ),
+        AddIndexConcurrentlyOnPostgres(
+            model_name='customuser',
+            index=models.Index(django.db.models.functions.text.Upper('email'), name='user_email_upper_idx'),
+        ),
+    ]
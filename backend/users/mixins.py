@@ -0,0 +1,13 @@
+# users/mixins.py
+from .utils import scope_to_hierarchy
+
+class HierarchyScopedQuerysetMixin:
+    """
+    Restrict a generic view's queryset to rows owned by users within the
+    requesting user's role subtree. ``hierarchy_owner_field`` is the lookup
+    path from the view's model to the owning CustomUser.
+    """
+    hierarchy_owner_field = 'owner'
+
+    def get_queryset(self):
+        return scope_to_hierarchy(super().get_queryset(), self.request.user, self.hierarchy_owner_field)
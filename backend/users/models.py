@@ -2,9 +2,42 @@
 # backend/users/models.py
 import uuid
 from django.contrib.auth.models import AbstractUser, BaseUserManager
-from django.db import models
+from django.contrib.postgres.indexes import OpClass
+from django.db import models, transaction
+from django.db.models.functions import Upper
+from .role_tree import get_role_tree
+
+class CustomUserQuerySet(models.QuerySet):
+    def find_identity(self, identifier, fields=('employee_id', 'email')):
+        """
+        The user whose ``fields``, tried in order, equal ``identifier``
+        ignoring case, fetched in one query. The iexact lookups compile to
+        UPPER(col) = UPPER(%s), which the user_*_upper_idx indexes serve. A
+        same-case match wins over one differing only in case; several
+        case-insensitive matches and no exact one resolve to None.
+        """
+        if not identifier:
+            return None
+        match = models.Q()
+        for field in fields:
+            match |= models.Q(**{f'{field}__iexact': identifier})
+        candidates = list(self.filter(match))
+        for field in fields:
+            exact = [user for user in candidates if getattr(user, field) == identifier]
+            if exact:
+                return exact[0]
+            folded = [user for user in candidates if getattr(user, field).upper() == identifier.upper()]
+            if folded:
+                return folded[0] if len(folded) == 1 else None
+        return None
+
+class CustomUserManager(BaseUserManager.from_queryset(CustomUserQuerySet)):
+    def get_by_natural_key(self, employee_id):
+        user = self.get_queryset().find_identity(employee_id, fields=[self.model.USERNAME_FIELD])
+        if user is None:
+            raise self.model.DoesNotExist
+        return user
 
-class CustomUserManager(BaseUserManager):
     def create_user(self, employee_id, email, password=None, **extra_fields):
         if not employee_id:
             raise ValueError('The Employee ID field must be set')
@@ -36,19 +69,104 @@ class RoleHierarchy(models.Model):
     def __str__(self):
         return self.role_name or "Unnamed Role"
 
+    def save(self, *args, **kwargs):
+        # RoleClosure rows are synced in post_save; keep them in the same transaction.
+        with transaction.atomic():
+            super().save(*args, **kwargs)
+
     def get_all_descendants(self):
         """Get all descendant roles in the hierarchy."""
-        descendants = list(self.sub_roles.all())
-        for child in self.sub_roles.all():
-            descendants.extend(child.get_all_descendants())
-        return descendants
+        return get_role_tree().descendants(self.pk)
+
+    def subtree_ids(self, include_self=True):
+        """Ids of this role's subtree as a queryset the ORM can inline as a subquery."""
+        links = RoleClosure.objects.filter(ancestor=self)
+        if not include_self:
+            links = links.filter(depth__gt=0)
+        return links.values('descendant_id')
 
     def get_hierarchy(self):
         """Get the role hierarchy path from this role to the root."""
-        hierarchy = [self.role_name]
-        if self.parent:
-            hierarchy.extend(self.parent.get_hierarchy())
-        return hierarchy
+        return get_role_tree().hierarchy(self.pk)
+
+class RoleClosureManager(models.Manager):
+    def rebuild(self):
+        """Recompute every ancestor/descendant pair from the parent pointers."""
+        parents = dict(RoleHierarchy.objects.values_list('id', 'parent_id'))
+        links = []
+        for role_id in parents:
+            ancestor_id, depth, seen = role_id, 0, set()
+            while ancestor_id is not None and ancestor_id not in seen:
+                seen.add(ancestor_id)
+                links.append(self.model(ancestor_id=ancestor_id, descendant_id=role_id, depth=depth))
+                ancestor_id = parents.get(ancestor_id)
+                depth += 1
+        with transaction.atomic():
+            self.all().delete()
+            self.bulk_create(links, batch_size=1000)
+        return len(links)
+
+    def insert_role(self, role):
+        """Link a newly created role to itself and to every ancestor of its parent."""
+        links = [self.model(ancestor_id=role.pk, descendant_id=role.pk, depth=0)]
+        if role.parent_id:
+            links.extend(
+                self.model(ancestor_id=ancestor_id, descendant_id=role.pk, depth=depth + 1)
+                for ancestor_id, depth in self.filter(descendant_id=role.parent_id).values_list('ancestor_id', 'depth')
+            )
+        self.bulk_create(links, ignore_conflicts=True)
+
+    def move_role(self, role):
+        """Re-link the subtree rooted at ``role`` under its current parent."""
+        subtree = list(self.filter(ancestor_id=role.pk).values_list('descendant_id', 'depth'))
+        subtree_ids = [descendant_id for descendant_id, _ in subtree]
+        if role.parent_id in subtree_ids:
+            raise ValueError(f"Role {role.role_name} cannot be moved under its own descendant.")
+        with transaction.atomic():
+            self.filter(descendant_id__in=subtree_ids).exclude(ancestor_id__in=subtree_ids).delete()
+            if role.parent_id:
+                ancestors = list(self.filter(descendant_id=role.parent_id).values_list('ancestor_id', 'depth'))
+                self.bulk_create([
+                    self.model(ancestor_id=ancestor_id, descendant_id=descendant_id, depth=ancestor_depth + depth + 1)
+                    for ancestor_id, ancestor_depth in ancestors
+                    for descendant_id, depth in subtree
+                ])
+
+    def sync_role(self, role, created=False):
+        """Bring the closure rows for ``role`` in line with its parent pointer."""
+        if created or not self.filter(ancestor_id=role.pk, descendant_id=role.pk).exists():
+            self.insert_role(role)
+            return
+        linked_parent_id = self.filter(descendant_id=role.pk, depth=1).values_list('ancestor_id', flat=True).first()
+        if linked_parent_id != role.parent_id:
+            self.move_role(role)
+
+class RoleClosure(models.Model):
+    """
+    Materialized ancestor/descendant pairs of RoleHierarchy. Every role is linked
+    to itself at depth 0; rows disappear with either role through the cascade.
+    """
+    ancestor = models.ForeignKey(RoleHierarchy, on_delete=models.CASCADE, related_name='descendant_links')
+    descendant = models.ForeignKey(RoleHierarchy, on_delete=models.CASCADE, related_name='ancestor_links')
+    depth = models.PositiveIntegerField()
+
+    objects = RoleClosureManager()
+
+    class Meta:
+        unique_together = ('ancestor', 'descendant')
+        indexes = [
+            models.Index(fields=['descendant', 'depth'], name='users_roleclosure_desc_depth'),
+        ]
+
+    def __str__(self):
+        return f"{self.ancestor_id} -> {self.descendant_id} ({self.depth})"
+
+class RoleTreeVersion(models.Model):
+    """Single-row counter bumped on every RoleHierarchy change to invalidate cached role trees."""
+    version = models.PositiveBigIntegerField(default=0)
+
+    def __str__(self):
+        return str(self.version)
 
 class CustomUser(AbstractUser):
     _id = models.CharField(max_length=100, unique=True, blank=True)
@@ -70,6 +188,13 @@ class CustomUser(AbstractUser):
     USERNAME_FIELD = 'employee_id'
     REQUIRED_FIELDS = ['email']
 
+    class Meta(AbstractUser.Meta):
+        indexes = [
+            # Case-insensitive login and lookup by employee_id or email
+            models.Index(Upper('employee_id'), name='user_employee_id_upper_idx'),
+            models.Index(Upper('email'), name='user_email_upper_idx'),
+        ]
+
     def __str__(self):
         return self.employee_id
 
@@ -83,9 +208,17 @@ class CustomUser(AbstractUser):
 
     def get_allowed_roles(self):
         """Get all roles within the user's hierarchy tree."""
-        if not self.role:
+        if not self.role_id:
             return []
-        return [self.role] + self.role.get_all_descendants()
+        return get_role_tree().descendants(self.role_id, include_self=True)
+
+    def get_allowed_role_ids(self):
+        """Ids of the roles in the user's subtree, precomputed on JWT principals."""
+        if hasattr(self, 'allowed_role_ids'):
+            return self.allowed_role_ids
+        if not self.role_id:
+            return frozenset()
+        return get_role_tree().descendant_ids(self.role_id, include_self=True)
 
 class ModuleAccess(models.Model):
     module = models.CharField(max_length=50, unique=True)
@@ -109,6 +242,17 @@ class EmployeeDetail(models.Model):
     retirement = models.DateTimeField(blank=True, null=True)
     mno = models.CharField(max_length=15, blank=True, null=True)
 
+    class Meta:
+        # The directory's prefix search uses istartswith, which compiles to
+        # UPPER(col) LIKE UPPER('q%') on PostgreSQL; pattern ops let a btree
+        # over the same expression serve it as a range scan.
+        indexes = [
+            models.Index(OpClass(Upper('employee_id'), name='varchar_pattern_ops'), name='employee_id_prefix_idx'),
+            models.Index(OpClass(Upper('name'), name='varchar_pattern_ops'), name='employee_name_prefix_idx'),
+            models.Index(OpClass(Upper('email'), name='varchar_pattern_ops'), name='employee_email_prefix_idx'),
+            models.Index(OpClass(Upper('position'), name='varchar_pattern_ops'), name='employee_position_prefix_idx'),
+        ]
+
     def __str__(self):
         return self.employee_id
 
@@ -12,5 +12,5 @@ class HierarchyPermission(permissions.BasePermission):
         Only allow access if the object belongs to the user's subtree.
         """
         if hasattr(obj, 'role'):
-            return obj.role in request.user.get_allowed_roles()
+            return obj.role_id in request.user.get_allowed_role_ids()
         return False
\ No newline at end of file
@@ -0,0 +1,108 @@
+# users/role_tree.py
+import copy
+import threading
+from django.db import models
+from core.cache import bump_model_version
+
+_lock = threading.Lock()
+_tree = None
+
+class RoleTree:
+    """
+    Immutable in-memory snapshot of the RoleHierarchy tree, shared by every
+    request served from this worker until the stored version changes.
+    """
+    FIELDS = ['id', 'role_name', 'parent_id', 'permissions']
+
+    def __init__(self, version, rows):
+        self.version = version
+        self.rows = {row[0]: row for row in rows}
+        self.names = {role_id: row[1] for role_id, row in self.rows.items()}
+        self.parents = {role_id: row[2] for role_id, row in self.rows.items()}
+        self.children = {role_id: [] for role_id in self.rows}
+        for role_id, parent_id in sorted(self.parents.items()):
+            if parent_id in self.children:
+                self.children[parent_id].append(role_id)
+
+        self.ancestors = {}
+        for role_id in self.rows:
+            chain, parent_id = [], self.parents[role_id]
+            while parent_id in self.rows and parent_id not in chain and parent_id != role_id:
+                chain.append(parent_id)
+                parent_id = self.parents[parent_id]
+            self.ancestors[role_id] = tuple(chain)
+
+        descendants = {role_id: [] for role_id in self.rows}
+        for role_id, chain in self.ancestors.items():
+            for ancestor_id in chain:
+                descendants[ancestor_id].append(role_id)
+        self.descendant_sets = {role_id: frozenset(ids) for role_id, ids in descendants.items()}
+        self.ancestor_sets = {role_id: frozenset(chain) for role_id, chain in self.ancestors.items()}
+        self.depths = {role_id: len(chain) for role_id, chain in self.ancestors.items()}
+
+    def role(self, role_id):
+        """Build a fresh RoleHierarchy instance from the cached row."""
+        from .models import RoleHierarchy
+        role_id, role_name, parent_id, permissions = self.rows[role_id]
+        return RoleHierarchy.from_db('default', self.FIELDS, (role_id, role_name, parent_id, copy.deepcopy(permissions)))
+
+    def descendant_ids(self, role_id, include_self=False):
+        ids = self.descendant_sets.get(role_id, frozenset())
+        return ids | {role_id} if include_self and role_id in self.rows else ids
+
+    def ancestor_ids(self, role_id):
+        return self.ancestor_sets.get(role_id, frozenset())
+
+    def descendants(self, role_id, include_self=False):
+        """Descendant roles ordered by depth, then id."""
+        ids = sorted(self.descendant_ids(role_id, include_self), key=lambda i: (self.depths[i], i))
+        return [self.role(i) for i in ids]
+
+    def hierarchy(self, role_id):
+        """Role names from ``role_id`` up to the root."""
+        return [self.names[i] for i in (role_id,) + self.ancestors.get(role_id, ())]
+
+    def children_by_name(self):
+        """Map every role name to the sorted names of its direct children."""
+        return {
+            self.names[role_id]: sorted(self.names[child_id] for child_id in child_ids)
+            for role_id, child_ids in self.children.items()
+        }
+
+    def members_by_parent_name(self):
+        """Map each parent role name (None for roots) to its children's names."""
+        hierarchy = {}
+        for role_id in sorted(self.rows):
+            parent_id = self.parents[role_id]
+            hierarchy.setdefault(self.names.get(parent_id), []).append(self.names[role_id])
+        return hierarchy
+
+def current_version():
+    from .models import RoleTreeVersion
+    return RoleTreeVersion.objects.filter(pk=1).values_list('version', flat=True).first() or 0
+
+def get_role_tree():
+    """Return the cached tree, reloading it when the stored version has moved on."""
+    global _tree
+    from .models import RoleHierarchy
+    version = current_version()
+    tree = _tree
+    if tree is None or tree.version != version:
+        with _lock:
+            tree = _tree
+            if tree is None or tree.version != version:
+                tree = RoleTree(version, RoleHierarchy.objects.values_list(*RoleTree.FIELDS))
+                _tree = tree
+    return tree
+
+def bump_role_tree_version():
+    """
+    Record a role change so every worker reloads its tree on next use and
+    cached JWT principals, which carry subtree role ids, are dropped.
+    """
+    global _tree
+    from .models import RoleHierarchy, RoleTreeVersion
+    if not RoleTreeVersion.objects.filter(pk=1).update(version=models.F('version') + 1):
+        RoleTreeVersion.objects.get_or_create(pk=1, defaults={'version': 1})
+    bump_model_version(RoleHierarchy)
+    _tree = None
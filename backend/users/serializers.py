@@ -1,8 +1,13 @@
 # backend/users/serializers.py
 from rest_framework import serializers
-from django.contrib.auth import get_user_model, authenticate
+from django.contrib.auth import get_user_model
+from django.contrib.auth.models import update_last_login
+from django.contrib.auth.signals import user_login_failed
 from rest_framework_simplejwt.serializers import TokenObtainPairSerializer
+from rest_framework_simplejwt.settings import api_settings as jwt_settings
+from .authentication import CustomAuthBackend
 from .models import RoleHierarchy, CustomUser, EmployeeDetail
+from core.serializers import DynamicFieldsMixin, TimedSerializerMixin
 
 User = get_user_model()
 
@@ -10,33 +15,33 @@ class CustomTokenObtainPairSerializer(TokenObtainPairSerializer):
     employee_id = serializers.CharField()  # Input field for employee_id or email
 
     def validate(self, attrs):
-        identifier = attrs.get('employee_id')
-        password = attrs.get('password')
-        user = None
-        try:
-            user = User.objects.get(employee_id=identifier)
-        except User.DoesNotExist:
-            try:
-                user = User.objects.get(email=identifier)
-            except User.DoesNotExist:
-                raise serializers.ValidationError('No active account found with the given credentials')
-        credentials = {'employee_id': user.employee_id, 'password': password}
-        user = authenticate(request=self.context.get('request'), **credentials)
+        # Resolve the user and check the password once, then mint one token
+        # pair; TokenObtainPairSerializer.validate would authenticate again.
+        request = self.context.get('request')
+        user = CustomAuthBackend().authenticate(request, employee_id=attrs.get('employee_id'), password=attrs.get('password'))
         if not user:
+            user_login_failed.send(sender=__name__, credentials={'employee_id': attrs.get('employee_id')}, request=request)
             raise serializers.ValidationError('No active account found with the given credentials')
-        data = super().validate(attrs)
         refresh = self.get_token(user)
-        data['refresh'] = str(refresh)
-        data['access'] = str(refresh.access_token)
-        data['user'] = {
+        if jwt_settings.UPDATE_LAST_LOGIN:
+            update_last_login(None, user)
+        return {
+            'refresh': str(refresh),
+            'access': str(refresh.access_token),
+            'user': self.user_data(user),
+        }
+
+    @staticmethod
+    def user_data(user):
+        return {
             '_id': user._id,
             'name': user.name,
             'email': user.email,
             'employeeId': user.employee_id,
             'role': {
-                'id': user.role.id if user.role else None,
-                'role_name': user.role.role_name if user.role else None,
-                'parent': user.role.parent_id if user.role and user.role.parent else None
+                'id': user.role.id,
+                'role_name': user.role.role_name,
+                'parent': user.role.parent_id
             } if user.role else None,
             'department': user.department,
             'phoneNumber': user.phone,
@@ -45,9 +50,8 @@ class CustomTokenObtainPairSerializer(TokenObtainPairSerializer):
             'otpEnabled': user.otp_enabled,
             'permissions': user.permissions or []
         }
-        return data
 
-class RoleSerializer(serializers.ModelSerializer):
+class RoleSerializer(DynamicFieldsMixin, serializers.ModelSerializer):
     id = serializers.IntegerField(source='pk')
     role_name = serializers.CharField()
     parent = serializers.PrimaryKeyRelatedField(queryset=RoleHierarchy.objects.all(), allow_null=True)
@@ -56,7 +60,7 @@ class RoleSerializer(serializers.ModelSerializer):
         model = RoleHierarchy
         fields = ['id', 'role_name', 'parent']
 
-class UserSerializer(serializers.ModelSerializer):
+class UserSerializer(DynamicFieldsMixin, serializers.ModelSerializer):
     _id = serializers.CharField(source='employee_id')
     employeeId = serializers.CharField(source='employee_id')
     name = serializers.CharField(allow_null=True)
@@ -74,6 +78,8 @@ class UserSerializer(serializers.ModelSerializer):
         required=False
     )
 
+    select_related_fields = {'role': ['role']}
+
     class Meta:
         model = CustomUser
         fields = [
@@ -97,7 +103,7 @@ class UserSerializer(serializers.ModelSerializer):
         instance.save()
         return instance
 
-class EmployeeByIdSerializer(serializers.ModelSerializer):
+class EmployeeByIdSerializer(DynamicFieldsMixin, serializers.ModelSerializer):
     _id = serializers.CharField(source='employee_id')
     employeeId = serializers.CharField(source='employee_id')
     name = serializers.CharField()
@@ -119,7 +125,7 @@ class EmployeeByIdSerializer(serializers.ModelSerializer):
     def get_role(self, obj):
         return obj.role.role_name if obj.role and hasattr(obj, 'role') else 'member'
 
-class RegisterSerializer(serializers.ModelSerializer):
+class RegisterSerializer(TimedSerializerMixin, serializers.ModelSerializer):
     role = serializers.PrimaryKeyRelatedField(queryset=RoleHierarchy.objects.all(), required=True)
 
     class Meta:
@@ -146,7 +152,7 @@ class ResetPasswordSerializer(serializers.Serializer):
     token = serializers.CharField()
     password = serializers.CharField(write_only=True)
 
-class EmployeeDetailSerializer(serializers.ModelSerializer):
+class EmployeeDetailSerializer(DynamicFieldsMixin, serializers.ModelSerializer):
     class Meta:
         model = EmployeeDetail
         fields = ['employee_id', 'name', 'email', 'position', 'level', 'service', 'group', 'qualification', 'seniority', 'retirement', 'mno']
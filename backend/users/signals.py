@@ -0,0 +1,27 @@
+# users/signals.py
+from django.db.models.signals import post_save, post_delete
+from django.dispatch import receiver
+from .authentication import invalidate_principal
+from .models import CustomUser, RoleHierarchy, RoleClosure
+from .role_tree import bump_role_tree_version
+
+@receiver(post_save, sender=RoleHierarchy)
+def sync_role_closure(sender, instance, created, raw=False, **kwargs):
+    # Fixture loads skip this; run `manage.py rebuild_role_closure` afterwards.
+    # Deleted roles drop their closure rows through the ForeignKey cascade.
+    if raw:
+        return
+    RoleClosure.objects.sync_role(instance, created=created)
+    bump_role_tree_version()
+
+@receiver(post_delete, sender=RoleHierarchy)
+def invalidate_role_tree(sender, instance, **kwargs):
+    bump_role_tree_version()
+
+@receiver(post_save, sender=CustomUser)
+@receiver(post_delete, sender=CustomUser)
+def invalidate_cached_principal(sender, instance, update_fields=None, **kwargs):
+    # A login only touches last_login
+    if update_fields is not None and set(update_fields) <= {'last_login'}:
+        return
+    invalidate_principal(instance.pk)
@@ -0,0 +1,86 @@
+from unittest import skipUnless
+from django.core.cache import cache
+from django.db import connection
+from django.test import TestCase
+from rest_framework import status
+from rest_framework.test import APITestCase
+from core.testing import QueryPlanMixin
+from .directory import search_employees
+from .models import CustomUser, EmployeeDetail
+
+class EmployeeDirectoryTest(APITestCase):
+    """
+    Test that the employee directory pages by cursor, prefix-searches each
+    column and has a compact typeahead mode.
+    """
+    url = '/api/users/employee-directory/'
+
+    def setUp(self):
+        cache.clear()
+        self.addCleanup(cache.clear)
+        EmployeeDetail.objects.bulk_create([
+            EmployeeDetail(employee_id='1001', name='Ram Sharma', email='ram@ntc.net.np', position='Engineer', level='7'),
+            EmployeeDetail(employee_id='1002', name='Sita Karki', email='sita@ntc.net.np', position='Manager', level='9'),
+            EmployeeDetail(employee_id='2001', name='Ramesh Thapa', email='thapa@ntc.net.np', position='Engineer', level='6'),
+            EmployeeDetail(employee_id='2002', name='Hari Rai', email='hari@ntc.net.np', position='Accountant', level='5'),
+        ])
+        user = CustomUser.objects.create_user(employee_id='1001', email='ram@ntc.net.np', password='Nepal@123')
+        self.client.force_authenticate(user=user)
+
+    def ids(self, **params):
+        response = self.client.get(self.url, params)
+        self.assertEqual(response.status_code, status.HTTP_200_OK, response.data)
+        return [employee['employee_id'] for employee in response.data['data']['employees']]
+
+    def test_pages_follow_the_cursor(self):
+        first = self.client.get(self.url, {'page_size': 3}).data
+        self.assertEqual([e['employee_id'] for e in first['data']['employees']], ['1001', '1002', '2001'])
+        second = self.client.get(self.url, {'page_size': 3, 'cursor': first['next']}).data
+        self.assertEqual([e['employee_id'] for e in second['data']['employees']], ['2002'])
+        self.assertIsNone(second['next'])
+
+    def test_prefix_search_on_each_column(self):
+        self.assertEqual(self.ids(q='200'), ['2001', '2002'])
+        self.assertEqual(self.ids(q='ram'), ['1001', '2001'])
+        self.assertEqual(self.ids(q='SITA@'), ['1002'])
+        self.assertEqual(self.ids(q='acc'), ['2002'])
+        # Prefix, not substring
+        self.assertEqual(self.ids(q='arma'), [])
+
+    def test_typeahead_is_compact(self):
+        response = self.client.get(self.url, {'typeahead': 'true', 'q': 'eng', 'limit': 1})
+        self.assertEqual(response.data['data']['employees'], [
+            {'employee_id': '1001', 'name': 'Ram Sharma', 'position': 'Engineer'},
+        ])
+
+    def test_sparse_fields_on_pages(self):
+        response = self.client.get(self.url, {'fields': 'employee_id,level', 'page_size': 1})
+        self.assertEqual(response.data['data']['employees'], [{'employee_id': '1001', 'level': '7'}])
+
+    def test_invalid_parameters(self):
+        self.assertEqual(self.client.get(self.url, {'page_size': 'all'}).status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertEqual(self.client.get(self.url, {'cursor': '%%%'}).status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertEqual(
+            self.client.get(self.url, {'typeahead': '1', 'limit': 'x'}).status_code, status.HTTP_400_BAD_REQUEST
+        )
+
+@skipUnless(connection.vendor == 'postgresql', 'Pattern-ops expression indexes need PostgreSQL')
+class EmployeeDirectoryIndexTest(QueryPlanMixin, TestCase):
+    """
+    Test that prefix searches are served by the prefix indexes.
+    """
+    @classmethod
+    def setUpTestData(cls):
+        EmployeeDetail.objects.bulk_create(
+            EmployeeDetail(employee_id=f'{i:05}', name=f'Name {i}', email=f'{i}@ntc.net.np', position=f'Position {i % 50}')
+            for i in range(5000)
+        )
+        cls.analyze()
+
+    def test_name_prefix(self):
+        self.assertUsesIndex(EmployeeDetail.objects.filter(name__istartswith='name 42'), 'employee_name_prefix_idx')
+
+    def test_search_uses_every_column_index(self):
+        plan = search_employees('4213').explain()
+        for index in ('employee_id_prefix_idx', 'employee_name_prefix_idx', 'employee_email_prefix_idx', 'employee_position_prefix_idx'):
+            self.assertIn(index, plan)
@@ -0,0 +1,69 @@
+from unittest import skipUnless
+from django.db import connection
+from django.db.models import Q
+from django.test import TestCase
+from rest_framework import status
+from rest_framework.test import APITestCase
+from core.testing import QueryPlanMixin
+from .models import CustomUser
+
+class IdentityLookupTest(APITestCase):
+    """
+    Test that employee ids and emails are matched case-insensitively by every
+    identity path, preferring an exact-case match.
+    """
+    def setUp(self):
+        self.user = CustomUser.objects.create_user(employee_id='NTC1001', email='Ram.Sharma@ntc.net.np', password='Nepal@123')
+
+    def test_find_identity(self):
+        with self.assertNumQueries(1):
+            self.assertEqual(CustomUser.objects.find_identity('ntc1001'), self.user)
+        self.assertEqual(CustomUser.objects.find_identity('ram.sharma@NTC.net.np'), self.user)
+        self.assertIsNone(CustomUser.objects.find_identity('ntc1001', fields=['email']))
+        self.assertIsNone(CustomUser.objects.find_identity(''))
+
+    def test_exact_case_wins(self):
+        other = CustomUser.objects.create_user(employee_id='ntc1001', email='other@ntc.net.np', password='Nepal@123')
+        self.assertEqual(CustomUser.objects.find_identity('ntc1001'), other)
+        self.assertEqual(CustomUser.objects.find_identity('NTC1001'), self.user)
+        self.assertIsNone(CustomUser.objects.find_identity('Ntc1001'))
+
+    def test_natural_key(self):
+        self.assertEqual(CustomUser.objects.get_by_natural_key('ntc1001'), self.user)
+        with self.assertRaises(CustomUser.DoesNotExist):
+            CustomUser.objects.get_by_natural_key('NTC9999')
+
+    def test_login_with_mixed_case_email(self):
+        response = self.client.post('/api/token/', {'employee_id': 'RAM.SHARMA@ntc.net.np', 'password': 'Nepal@123'}, format='json')
+        self.assertEqual(response.status_code, status.HTTP_200_OK, response.data)
+
+    def test_employee_by_id(self):
+        self.client.force_authenticate(user=self.user)
+        response = self.client.get('/api/users/employee/ntc1001/')
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(self.client.get('/api/users/employee/NTC9999/').status_code, status.HTTP_404_NOT_FOUND)
+
+@skipUnless(connection.vendor == 'postgresql', 'EXPLAIN output is checked against PostgreSQL plans')
+class IdentityIndexTest(QueryPlanMixin, TestCase):
+    """
+    Test that case-insensitive identity lookups use the UPPER() indexes.
+    """
+    @classmethod
+    def setUpTestData(cls):
+        CustomUser.objects.bulk_create(
+            CustomUser(employee_id=f'E{i:05}', username=f'E{i:05}', _id=f'id-{i}', email=f'user{i}@ntc.net.np')
+            for i in range(5000)
+        )
+        cls.analyze()
+
+    def test_employee_id(self):
+        self.assertUsesIndex(CustomUser.objects.filter(employee_id__iexact='e00042'), 'user_employee_id_upper_idx')
+
+    def test_email(self):
+        self.assertUsesIndex(CustomUser.objects.filter(email__iexact='USER42@ntc.net.np'), 'user_email_upper_idx')
+
+    def test_login_lookup(self):
+        # find_identity ORs both lookups, which PostgreSQL answers with a BitmapOr of the two indexes
+        plan = CustomUser.objects.filter(Q(employee_id__iexact='e00042') | Q(email__iexact='e00042')).explain()
+        self.assertIn('user_employee_id_upper_idx', plan)
+        self.assertIn('user_email_upper_idx', plan)
@@ -0,0 +1,134 @@
+import csv
+import os
+import shutil
+import tempfile
+from io import StringIO
+from unittest import mock
+import pandas as pd
+from django.core.management import call_command
+from django.test import TestCase
+from . import employee_import
+from .models import EmployeeDetail
+
+class ImportUsersCommandTest(TestCase):
+    """
+    Test that import_users cleans, de-duplicates and upserts the roster in bulk.
+    """
+    def setUp(self):
+        self.folder = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, self.folder)
+
+    def workbook(self, rows):
+        path = os.path.join(self.folder, 'roster.xlsx')
+        pd.DataFrame(rows).to_excel(path, index=False)
+        return path
+
+    def row(self, eno, name, **extra):
+        return {
+            'eno': eno, 'Name': name, 'Position': ' Engineer ', 'Level': '7', 'Service': 'Technical',
+            'Group': 'Telecom', 'Qualification': 'BE', 'Seniority': '2015-04-01', 'Retirement': None,
+            'mno': '9851000000', **extra
+        }
+
+    def run_import(self, path, *args):
+        out = StringIO()
+        call_command('import_users', path, *args, stdout=out)
+        return out.getvalue()
+
+    def test_cleans_columns_and_resolves_email_collisions(self):
+        path = self.workbook([
+            self.row('1001', '  Ram  Bahadur Sharma '),
+            self.row('1002', 'Ram Sharma'),
+            self.row('1003', 'Sita Karki', Position='nan'),
+            self.row(None, 'No Id'),
+        ])
+        output = self.run_import(path)
+        self.assertIn('Empty or invalid employee_id', output)
+        self.assertEqual(EmployeeDetail.objects.count(), 3)
+        first, second, third = EmployeeDetail.objects.order_by('employee_id')
+        self.assertEqual(first.email, 'ram.sharma@ntc.net.np')
+        self.assertEqual(first.name, 'Ram  Bahadur Sharma')
+        self.assertEqual(first.position, 'Engineer')
+        self.assertEqual(first.seniority.year, 2015)
+        self.assertIsNone(first.retirement)
+        self.assertEqual(second.email, 'ram.sharma1002@ntc.net.np')
+        self.assertIsNone(third.position)
+
+    def test_reimport_updates_in_place_and_keeps_emails(self):
+        self.run_import(self.workbook([self.row('1001', 'Ram Sharma'), self.row('1002', 'Ram Sharma')]))
+        with self.assertNumQueries(4):
+            self.run_import(self.workbook([self.row('1001', 'Ram Sharma', Level='8'), self.row('1002', 'Ram Sharma')]))
+        self.assertEqual(
+            list(EmployeeDetail.objects.order_by('employee_id').values_list('email', 'level')),
+            [('ram.sharma@ntc.net.np', '8'), ('ram.sharma1002@ntc.net.np', '7')]
+        )
+
+    def test_upsert_is_batched(self):
+        path = self.workbook([self.row(str(2000 + i), f'Staff Member{i}') for i in range(25)])
+        with self.assertNumQueries(1 + 3 + 2):
+            self.run_import(path, '--batch-size', '10')
+        self.assertEqual(EmployeeDetail.objects.count(), 25)
+
+    def test_dry_run_reports_diff_without_writing(self):
+        self.run_import(self.workbook([self.row('1001', 'Ram Sharma')]))
+        output = self.run_import(
+            self.workbook([self.row('1001', 'Ram Sharma', Level='8'), self.row('1002', 'Sita Karki')]), '--dry-run'
+        )
+        self.assertIn('Would create employee: 1002', output)
+        self.assertIn("Would update employee: 1001 (level: '7' -> '8')", output)
+        self.assertIn('1 to create, 1 to update, 0 unchanged', output)
+        self.assertEqual(EmployeeDetail.objects.count(), 1)
+        self.assertEqual(EmployeeDetail.objects.get().level, '7')
+
+    def csv_file(self, rows):
+        path = os.path.join(self.folder, 'roster.csv')
+        with open(path, 'w', newline='') as f:
+            writer = csv.DictWriter(f, fieldnames=list(rows[0]))
+            writer.writeheader()
+            writer.writerows(rows)
+        return path
+
+    def test_csv_is_imported_in_chunks(self):
+        path = self.csv_file([self.row(str(3000 + i), f'Staff Member{i}') for i in range(7)])
+        output = self.run_import(path, '--chunk-size', '3')
+        self.assertEqual(output.count('Committed through row'), 3)
+        self.assertIn('Committed through row 6 (7 employees imported)', output)
+        self.assertEqual(EmployeeDetail.objects.count(), 7)
+        self.assertFalse(os.path.exists(f'{path}.import-checkpoint.json'))
+
+    def test_failed_import_resumes_after_last_committed_chunk(self):
+        path = self.workbook([self.row(str(4000 + i), f'Staff Member{i}') for i in range(7)])
+        upsert = employee_import.upsert
+        calls = []
+
+        def failing_upsert(rows, batch_size):
+            calls.append(list(rows['employee_id']))
+            if len(calls) == 2:
+                raise RuntimeError('database went away')
+            return upsert(rows, batch_size)
+
+        with mock.patch.object(employee_import, 'upsert', failing_upsert):
+            output = self.run_import(path, '--chunk-size', '3')
+        self.assertIn('Re-run with --resume', output)
+        self.assertEqual(EmployeeDetail.objects.count(), 3)
+
+        calls.clear()
+        with mock.patch.object(employee_import, 'upsert', side_effect=lambda rows, size: calls.append(list(rows['employee_id'])) or upsert(rows, size)):
+            output = self.run_import(path, '--chunk-size', '3', '--resume')
+        self.assertIn('Resuming after row 2', output)
+        self.assertEqual(calls, [['4003', '4004', '4005'], ['4006']])
+        self.assertEqual(EmployeeDetail.objects.count(), 7)
+
+    def test_checkpoint_ignored_when_file_changes(self):
+        path = self.workbook([self.row('1001', 'Ram Sharma')])
+        employee_import.Checkpoint(path).save(1)
+        self.workbook([self.row('1001', 'Ram Sharma'), self.row('1002', 'Sita Karki')])
+        os.utime(path, (0, 0))
+        self.run_import(path, '--resume')
+        self.assertEqual(EmployeeDetail.objects.count(), 2)
+
+    def test_rows_are_streamed_from_workbook(self):
+        path = self.workbook([self.row('1001', 'Ram Sharma')])
+        with mock.patch.object(employee_import, 'load_workbook', wraps=employee_import.load_workbook) as load:
+            self.run_import(path)
+        self.assertTrue(load.call_args.kwargs['read_only'])
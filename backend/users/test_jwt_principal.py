@@ -0,0 +1,136 @@
+import os
+import tempfile
+from io import StringIO
+from unittest import mock
+from django.core.cache import cache
+from django.core.management import call_command
+from django.db import connection
+from django.test import RequestFactory, TestCase, override_settings
+from django.test.utils import CaptureQueriesContext
+from rest_framework import status
+from rest_framework.test import APIClient
+from rest_framework_simplejwt.exceptions import AuthenticationFailed
+from rest_framework_simplejwt.settings import api_settings as jwt_settings
+from rest_framework_simplejwt.tokens import AccessToken, RefreshToken
+from procurement.models import ProcurementPlan
+from .authentication import CachedJWTAuthentication
+from .models import CustomUser, RoleHierarchy
+from .utils import scope_to_hierarchy
+
+# Stands in for Redis/Memcached: shared by every process on the host
+SHARED_CACHES = {'default': {
+    'BACKEND': 'django.core.cache.backends.filebased.FileBasedCache',
+    'LOCATION': os.path.join(tempfile.gettempdir(), 'principal-cache-test'),
+}}
+
+@override_settings(PRINCIPAL_CACHE_TTL=60, CACHES=SHARED_CACHES)
+class CachedPrincipalTest(TestCase):
+    """
+    Test that JWT principals are served from the cache and dropped when the
+    user or the role tree changes.
+    """
+    def setUp(self):
+        cache.clear()
+        self.addCleanup(cache.clear)
+        self.md_role = RoleHierarchy.objects.create(role_name='MD')
+        self.director_role = RoleHierarchy.objects.create(role_name='DIRECTOR', parent=self.md_role)
+        self.user = CustomUser.objects.create_user(
+            employee_id='1001', email='1001@ntc.net.np', password='Nepal@123', role=self.md_role
+        )
+        self.token = str(RefreshToken.for_user(self.user).access_token)
+
+    def authenticate(self):
+        request = RequestFactory().get('/', HTTP_AUTHORIZATION=f'Bearer {self.token}')
+        user, _ = CachedJWTAuthentication().authenticate(request)
+        return user
+
+    def test_repeat_requests_cost_no_queries(self):
+        # The user with their role, then the subtree ids
+        with self.assertNumQueries(2):
+            self.authenticate()
+        with self.assertNumQueries(0):
+            user = self.authenticate()
+            self.assertEqual(user.role.role_name, 'MD')
+            self.assertEqual(user.get_allowed_role_ids(), {self.md_role.id, self.director_role.id})
+        self.assertEqual(user.pk, '1001')
+        self.assertTrue(user.is_authenticated)
+
+    def test_role_change_invalidates(self):
+        self.authenticate()
+        self.user.role = self.director_role
+        self.user.save()
+        user = self.authenticate()
+        self.assertEqual(user.role.role_name, 'DIRECTOR')
+        self.assertEqual(user.get_allowed_role_ids(), {self.director_role.id})
+
+    def test_deactivation_invalidates(self):
+        self.authenticate()
+        self.user.is_active = False
+        self.user.save()
+        with self.assertRaises(AuthenticationFailed):
+            self.authenticate()
+
+    def test_role_tree_change_invalidates(self):
+        self.authenticate()
+        manager_role = RoleHierarchy.objects.create(role_name='MANAGER', parent=self.director_role)
+        self.assertIn(manager_role.id, self.authenticate().get_allowed_role_ids())
+
+    def test_last_login_does_not_invalidate(self):
+        self.authenticate()
+        self.user.save(update_fields=['last_login'])
+        with self.assertNumQueries(0):
+            self.authenticate()
+
+    def cached_principal(self):
+        return cache.get(f"jwt-principal:{AccessToken(self.token)['jti']}")
+
+    def test_secrets_are_not_cached(self):
+        CustomUser.objects.filter(pk=self.user.pk).update(reset_token='reset-secret')
+        self.authenticate()
+        cached = repr(self.cached_principal())
+        self.assertNotIn(self.user.password, cached)
+        self.assertNotIn('reset-secret', cached)
+
+    def test_revoke_check_uses_cached_digest(self):
+        with mock.patch.object(jwt_settings, 'CHECK_REVOKE_TOKEN', True):
+            self.token = str(RefreshToken.for_user(self.user).access_token)
+            self.authenticate()
+            self.assertNotIn(self.user.password, repr(self.cached_principal()))
+            with self.assertNumQueries(0):
+                self.authenticate()
+            self.user.set_password('Changed@123')
+            self.user.save()
+            with self.assertRaises(AuthenticationFailed):
+                self.authenticate()
+
+    def test_closure_rebuild_invalidates(self):
+        self.authenticate()
+        # Reparent without signals, as a fixture load would
+        RoleHierarchy.objects.filter(pk=self.director_role.pk).update(parent=None)
+        call_command('rebuild_role_closure', stdout=StringIO())
+        self.assertEqual(self.authenticate().get_allowed_role_ids(), {self.md_role.id})
+
+    def test_scoping_uses_cached_role_ids(self):
+        user = self.authenticate()
+        with CaptureQueriesContext(connection) as ctx:
+            list(scope_to_hierarchy(ProcurementPlan.objects.all(), user))
+        self.assertNotIn('roleclosure', ctx.captured_queries[0]['sql'].lower())
+
+    @override_settings(PRINCIPAL_CACHE_TTL=0)
+    def test_cache_can_be_disabled(self):
+        self.authenticate()
+        with self.assertNumQueries(2):
+            self.authenticate()
+
+    @override_settings(CACHES={'default': {'BACKEND': 'django.core.cache.backends.locmem.LocMemCache'}})
+    def test_per_process_cache_is_not_used(self):
+        self.authenticate()
+        with self.assertNumQueries(2):
+            self.authenticate()
+
+    def test_cached_request_end_to_end(self):
+        client = APIClient()
+        client.credentials(HTTP_AUTHORIZATION=f'Bearer {self.token}')
+        self.assertEqual(client.get('/api/users/roles/').status_code, status.HTTP_200_OK)
+        with self.assertNumQueries(0):
+            self.assertEqual(client.get('/api/users/roles/').status_code, status.HTTP_200_OK)
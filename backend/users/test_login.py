@@ -0,0 +1,64 @@
+from io import StringIO
+from unittest import mock
+from django.contrib.auth import base_user
+from django.core.management import call_command
+from rest_framework import status
+from rest_framework.test import APITestCase
+from .authentication import CustomAuthBackend
+from .models import CustomUser, RoleHierarchy
+
+class LoginTest(APITestCase):
+    """
+    Test that a login resolves the user once, checks the password once and
+    returns a single token pair.
+    """
+    url = '/api/token/'
+
+    def setUp(self):
+        self.role = RoleHierarchy.objects.create(role_name='MD')
+        self.user = CustomUser.objects.create_user(
+            employee_id='NTC1001', email='ram@ntc.net.np', password='Nepal@123', role=self.role
+        )
+
+    def login(self, identifier, password='Nepal@123'):
+        with mock.patch.object(base_user, 'check_password', wraps=base_user.check_password) as check_password:
+            response = self.client.post(self.url, {'employee_id': identifier, 'password': password}, format='json')
+        return response, check_password.call_count
+
+    def test_login_hashes_once(self):
+        with self.assertNumQueries(2):
+            # The user with their role, then last_login
+            response, hashes = self.login('NTC1001')
+        self.assertEqual(response.status_code, status.HTTP_200_OK, response.data)
+        self.assertEqual(hashes, 1)
+        self.assertEqual(set(response.data), {'refresh', 'access', 'user'})
+        self.assertEqual(response.data['user']['role'], {'id': self.role.id, 'role_name': 'MD', 'parent': None})
+
+    def test_identifier_variants(self):
+        self.assertEqual(self.login('ntc1001')[0].status_code, status.HTTP_200_OK)
+        self.assertEqual(self.login('ram@ntc.net.np')[0].status_code, status.HTTP_200_OK)
+
+    def test_failed_logins_hash_once(self):
+        response, hashes = self.login('NTC1001', 'wrong')
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertEqual(hashes, 1)
+        with mock.patch('django.contrib.auth.base_user.make_password', wraps=base_user.make_password) as make_password:
+            response, _ = self.login('NTC9999')
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertEqual(make_password.call_count, 1)
+
+    def test_unknown_user_is_hashed_without_password(self):
+        with mock.patch('django.contrib.auth.base_user.make_password', wraps=base_user.make_password) as make_password:
+            self.assertIsNone(CustomAuthBackend().authenticate(None, employee_id='NTC9999', password=None))
+        make_password.assert_called_once_with('')
+
+    def test_inactive_users_are_refused(self):
+        self.user.is_active = False
+        self.user.save()
+        self.assertEqual(self.login('NTC1001')[0].status_code, status.HTTP_400_BAD_REQUEST)
+
+    def test_benchmark_command(self):
+        out = StringIO()
+        call_command('benchmark_login', requests=3, stdout=out)
+        self.assertIn('1.00 password hashes', out.getvalue())
+        self.assertFalse(CustomUser.objects.filter(employee_id='bench-login').exists())
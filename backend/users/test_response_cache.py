@@ -0,0 +1,73 @@
+import pandas as pd
+from django.core.cache import cache
+from rest_framework import status
+from rest_framework.test import APITestCase
+from . import employee_import
+from .models import CustomUser, EmployeeDetail, RoleHierarchy
+
+class ResponseCacheTest(APITestCase):
+    """
+    Test that reference endpoints are served from the response cache, answer
+    If-None-Match with 304 and are invalidated when their models change.
+    """
+    def setUp(self):
+        cache.clear()
+        self.addCleanup(cache.clear)
+        self.superadmin_role = RoleHierarchy.objects.create(role_name='SUPERADMIN')
+        self.md_role = RoleHierarchy.objects.create(role_name='MD', parent=self.superadmin_role)
+        self.user = CustomUser.objects.create_user(
+            employee_id='1001', email='1001@ntc.net.np', password='Nepal@123', role=self.md_role
+        )
+        EmployeeDetail.objects.create(employee_id='1001', name='Ram Sharma', email='1001@ntc.net.np')
+        self.client.force_authenticate(user=self.user)
+
+    def test_repeat_requests_are_served_from_cache(self):
+        first = self.client.get('/api/users/roles/')
+        self.assertEqual(first.status_code, status.HTTP_200_OK)
+        self.assertIn('ETag', first)
+        self.assertIn('Last-Modified', first)
+        with self.assertNumQueries(0):
+            second = self.client.get('/api/users/roles/')
+        self.assertEqual(second.data, first.data)
+        self.assertEqual(second['ETag'], first['ETag'])
+
+    def test_if_none_match_returns_not_modified(self):
+        etag = self.client.get('/api/users/employee-details/')['ETag']
+        response = self.client.get('/api/users/employee-details/', HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, status.HTTP_304_NOT_MODIFIED)
+        self.assertEqual(response.content, b'')
+
+    def test_plain_view_is_cached(self):
+        first = self.client.get('/api/users/role-hierarchy/')
+        self.assertEqual(first.json(), {'SUPERADMIN': ['MD'], 'MD': []})
+        with self.assertNumQueries(0):
+            second = self.client.get('/api/users/role-hierarchy/')
+        self.assertEqual(second.json(), first.json())
+        self.assertEqual(second['Content-Type'], 'application/json')
+
+    def test_saves_and_deletes_invalidate(self):
+        etag = self.client.get('/api/users/role-hierarchy/')['ETag']
+        role = RoleHierarchy.objects.create(role_name='DIRECTOR', parent=self.md_role)
+        response = self.client.get('/api/users/role-hierarchy/', HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response.json()['MD'], ['DIRECTOR'])
+        role.delete()
+        self.assertEqual(self.client.get('/api/users/role-hierarchy/').json()['MD'], [])
+
+    def test_bulk_import_invalidates(self):
+        self.client.get('/api/users/employee-details/')
+        rows = pd.DataFrame([{'employee_id': '1002', 'name': 'Sita Karki', 'email': '1002@ntc.net.np'}])
+        employee_import.upsert(rows.reindex(columns=employee_import.FIELDS), 100)
+        response = self.client.get('/api/users/employee-details/')
+        self.assertEqual(sorted(e['employee_id'] for e in response.data), ['1001', '1002'])
+
+    def test_query_string_is_part_of_the_key(self):
+        self.assertNotEqual(
+            self.client.get('/api/users/roles/?unused=1')['ETag'], self.client.get('/api/users/roles/')['ETag']
+        )
+
+    def test_errors_are_not_cached(self):
+        self.client.force_authenticate(user=None)
+        self.assertEqual(self.client.get('/api/users/roles/').status_code, status.HTTP_401_UNAUTHORIZED)
+        self.client.force_authenticate(user=self.user)
+        self.assertEqual(self.client.get('/api/users/roles/').status_code, status.HTTP_200_OK)
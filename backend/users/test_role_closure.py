@@ -0,0 +1,58 @@
+from io import StringIO
+from django.core.management import call_command
+from django.test import TestCase
+from .models import CustomUser, RoleHierarchy, RoleClosure
+
+class RoleClosureTest(TestCase):
+    """
+    Test that the closure table tracks the role tree through saves, moves and deletes.
+    """
+    def setUp(self):
+        self.ntc = RoleHierarchy.objects.create(role_name='NTC')
+        self.cto = RoleHierarchy.objects.create(role_name='CTO', parent=self.ntc)
+        self.coo = RoleHierarchy.objects.create(role_name='COO', parent=self.ntc)
+        self.btd = RoleHierarchy.objects.create(role_name='BTD', parent=self.cto)
+        self.civil = RoleHierarchy.objects.create(role_name='CIVIL', parent=self.btd)
+
+    def links(self):
+        return set(RoleClosure.objects.values_list('ancestor_id', 'descendant_id', 'depth'))
+
+    def test_descendants_follow_tree(self):
+        self.assertEqual(self.ntc.get_all_descendants(), [self.cto, self.coo, self.btd, self.civil])
+        self.assertEqual(self.cto.get_all_descendants(), [self.btd, self.civil])
+        self.assertEqual(self.civil.get_all_descendants(), [])
+
+    def test_allowed_roles_start_with_own_role(self):
+        user = CustomUser.objects.create_user(employee_id='1001', email='cto@ntc.net.np', password='Nepal@123', role=self.cto)
+        self.assertEqual(user.get_allowed_roles(), [self.cto, self.btd, self.civil])
+
+    def test_moving_subtree_relinks_descendants(self):
+        self.btd.parent = self.coo
+        self.btd.save()
+        self.assertEqual(self.cto.get_all_descendants(), [])
+        self.assertEqual(self.coo.get_all_descendants(), [self.btd, self.civil])
+        self.assertIn((self.ntc.id, self.civil.id, 3), self.links())
+
+    def test_moving_under_descendant_is_rejected(self):
+        self.cto.parent = self.civil
+        with self.assertRaises(ValueError):
+            self.cto.save()
+        self.cto.refresh_from_db()
+        self.assertEqual(self.cto.parent, self.ntc)
+
+    def test_deleting_role_drops_links(self):
+        self.btd.delete()
+        self.assertFalse(RoleClosure.objects.filter(descendant_id=self.civil.id).exists())
+        self.assertEqual(self.ntc.get_all_descendants(), [self.cto, self.coo])
+
+    def test_rebuild_matches_incremental_links(self):
+        self.btd.parent = self.coo
+        self.btd.save()
+        incremental = self.links()
+        call_command('rebuild_role_closure', stdout=StringIO())
+        self.assertEqual(self.links(), incremental)
+
+    def test_subtree_ids_inlines_as_subquery(self):
+        with self.assertNumQueries(1):
+            names = set(RoleHierarchy.objects.filter(id__in=self.cto.subtree_ids()).values_list('role_name', flat=True))
+        self.assertEqual(names, {'CTO', 'BTD', 'CIVIL'})
@@ -0,0 +1,50 @@
+import json
+from django.db.models import F
+from django.test import TestCase, RequestFactory
+from .models import CustomUser, RoleHierarchy, RoleTreeVersion
+from .role_tree import get_role_tree
+from .utils import get_role_hierarchy
+from .views import view_role_hierarchy
+
+class RoleTreeCacheTest(TestCase):
+    """
+    Test that the in-memory role tree is reused until the stored version changes.
+    """
+    def setUp(self):
+        self.ntc = RoleHierarchy.objects.create(role_name='NTC')
+        self.cto = RoleHierarchy.objects.create(role_name='CTO', parent=self.ntc)
+        self.coo = RoleHierarchy.objects.create(role_name='COO', parent=self.ntc)
+        self.btd = RoleHierarchy.objects.create(role_name='BTD', parent=self.cto)
+
+    def test_warm_tree_costs_version_check_only(self):
+        get_role_tree()
+        with self.assertNumQueries(1):
+            self.assertEqual(self.ntc.get_all_descendants(), [self.cto, self.coo, self.btd])
+        with self.assertNumQueries(1):
+            self.assertEqual(self.btd.get_hierarchy(), ['BTD', 'CTO', 'NTC'])
+
+    def test_role_save_invalidates_tree(self):
+        self.assertEqual(self.coo.get_all_descendants(), [])
+        RoleHierarchy.objects.create(role_name='P1', parent=self.coo)
+        self.assertEqual([r.role_name for r in self.coo.get_all_descendants()], ['P1'])
+
+    def test_version_bump_from_other_worker_reloads_tree(self):
+        get_role_tree()
+        # Simulate another process: change the rows and bump the counter without signals.
+        RoleHierarchy.objects.filter(pk=self.btd.pk).update(parent=self.coo)
+        RoleTreeVersion.objects.filter(pk=1).update(version=F('version') + 1)
+        self.assertEqual(self.coo.get_all_descendants(), [self.btd])
+
+    def test_allowed_roles_from_tree(self):
+        user = CustomUser.objects.create_user(employee_id='1001', email='cto@ntc.net.np', password='Nepal@123', role=self.cto)
+        self.assertEqual(user.get_allowed_roles(), [self.cto, self.btd])
+
+    def test_cached_roles_are_independent_copies(self):
+        first = self.ntc.get_all_descendants()[0]
+        first.permissions.append('manage_all')
+        self.assertEqual(self.ntc.get_all_descendants()[0].permissions, [])
+
+    def test_hierarchy_views(self):
+        response = view_role_hierarchy(RequestFactory().get('/api/users/role-hierarchy/'))
+        self.assertEqual(json.loads(response.content), {'NTC': ['COO', 'CTO'], 'CTO': ['BTD'], 'COO': [], 'BTD': []})
+        self.assertEqual(get_role_hierarchy(), {None: ['NTC'], 'NTC': ['CTO', 'COO'], 'CTO': ['BTD']})
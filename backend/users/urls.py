@@ -4,7 +4,7 @@ from .views import (
     RegisterView, UserListView, UserProfileView, MeView,
     RoleListView, view_role_hierarchy, RoleCreateView, ForgotPasswordView,
     ResetPasswordView, UserDetailView, EmployeeByIdView, EmployeeDetailListView,
-    ValidateEmployeeDetailView, CustomTokenObtainPairView
+    EmployeeDirectoryView, ValidateEmployeeDetailView, CustomTokenObtainPairView
 )
 
 urlpatterns = [
@@ -21,6 +21,7 @@ urlpatterns = [
     path('roles/create/', RoleCreateView.as_view(), name='role-create'),
     path('role-hierarchy/', view_role_hierarchy, name='role-hierarchy'),
     path('employee-details/', EmployeeDetailListView.as_view(), name='employee-detail-list'),
+    path('employee-directory/', EmployeeDirectoryView.as_view(), name='employee-directory'),
     path('validate-employee/', ValidateEmployeeDetailView.as_view(), name='validate-employee'),
 ]
 
@@ -1,21 +1,27 @@
 # users/utils.py
 
-from .models import RoleHierarchy
+from .models import CustomUser, RoleClosure
+from .role_tree import get_role_tree
 
 def get_role_hierarchy():
-    roles = RoleHierarchy.objects.all()
-    hierarchy_dict = {}
+    # Parent role name (None for top-level roles) -> child role names
+    return get_role_tree().members_by_parent_name()
 
-    # Loop through each role to build the hierarchy
-    for role in roles:
-        parent_role = role.parent.role_name if role.parent else None
-        if parent_role:
-            if parent_role not in hierarchy_dict:
-                hierarchy_dict[parent_role] = []
-            hierarchy_dict[parent_role].append(role.role_name)
-        else:
-            if None not in hierarchy_dict:
-                hierarchy_dict[None] = []
-            hierarchy_dict[None].append(role.role_name)
-    
-    return hierarchy_dict
+def hierarchy_owners(user):
+    """Primary keys of users holding a role in ``user``'s subtree, as a subquery."""
+    return CustomUser.objects.filter(
+        role__in=RoleClosure.objects.filter(ancestor_id=user.role_id).values('descendant_id')
+    ).values('pk')
+
+def scope_to_hierarchy(queryset, user, owner_field='owner'):
+    """
+    Filter ``queryset`` to rows whose ``owner_field`` user holds a role in
+    ``user``'s subtree. JWT principals carry the subtree's role ids already;
+    otherwise the subtree is a nested subquery on RoleClosure. Either way the
+    whole filter runs inside the caller's single SQL statement.
+    """
+    if not user.is_authenticated or not user.role_id:
+        return queryset.none()
+    if hasattr(user, 'allowed_role_ids'):
+        return queryset.filter(**{f'{owner_field}__role_id__in': user.allowed_role_ids})
+    return queryset.filter(**{f'{owner_field}__in': hierarchy_owners(user)})
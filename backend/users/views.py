@@ -5,11 +5,16 @@ from rest_framework.views import APIView
 from rest_framework.response import Response
 from rest_framework import status, generics
 from rest_framework.permissions import AllowAny, IsAuthenticated
-from django.core.mail import send_mail
 from django.conf import settings
 from django.http import JsonResponse
+from django.utils.decorators import method_decorator
 from rest_framework_simplejwt.views import TokenObtainPairView
 from .models import RoleHierarchy, CustomUser, EmployeeDetail
+from .role_tree import get_role_tree
+from .directory import DirectoryPaginator, search_employees, typeahead
+from core.cache import cached_get
+from core.pagination import PaginationError, bounded_int
+from core.mail import enqueue_mail
 from .serializers import (
     RegisterSerializer, UserSerializer, RoleSerializer,
     ForgotPasswordSerializer, ResetPasswordSerializer, EmployeeByIdSerializer,
@@ -58,7 +63,7 @@ class UserListView(generics.ListAPIView):
         user = self.request.user
         if not user.role or user.role.role_name != 'SUPERADMIN':
             return CustomUser.objects.none()
-        return CustomUser.objects.all()
+        return UserSerializer.optimize_queryset(CustomUser.objects.all(), self.request)
 
 class EmployeeByIdView(APIView):
     permission_classes = [IsAuthenticated]
@@ -66,7 +71,9 @@ class EmployeeByIdView(APIView):
     def get(self, request, employee_id):
         logger.debug(f"EmployeeByIdView called for employee_id: {employee_id}")
         try:
-            user = CustomUser.objects.get(employee_id__iexact=employee_id)
+            user = CustomUser.objects.find_identity(employee_id, fields=['employee_id'])
+            if user is None:
+                raise CustomUser.DoesNotExist
             serializer = EmployeeByIdSerializer(user)
             return Response(
                 {"status": "success", "data": {"user": serializer.data}},
@@ -130,6 +137,7 @@ class UserDetailView(APIView):
         except CustomUser.DoesNotExist:
             return Response({'detail': 'User not found'}, status=status.HTTP_404_NOT_FOUND)
 
+@method_decorator(cached_get(RoleHierarchy), name='get')
 class RoleListView(generics.ListAPIView):
     permission_classes = [IsAuthenticated]
     queryset = RoleHierarchy.objects.all()
@@ -147,16 +155,9 @@ class RoleCreateView(APIView):
             return Response(serializer.data, status=status.HTTP_201_CREATED)
         return Response(serializer.errors, status=status.HTTP_400_BAD_REQUEST)
 
+@cached_get(RoleHierarchy)
 def view_role_hierarchy(request):
-    roles = RoleHierarchy.objects.all()
-    hierarchy = {role.role_name: [] for role in roles}
-    for role in roles:
-        if role.parent:
-            parent_name = role.parent.role_name
-            hierarchy[parent_name].append(role.role_name)
-    for parent in hierarchy:
-        hierarchy[parent].sort()
-    return JsonResponse(hierarchy)
+    return JsonResponse(get_role_tree().children_by_name())
 
 class ForgotPasswordView(APIView):
     permission_classes = [AllowAny]
@@ -166,17 +167,17 @@ class ForgotPasswordView(APIView):
         if serializer.is_valid():
             email = serializer.validated_data['email']
             try:
-                user = CustomUser.objects.get(email=email)
+                user = CustomUser.objects.find_identity(email, fields=['email'])
+                if user is None:
+                    raise CustomUser.DoesNotExist
                 reset_token = str(uuid.uuid4())
                 user.reset_token = reset_token
                 user.save()
                 reset_link = f"http://localhost:3000/reset-password?token={reset_token}"
-                send_mail(
+                enqueue_mail(
                     'Password Reset Request',
                     f'Click the link to reset your password: {reset_link}',
-                    settings.DEFAULT_FROM_EMAIL,
                     [email],
-                    fail_silently=False,
                 )
                 return Response({'message': 'Password reset email sent.'}, status=status.HTTP_200_OK)
             except CustomUser.DoesNotExist:
@@ -203,6 +204,7 @@ class ResetPasswordView(APIView):
                 return Response({'detail': 'Invalid or expired token.'}, status=status.HTTP_400_BAD_REQUEST)
         return Response(serializer.errors, status=status.HTTP_400_BAD_REQUEST)
 
+@method_decorator(cached_get(EmployeeDetail), name='get')
 class EmployeeDetailListView(APIView):
     permission_classes = [IsAuthenticated]
 
@@ -211,6 +213,36 @@ class EmployeeDetailListView(APIView):
         serializer = EmployeeDetailSerializer(employees, many=True)
         return Response(serializer.data, status=status.HTTP_200_OK)
 
+@method_decorator(cached_get(EmployeeDetail), name='get')
+class EmployeeDirectoryView(APIView):
+    """
+    Paginated employee directory with prefix search on employee_id, name,
+    email and position (``?q=``). ``?typeahead=true`` returns only
+    employee_id, name and position for the first ``limit`` matches, for
+    member pickers.
+    """
+    permission_classes = [IsAuthenticated]
+
+    def get(self, request):
+        text = request.query_params.get('q')
+        try:
+            if request.query_params.get('typeahead') in ('1', 'true'):
+                limit = bounded_int(
+                    request.query_params.get('limit'), settings.EMPLOYEE_TYPEAHEAD_LIMIT,
+                    settings.EMPLOYEE_DIRECTORY_MAX_PAGE_SIZE, 'limit',
+                )
+                employees = typeahead(text, limit)
+                return Response(
+                    {"status": "success", "results": len(employees), "data": {"employees": employees}},
+                    status=status.HTTP_200_OK
+                )
+            paginator = DirectoryPaginator(request)
+            page = paginator.paginate_queryset(search_employees(text))
+        except PaginationError as e:
+            return Response({"status": "error", "message": str(e)}, status=status.HTTP_400_BAD_REQUEST)
+        serializer = EmployeeDetailSerializer(page, many=True, context={'request': request})
+        return Response(paginator.get_envelope(serializer.data, "employees"), status=status.HTTP_200_OK)
+
 class ValidateEmployeeDetailView(APIView):
     permission_classes = [IsAuthenticated]
 